@@ -0,0 +1,331 @@
+# ✅ RANKING PIPELINE BENCHMARK
+# ⏱️ Drives the tracker over recorded (or synthetic) results pages and times every stage
+# -*- coding: utf-8 -*-
+#
+#   python benchmark.py                          # synthetic fixtures, print timings
+#   python benchmark.py --fixtures gmb_fixtures  # pages recorded with GMB_RECORD_DIR
+#   python benchmark.py --save-baseline          # store the numbers as the new baseline (bench_baseline.json, tracked)
+#   python benchmark.py --tolerance 0.25         # exit 1 if any stage is >25% slower than baseline
+#   python benchmark.py --live --keywords 3      # real Chrome + network: full pages vs lean fetch
+#   python benchmark.py --import-time            # cold-start seconds of the backend modules
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import statistics
+import contextlib
+from datetime import datetime
+
+from gmb_config import load_config
+from gmb_replay import SnapshotStore, create_replay_tracker
+from gmb_results import ResultsWriter
+
+DEFAULT_BASELINE = 'bench_baseline.json'
+DEFAULT_BUSINESS = 'Dr. Prashansa Raut Dalvi'
+DEFAULT_LOCATION = 'Malad, Mumbai'
+DEFAULT_ALIASES = ['Dr. Prashansa Raut Dalvi', 'Dr Prashansa Raut', 'Prashansa Raut Dalvi']
+
+# Modules the worker subprocess / server load at startup
+IMPORT_MODULES = ['gmb_tracker_backend', 'gmb_cli', 'gmb_engines', 'gmb_parser']
+
+# Stages slower than baseline by less than this are treated as noise
+MIN_REGRESSION_SECONDS = 0.0005
+
+# ============================================================================
+# 🧪 SYNTHETIC FIXTURES
+# ============================================================================
+
+def _card(index, name):
+    return (
+        f'<div class="VkpGBb"><div jscontroller="AtSb" data-hveid="{index}">'
+        f'<a class="vwVdIc" href="#"><div class="rllt__details">'
+        f'<div role="heading" aria-level="3"><span class="OSrXXb">{name}</span></div>'
+        f'<div>4.{index % 10} ({100 + index}) · Gynecologist</div>'
+        f'<div>Shop {index}, Link Road · 0{index} 2288 1234</div>'
+        f'<div>Open · Closes 8 pm</div>'
+        f'</div></a></div></div>'
+    )
+
+def _page(names, has_next):
+    cards = ''.join(_card(i, name) for i, name in enumerate(names))
+    next_link = '<a id="pnnext" href="/search?start=20"><span>Next</span></a>' if has_next else ''
+    filler = '<script>var x = "' + 'x' * 4000 + '";</script>' * 5
+    return f'<html><head>{filler}</head><body><div id="search">{cards}</div>{next_link}</body></html>'
+
+def generate_fixtures(directory, keywords, location, business, pages=3, per_page=20):
+    """Write synthetic pages: the target sits on page (i % (pages + 1)) + 1, last group not found"""
+    store = SnapshotStore(directory)
+    for i, keyword in enumerate(keywords):
+        target_page = i % (pages + 1) + 1
+        query = f"{keyword} in {location}"
+        for page_number in range(1, pages + 1):
+            names = [f"Competitor Clinic {page_number}-{n} ({keyword})" for n in range(per_page)]
+            if page_number == target_page:
+                names[(i * 7) % per_page] = f"{business} - Gynaecologist"
+            store.save(query, page_number, _page(names, page_number < pages))
+    return store
+
+# ============================================================================
+# ⏱️ BENCHMARK
+# ============================================================================
+
+def fixture_tasks(store):
+    """(keyword, location) pairs for every recorded query"""
+    tasks = []
+    for query in store.queries():
+        keyword, _, location = query.rpartition(' in ')
+        tasks.append((keyword, location))
+    return tasks
+
+def run_benchmark(fixtures_dir, tasks, business, aliases, repeat=3, workdir=None):
+    tracker = create_replay_tracker(fixtures_dir)
+    progress_path = os.path.join(workdir or tempfile.mkdtemp(), 'gmb_ranking_progress.csv')
+    per_keyword = {}
+    found = 0
+
+    start = time.perf_counter()
+    try:
+        for _ in range(repeat):
+            with ResultsWriter(progress_path) as writer:
+                for keyword, location in tasks:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        t0 = time.perf_counter()
+                        result = tracker.check_gmb_ranking(keyword, location, business, aliases)
+                        per_keyword.setdefault(f"{keyword} in {location}", []).append(time.perf_counter() - t0)
+                    found += bool(result.get('found'))
+                    with tracker.timer.stage('csv_write'):
+                        writer.write(result)
+    finally:
+        tracker.close()
+
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'repeat': repeat,
+        'keywords': len(tasks),
+        'found': found // max(repeat, 1),
+        'wall_seconds': time.perf_counter() - start,
+        'stages': tracker.timer.snapshot(),
+        'per_keyword': {query: statistics.median(times) for query, times in per_keyword.items()},
+    }
+
+def run_live_benchmark(tasks, business, aliases, headless=True):
+    """Same keywords against live Google twice - full pages, then lean fetch - bytes and load time per mode"""
+    from gmb_tracker_backend import AdvancedGMBRankingTracker
+
+    modes = {}
+    for name, lean in (('full', False), ('lean', True)):
+        tracker = AdvancedGMBRankingTracker(headless=headless, cache=False, lean=lean)
+        tracker.measure_network = True
+        found = 0
+        start = time.perf_counter()
+        try:
+            for keyword, location in tasks:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result = tracker.check_gmb_ranking(keyword, location, business, aliases)
+                found += bool(result.get('found'))
+        finally:
+            tracker.close()
+
+        pages = tracker.network_stats
+        total_bytes = sum(page['bytes'] for page in pages)
+        load = tracker.timer.snapshot().get('page_load_wait', {})
+        modes[name] = {
+            'pages': len(pages),
+            'requests': sum(page['requests'] for page in pages),
+            'blocked': sum(page['blocked'] for page in pages),
+            'bytes': total_bytes,
+            'bytes_per_page': total_bytes / max(len(pages), 1),
+            'page_load_mean': load.get('mean', 0.0),
+            'found': found,
+            'wall_seconds': time.perf_counter() - start,
+        }
+
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'keywords': len(tasks),
+        'modes': modes,
+    }
+
+def print_live_report(report):
+    full, lean = report['modes']['full'], report['modes']['lean']
+
+    def saved(before, after):
+        return f"{(1 - after / before) * 100:.0f}%" if before else '-'
+
+    print(f"\n{'='*80}")
+    print(f"🌐 LIVE FETCH BENCHMARK - {report['keywords']} keywords, full pages vs lean fetch")
+    print(f"{'='*80}")
+    print(f"{'':<22}{'full':>14}{'lean':>14}{'saved':>10}")
+    rows = [
+        ('pages', full['pages'], lean['pages'], None),
+        ('requests', full['requests'], lean['requests'], saved(full['requests'], lean['requests'])),
+        ('blocked requests', full['blocked'], lean['blocked'], None),
+        ('KB per page', f"{full['bytes_per_page'] / 1024:.0f}", f"{lean['bytes_per_page'] / 1024:.0f}",
+         saved(full['bytes_per_page'], lean['bytes_per_page'])),
+        ('page load mean s', f"{full['page_load_mean']:.2f}", f"{lean['page_load_mean']:.2f}",
+         saved(full['page_load_mean'], lean['page_load_mean'])),
+        ('found', full['found'], lean['found'], None),
+        ('wall s', f"{full['wall_seconds']:.1f}", f"{lean['wall_seconds']:.1f}", None),
+    ]
+    for label, a, b, pct in rows:
+        print(f"{label:<22}{a:>14}{b:>14}{pct or '':>10}")
+    print(f"{'='*80}\n")
+
+def measure_import_time(module, repeat=5):
+    """Median seconds to import `module` in a fresh interpreter (cold start, no cached modules)"""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', code], cwd=cwd, capture_output=True, text=True, check=True
+        ).stdout
+        times.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+def print_import_report(timings, baseline=None):
+    print(f"\n{'='*80}")
+    print("🚀 IMPORT TIME (fresh interpreter, median)")
+    print(f"{'='*80}")
+    for module, seconds in timings.items():
+        line = f"{module:<26}{seconds * 1000:>10.1f} ms"
+        base = (baseline or {}).get(module)
+        if base:
+            line += f"   (baseline {base * 1000:.1f} ms, {(seconds / base - 1) * 100:+.0f}%)"
+        print(line)
+    print(f"{'='*80}\n")
+
+def load_baseline(path):
+    """Stored baselines: {'pipeline': report, 'import_seconds': {...}} (older files held the bare report)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        stored = json.load(f)
+    if 'stages' in stored:
+        stored = {'pipeline': {key: stored.pop(key) for key in list(stored) if key != 'import_seconds'}, **stored}
+    return stored
+
+def save_baseline(path, section, data):
+    """Replace one section of the baseline file, keeping the others"""
+    stored = load_baseline(path)
+    stored[section] = data
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(stored, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+def compare(report, baseline, tolerance):
+    """List of regression messages (empty = OK)"""
+    regressions = []
+    for stage, base in baseline.get('stages', {}).items():
+        current = report['stages'].get(stage)
+        if not current:
+            continue
+        limit = base['mean'] * (1 + tolerance)
+        if current['mean'] > limit and current['mean'] - base['mean'] > MIN_REGRESSION_SECONDS:
+            regressions.append(
+                f"{stage}: {current['mean'] * 1000:.2f} ms vs baseline {base['mean'] * 1000:.2f} ms "
+                f"(+{(current['mean'] / base['mean'] - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+def print_report(report):
+    print(f"\n{'='*80}")
+    print(f"⏱️  PIPELINE BENCHMARK - {report['keywords']} keywords × {report['repeat']} runs")
+    print(f"{'='*80}")
+    print(f"{'stage':<26}{'count':>8}{'mean ms':>12}{'max ms':>12}{'total s':>12}")
+    for stage, stats in sorted(report['stages'].items()):
+        print(f"{stage:<26}{stats['count']:>8}{stats['mean'] * 1000:>12.3f}{stats['max'] * 1000:>12.3f}{stats['total']:>12.3f}")
+    print(f"\n✅ Found: {report['found']}/{report['keywords']}   🕒 Wall: {report['wall_seconds']:.2f}s")
+    print(f"{'='*80}\n")
+
+def main(argv=None):
+    default_keywords = load_config().default_keywords
+    
+    parser = argparse.ArgumentParser(description='Benchmark the ranking pipeline over recorded pages')
+    parser.add_argument('--fixtures', help='Directory recorded with GMB_RECORD_DIR (default: synthetic pages)')
+    parser.add_argument('--business', default=DEFAULT_BUSINESS)
+    parser.add_argument('--alias', action='append', help='Business alias (repeatable)')
+    parser.add_argument('--keywords', type=int, help='Keyword count (default: all synthetic / 3 live)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='Write the JSON report here')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown per stage (0.25 = 25%%)')
+    parser.add_argument('--live', action='store_true', help='Fetch real pages in Chrome, full vs lean (needs network)')
+    parser.add_argument('--location', default=DEFAULT_LOCATION, help='Location for --live')
+    parser.add_argument('--show-browser', action='store_true', help='Run --live with a visible browser')
+    parser.add_argument('--import-time', action='store_true', help='Measure module cold-start import time')
+    args = parser.parse_args(argv)
+
+    if args.import_time:
+        timings = {module: measure_import_time(module, args.repeat) for module in IMPORT_MODULES}
+        print_import_report(timings, load_baseline(args.baseline).get('import_seconds', {}))
+        if args.save_baseline:
+            save_baseline(args.baseline, 'import_seconds', timings)
+            print(f"💾 Import times saved to baseline: {args.baseline}")
+        return 0
+
+    if args.live:
+        aliases = args.alias or DEFAULT_ALIASES
+        tasks = [(keyword, args.location) for keyword in default_keywords[:args.keywords or 3]]
+        report = run_live_benchmark(tasks, args.business, aliases, headless=not args.show_browser)
+        print_live_report(report)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            print(f"💾 Report saved: {args.output}")
+        return 0
+
+    aliases = args.alias or ([args.business] if args.fixtures else DEFAULT_ALIASES)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.fixtures:
+            store = SnapshotStore(args.fixtures)
+        else:
+            count = args.keywords or len(default_keywords)
+            keywords = (default_keywords * (count // len(default_keywords) + 1))[:count]
+            keywords = [f"{kw} {i}" for i, kw in enumerate(keywords)]
+            store = generate_fixtures(os.path.join(workdir, 'fixtures'), keywords, DEFAULT_LOCATION, args.business)
+
+        tasks = fixture_tasks(store)
+        if not tasks:
+            print(f"❌ No recorded pages found in {store.root}")
+            return 2
+
+        report = run_benchmark(store.root, tasks, args.business, aliases, args.repeat, workdir)
+
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report saved: {args.output}")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, 'pipeline', report)
+        print(f"💾 Baseline saved: {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline.get('pipeline'):
+        regressions = compare(report, baseline['pipeline'], args.tolerance)
+        if regressions:
+            print("❌ REGRESSIONS vs baseline:")
+            for line in regressions:
+                print(f"   • {line}")
+            return 1
+        print(f"✅ No stage slower than baseline by more than {args.tolerance:.0%}")
+    else:
+        print(f"ℹ️ No pipeline baseline in {args.baseline} (run with --save-baseline)")
+
+    return 0
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.exit(main())
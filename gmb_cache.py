@@ -0,0 +1,124 @@
+# ✅ SERP RESULT CACHE
+# ⚡ Parsed business lists per (search query, page) with a TTL - repeated runs cost no browser time
+# -*- coding: utf-8 -*-
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import namedtuple
+
+SERP_CACHE_DB = os.environ.get('GMB_CACHE_DB', 'gmb_serp_cache.sqlite3')
+
+CachedPage = namedtuple('CachedPage', ['names', 'has_next', 'fetched_at'])
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS serp_pages (
+    query       TEXT NOT NULL,
+    page        INTEGER NOT NULL,
+    names       TEXT NOT NULL,
+    has_next    INTEGER NOT NULL,
+    fetched_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (query, page)
+);
+CREATE INDEX IF NOT EXISTS idx_serp_pages_accessed ON serp_pages (accessed_at);
+'''
+
+def get_cache_ttl():
+    """Seconds a page stays fresh (GMB_CACHE_TTL, default 1 hour, 0 = cache off)"""
+    try:
+        return max(0, int(os.environ.get('GMB_CACHE_TTL', 3600)))
+    except ValueError:
+        return 3600
+
+def get_cache_max_entries():
+    try:
+        return max(1, int(os.environ.get('GMB_CACHE_MAX_ENTRIES', 5000)))
+    except ValueError:
+        return 5000
+
+def normalize_query(query):
+    return ' '.join(query.lower().split())
+
+class SerpCache:
+    """SQLite-backed TTL cache, shared by pool workers, the warm worker and CLI runs
+
+    Entries past their TTL are ignored and purged; beyond max_entries the
+    least recently used pages are evicted.
+    """
+
+    PRUNE_EVERY = 50
+
+    def __init__(self, path=SERP_CACHE_DB, ttl=None, max_entries=None):
+        self.path = path
+        self.ttl = get_cache_ttl() if ttl is None else ttl
+        self.max_entries = max_entries or get_cache_max_entries()
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+    @classmethod
+    def from_env(cls):
+        """Default cache, or None when GMB_CACHE_TTL=0"""
+        return cls() if get_cache_ttl() > 0 else None
+
+    def get(self, query, page_number):
+        now = time.time()
+        key = normalize_query(query)
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT names, has_next, fetched_at FROM serp_pages WHERE query = ? AND page = ?',
+                (key, page_number)
+            ).fetchone()
+
+            if row is None or now - row[2] > self.ttl:
+                self.misses += 1
+                return None
+
+            with self.conn:
+                self.conn.execute(
+                    'UPDATE serp_pages SET accessed_at = ? WHERE query = ? AND page = ?',
+                    (now, key, page_number)
+                )
+            self.hits += 1
+            return CachedPage(json.loads(row[0]), bool(row[1]), row[2])
+
+    def put(self, query, page_number, names, has_next):
+        now = time.time()
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO serp_pages (query, page, names, has_next, fetched_at, accessed_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (normalize_query(query), page_number, json.dumps(names, ensure_ascii=False), int(has_next), now, now)
+                )
+            self._puts += 1
+            if self._puts % self.PRUNE_EVERY == 0:
+                self._prune(now)
+
+    def _prune(self, now):
+        with self.conn:
+            self.conn.execute('DELETE FROM serp_pages WHERE fetched_at < ?', (now - self.ttl,))
+            self.conn.execute(
+                'DELETE FROM serp_pages WHERE rowid NOT IN '
+                '(SELECT rowid FROM serp_pages ORDER BY accessed_at DESC LIMIT ?)',
+                (self.max_entries,)
+            )
+
+    def prune(self):
+        with self._lock:
+            self._prune(time.time())
+
+    def clear(self):
+        with self._lock, self.conn:
+            self.conn.execute('DELETE FROM serp_pages')
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
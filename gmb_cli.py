@@ -0,0 +1,105 @@
+# ✅ GMB RANKING TRACKER - COMMAND LINE
+# 🎯 Interactive menu, --resume and the --serve worker; the tracking library is gmb_tracker_backend.py
+# -*- coding: utf-8 -*-
+#
+#   python gmb_cli.py                  # menu
+#   python gmb_cli.py --resume RUN_ID  # finish an earlier run
+#   python gmb_cli.py --serve          # long-lived worker for the server (JSON jobs on stdin)
+import os
+import sys
+import argparse
+import warnings
+
+from gmb_config import CUSTOM_CHOICE, load_config
+
+# ============================================================================
+# 🎯 INTERACTIVE MENU SYSTEM
+# ============================================================================
+
+def display_menu():
+    """Display interactive selection menu"""
+    if os.environ.get('CUSTOM_BUSINESS') or os.environ.get('CUSTOM_KEYWORDS'):
+        return
+
+    print(f"\n\n{'='*80}")
+    print("🎯 ULTIMATE GMB RANKING TRACKER - BUSINESS SELECTOR")
+    print(f"{'='*80}\n")
+
+    print("📍 SELECT YOUR OPTION:\n")
+
+    for preset in load_config().summary():
+        print(f"[{preset['id']}]  {preset['title']}")
+        if len(preset['locations']) == 1:
+            location = preset['locations'][0]
+            print(f"    Business: {', '.join(location['businesses'])}")
+            print(f"    Location: {location['location']}")
+            print(f"    Keywords: {preset['keywords']} Keywords")
+        else:
+            print(f"    Tracks: {' + '.join(location['name'] for location in preset['locations'])}")
+            print(f"    Keywords: {preset['keywords']} × {len(preset['locations'])} = {preset['total_keywords']} Total")
+        print()
+
+    print(f"[{CUSTOM_CHOICE}]  CUSTOM TRACKING")
+    print("    Enter your own business name, location, and keywords")
+    print()
+
+    print(f"{'='*80}\n")
+
+def get_user_selection():
+    """Get user input and validate"""
+    choices = list(load_config().presets) + [CUSTOM_CHOICE]
+    while True:
+        try:
+            choice = input(f"📌 Enter your choice ({', '.join(choices)}): ").strip()
+            if choice in choices:
+                return choice
+            else:
+                print(f"❌ Invalid choice! Please enter one of: {', '.join(choices)}")
+        except KeyboardInterrupt:
+            print("\n\n⚠️ Tracking cancelled by user")
+            exit()
+        except Exception as e:
+            print(f"❌ Error: {e}")
+
+# ============================================================================
+# 🚀 MAIN EXECUTION
+# ============================================================================
+
+def main(argv=None):
+    sys.stdout.reconfigure(encoding='utf-8')
+    warnings.filterwarnings("ignore")
+
+    parser = argparse.ArgumentParser(description='GMB ranking tracker')
+    parser.add_argument('--serve', action='store_true', help='Long-lived worker: read JSON jobs from stdin')
+    parser.add_argument('--resume', metavar='RUN_ID', help='Finish the pending keywords of an earlier run')
+    args = parser.parse_args(argv)
+
+    import gmb_tracker_backend as tracker
+
+    if args.serve:
+        tracker.serve_jobs()
+        return 0
+
+    manifest = None
+    config = None
+    run_id = args.resume or tracker.new_run_id()
+
+    if args.resume:
+        manifest = tracker.RunManifest.load(run_id)
+    else:
+        display_menu()
+        choice = get_user_selection()
+        config = tracker.get_configuration(choice)
+
+    pool = tracker.BrowserPool(size=tracker.get_pool_size(), headless=False, use_google_search=True)
+
+    try:
+        all_results = tracker.run_tracking_session(config, pool, run_id=run_id, manifest=manifest)
+    finally:
+        pool.close()
+
+    tracker.print_final_report(all_results, run_id)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+# ✅ COMPETITOR CAPTURE
+# 🏁 Full ordered business list of every crawled SERP - names interned, positions packed into arrays
+# -*- coding: utf-8 -*-
+#
+# A SERP row stores its ranking as a uint32 array of name ids (index = position - 1) plus a
+# uint16 array of cards per page, so a 60-result SERP costs ~250 bytes instead of 60 rows.
+import sys
+import threading
+from array import array
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from gmb_history import HISTORY_DB, SCHEMA as HISTORY_SCHEMA, connect
+from gmb_matcher import get_matcher
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS serp_names (
+    id    INTEGER PRIMARY KEY,
+    name  TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS serps (
+    id          INTEGER PRIMARY KEY,
+    run_id      TEXT,
+    location    TEXT NOT NULL,
+    keyword     TEXT NOT NULL,
+    captured_at TEXT NOT NULL,
+    name_ids    BLOB NOT NULL,
+    page_sizes  BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_serps_lookup ON serps (location, keyword, captured_at);
+CREATE INDEX IF NOT EXISTS idx_serps_captured ON serps (captured_at);
+'''
+
+def pack(typecode, values):
+    """Little-endian bytes of an unsigned int array"""
+    packed = array(typecode, values)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+def unpack(typecode, data):
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+def page_sizes(entries):
+    """Cards per page from [{'position', 'name', 'page'}, ...] in position order"""
+    sizes = []
+    for entry in entries:
+        page = entry.get('page') or 1
+        while len(sizes) < page:
+            sizes.append(0)
+        sizes[page - 1] += 1
+    return sizes
+
+class CompetitorStore:
+    """SERP orderings in the ranking history database"""
+
+    def __init__(self, path=HISTORY_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._ids = {}
+        self._names = {}
+        self.conn = connect(path)
+        with self.conn:
+            # outranking() reads the results table - don't rely on RankingHistory having created it
+            self.conn.executescript(HISTORY_SCHEMA)
+            self.conn.executescript(SCHEMA)
+
+    # ------------------------------------------------------------------ names
+
+    def _intern(self, names):
+        """Name -> id for every name, inserting unknown ones"""
+        missing = list({name for name in names if name not in self._ids})
+        if missing:
+            self.conn.executemany('INSERT OR IGNORE INTO serp_names (name) VALUES (?)', [(name,) for name in missing])
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                rows = self.conn.execute(
+                    f"SELECT id, name FROM serp_names WHERE name IN ({','.join('?' * len(chunk))})", chunk
+                )
+                for name_id, name in rows:
+                    self._ids[name] = name_id
+                    self._names[name_id] = name
+        return [self._ids[name] for name in names]
+
+    def _resolve(self, name_ids):
+        """Id -> name for every id, loading unknown ones"""
+        missing = list({name_id for name_id in name_ids if name_id not in self._names})
+        for start in range(0, len(missing), 500):
+            chunk = missing[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT id, name FROM serp_names WHERE id IN ({','.join('?' * len(chunk))})", chunk
+            )
+            for name_id, name in rows:
+                self._names[name_id] = name
+                self._ids[name] = name_id
+        return [self._names.get(name_id) for name_id in name_ids]
+
+    # ---------------------------------------------------------------- writing
+
+    def record(self, location, keyword, entries, run_id=None, captured_at=None):
+        """Store one crawled SERP ([{'position', 'name', 'page'}, ...]); returns its row id or None if empty"""
+        entries = sorted((entry for entry in entries if entry.get('name')), key=lambda entry: entry['position'])
+        if not entries:
+            return None
+        captured_at = captured_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        with self._lock, self.conn:
+            name_ids = self._intern([entry['name'] for entry in entries])
+            cursor = self.conn.execute(
+                'INSERT INTO serps (run_id, location, keyword, captured_at, name_ids, page_sizes) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (run_id, location, keyword, captured_at, pack('I', name_ids), pack('H', page_sizes(entries)))
+            )
+            return cursor.lastrowid
+
+    # ---------------------------------------------------------------- reading
+
+    def _decode(self, row):
+        names = self._resolve(unpack('I', row['name_ids']))
+        entries = []
+        position = 0
+        for page, size in enumerate(unpack('H', row['page_sizes']), 1):
+            for _ in range(size):
+                entries.append({'position': position + 1, 'name': names[position], 'page': page})
+                position += 1
+        return {
+            'id': row['id'],
+            'run_id': row['run_id'],
+            'location': row['location'],
+            'keyword': row['keyword'],
+            'captured_at': row['captured_at'],
+            'entries': entries,
+        }
+
+    def latest(self, keyword, location=None):
+        """Most recent SERP for a keyword (optionally in one location), decoded"""
+        where, params = ['keyword = ?'], [keyword]
+        if location:
+            where.append('location = ?')
+            params.append(location)
+        with self._lock:
+            row = self.conn.execute(
+                f"SELECT * FROM serps WHERE {' AND '.join(where)} ORDER BY captured_at DESC, id DESC LIMIT 1", params
+            ).fetchone()
+            return self._decode(row) if row else None
+
+    def _our_position(self, serp, business):
+        """Our rank in that SERP - from the same run's result, else by matching the names"""
+        if serp['run_id']:
+            with self._lock:
+                row = self.conn.execute(
+                    'SELECT found, position FROM results WHERE run_id = ? AND keyword = ? AND location = ? '
+                    'AND business = ? ORDER BY id DESC LIMIT 1',
+                    (serp['run_id'], serp['keyword'], serp['location'], business)
+                ).fetchone()
+            if row is not None:
+                return row['position'] if row['found'] else None
+
+        matcher = get_matcher([business])
+        return next((entry['position'] for entry in serp['entries'] if matcher.match(entry['name'])), None)
+
+    def outranking(self, keyword, business, location=None):
+        """Who ranks above `business` in the latest SERP for `keyword` (everyone crawled if we are absent)"""
+        serp = self.latest(keyword, location)
+        if serp is None:
+            return None
+        position = self._our_position(serp, business)
+        above = serp['entries'] if position is None else serp['entries'][:position - 1]
+        return {
+            'keyword': keyword,
+            'location': serp['location'],
+            'business': business,
+            'captured_at': serp['captured_at'],
+            'position': position,
+            'crawled': len(serp['entries']),
+            'outranked_by': above,
+        }
+
+    def top_competitors(self, location, limit=10, days=30, exclude=None):
+        """Businesses ranking best across the latest SERP of every keyword in a location
+
+        exclude: business names / aliases to leave out (usually our own).
+        """
+        since = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT s.* FROM serps s JOIN ('
+                '  SELECT keyword, MAX(captured_at) AS captured_at FROM serps'
+                '  WHERE location = ? AND captured_at >= ? GROUP BY keyword'
+                ') latest ON s.keyword = latest.keyword AND s.captured_at = latest.captured_at '
+                'WHERE s.location = ?',
+                (location, since, location)
+            ).fetchall()
+
+        seen = set()
+        positions = defaultdict(list)
+        for row in rows:
+            if row['keyword'] in seen:
+                continue  # two SERPs captured in the same second - keep one
+            seen.add(row['keyword'])
+            for position, name_id in enumerate(unpack('I', row['name_ids']), 1):
+                positions[name_id].append(position)
+
+        with self._lock:
+            names = dict(zip(positions, self._resolve(list(positions))))
+        matcher = get_matcher(exclude) if exclude else None
+
+        competitors = []
+        for name_id, ranks in positions.items():
+            name = names[name_id]
+            if name is None or (matcher and matcher.match(name)):
+                continue
+            competitors.append({
+                'name': name,
+                'keywords': len(ranks),
+                'best_position': min(ranks),
+                'avg_position': round(sum(ranks) / len(ranks), 1),
+                'top3': sum(1 for rank in ranks if rank <= 3),
+            })
+
+        competitors.sort(key=lambda c: (-c['keywords'], c['avg_position'], c['name']))
+        return {'location': location, 'serps': len(seen), 'competitors': competitors[:limit]}
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,215 @@
+# ✅ DECLARATIVE TRACKER CONFIG
+# 📋 Businesses, locations, aliases, keyword groups and menu presets from gmb_config.json / .toml / .yaml
+# -*- coding: utf-8 -*-
+#
+#   {
+#     "default_keywords": "gynecology",
+#     "keyword_groups": {"gynecology": ["PCOD Treatment", ...]},
+#     "locations": {
+#       "malad": {"name": "Malad", "location": "Malad, Mumbai",
+#                 "business": "Dr. Prashansa Raut Dalvi", "aliases": ["Dr Prashansa Raut", ...],
+#                 "targets": [{"business": "Other Clinic", "aliases": [...]}]}      <- optional, extra businesses
+#     },
+#     "presets": [{"id": "1", "title": "Dr. Prashansa - MALAD, MUMBAI", "locations": ["malad"], "keywords": ["gynecology"]}]
+#   }
+#
+# Preset ids are free-form; '5' stays reserved for custom tracking (web form + CLI).
+import os
+import json
+import threading
+
+CONFIG_ENV = 'GMB_CONFIG_FILE'
+CONFIG_NAMES = ('gmb_config.json', 'gmb_config.toml', 'gmb_config.yaml', 'gmb_config.yml')
+CUSTOM_CHOICE = '5'
+
+class ConfigError(ValueError):
+    """Invalid tracker config - the message names the file and the broken entry"""
+
+def find_config_file():
+    """GMB_CONFIG_FILE, else the first gmb_config.* next to this module"""
+    path = os.environ.get(CONFIG_ENV)
+    if path:
+        return path
+    base = os.path.dirname(os.path.abspath(__file__))
+    for name in CONFIG_NAMES:
+        candidate = os.path.join(base, name)
+        if os.path.exists(candidate):
+            return candidate
+    return os.path.join(base, CONFIG_NAMES[0])
+
+def read_config_file(path):
+    """Raw dict from a JSON, TOML (stdlib tomllib) or YAML (needs PyYAML) file"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.toml':
+        try:
+            import tomllib
+        except ImportError:
+            raise ConfigError(f"{path}: TOML configs need Python 3.11+")
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+
+    with open(path, encoding='utf-8') as f:
+        if ext in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ConfigError(f"{path}: YAML configs need PyYAML (pip install pyyaml)")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+def _strings(value, where):
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list) or not all(isinstance(v, str) and v.strip() for v in value):
+        raise ConfigError(f"{where}: expected a list of non-empty strings")
+    return [v.strip() for v in value]
+
+class TrackerConfig:
+    """Validated config; builds the configuration dicts the tracker runs on"""
+
+    def __init__(self, raw, path='<config>'):
+        if not isinstance(raw, dict):
+            raise ConfigError(f"{path}: top level must be a mapping")
+        self.path = path
+
+        self.keyword_groups = {}
+        for name, keywords in (raw.get('keyword_groups') or {}).items():
+            keywords = _strings(keywords, f"{path}: keyword_groups.{name}")
+            if not keywords:
+                raise ConfigError(f"{path}: keyword_groups.{name} is empty")
+            self.keyword_groups[name] = keywords
+
+        default = raw.get('default_keywords')
+        if default not in self.keyword_groups:
+            raise ConfigError(f"{path}: default_keywords must name a keyword group")
+        self.default_keywords = self.keyword_groups[default]
+
+        self.locations = {}
+        for key, entry in (raw.get('locations') or {}).items():
+            self.locations[key] = self._location(key, entry)
+
+        self.presets = {}
+        for i, entry in enumerate(raw.get('presets') or []):
+            preset = self._preset(i, entry)
+            if preset['id'] in self.presets:
+                raise ConfigError(f"{path}: duplicate preset id '{preset['id']}'")
+            self.presets[preset['id']] = preset
+        if not self.presets:
+            raise ConfigError(f"{path}: no presets defined")
+
+    def _location(self, key, entry):
+        where = f"{self.path}: locations.{key}"
+        if not isinstance(entry, dict):
+            raise ConfigError(f"{where}: expected a mapping")
+        for field in ('location', 'business'):
+            if not str(entry.get(field, '')).strip():
+                raise ConfigError(f"{where}: '{field}' is required")
+
+        targets = [{'business': entry['business'], 'aliases': entry.get('aliases') or [entry['business']]}]
+        targets += entry.get('targets') or []
+        for target in targets:
+            if not isinstance(target, dict) or not str(target.get('business', '')).strip():
+                raise ConfigError(f"{where}.targets: every target needs a 'business'")
+        location_name = str(entry.get('name') or key)
+
+        return {
+            'location_name': location_name,
+            'location': entry['location'].strip(),
+            'targets': [
+                {
+                    'business_name': str(target['business']).strip(),
+                    'business_names': _strings(target.get('aliases') or [target['business']], f"{where}.aliases"),
+                    'location_name': location_name,
+                }
+                for target in targets
+            ],
+        }
+
+    def _preset(self, i, entry):
+        where = f"{self.path}: presets[{i}]"
+        if not isinstance(entry, dict):
+            raise ConfigError(f"{where}: expected a mapping")
+        preset_id = str(entry.get('id', '')).strip()
+        if not preset_id or preset_id == CUSTOM_CHOICE:
+            raise ConfigError(f"{where}: 'id' is required and '{CUSTOM_CHOICE}' is reserved for custom tracking")
+
+        locations = _strings(entry.get('locations'), f"{where}.locations")
+        for key in locations:
+            if key not in self.locations:
+                raise ConfigError(f"{where}: unknown location '{key}'")
+
+        groups = _strings(entry.get('keywords') or [], f"{where}.keywords")
+        keywords = []
+        for group in groups:
+            if group not in self.keyword_groups:
+                raise ConfigError(f"{where}: unknown keyword group '{group}'")
+            keywords.extend(kw for kw in self.keyword_groups[group] if kw not in keywords)
+
+        return {
+            'id': preset_id,
+            'title': str(entry.get('title') or preset_id),
+            'locations': locations,
+            'keywords': keywords or list(self.default_keywords),
+        }
+
+    def configuration(self, preset_id):
+        """Tracker configuration dict for a preset (same shape the menu always produced)"""
+        preset = self.presets.get(str(preset_id))
+        if preset is None:
+            raise ConfigError(f"Unknown preset '{preset_id}'")
+
+        locations = []
+        for key in preset['locations']:
+            location = self.locations[key]
+            main = location['targets'][0]
+            entry = {
+                'location_name': location['location_name'],
+                'business_name': main['business_name'],
+                'location': location['location'],
+                'business_names': list(main['business_names']),
+            }
+            if len(location['targets']) > 1:
+                entry['targets'] = [dict(target) for target in location['targets']]
+            locations.append(entry)
+
+        if len(locations) == 1:
+            return dict(locations[0], mode='single', keywords=list(preset['keywords']))
+        return {'mode': 'multi', 'locations': locations, 'keywords': list(preset['keywords'])}
+
+    def summary(self):
+        """Presets for menus and /api/config"""
+        return [
+            {
+                'id': preset['id'],
+                'title': preset['title'],
+                'locations': [
+                    {
+                        'key': key,
+                        'name': self.locations[key]['location_name'],
+                        'location': self.locations[key]['location'],
+                        'businesses': [t['business_name'] for t in self.locations[key]['targets']],
+                    }
+                    for key in preset['locations']
+                ],
+                'keywords': len(preset['keywords']),
+                'total_keywords': len(preset['keywords']) * len(preset['locations']),
+            }
+            for preset in self.presets.values()
+        ]
+
+_cache = {'key': None, 'config': None}
+_cache_lock = threading.Lock()
+
+def load_config(path=None):
+    """Parsed + validated config, cached until the file's mtime changes"""
+    path = path or find_config_file()
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        raise ConfigError(f"Config file not found: {path}")
+
+    with _cache_lock:
+        if _cache['key'] != (path, mtime):
+            _cache['config'] = TrackerConfig(read_config_file(path), path)
+            _cache['key'] = (path, mtime)
+        return _cache['config']
@@ -0,0 +1,141 @@
+# ✅ PAGE FETCH ENGINES
+# 🌐 How a results page is fetched: pooled HTTP requests (light) or the Chrome session (full fallback)
+# -*- coding: utf-8 -*-
+#
+#   GMB_FETCH_ENGINE=browser   every page through Chrome (default)
+#   GMB_FETCH_ENGINE=http      plain HTTP + HTML parser, Chrome only when a page has no parseable cards
+import os
+import json
+import time
+import random
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from functools import lru_cache
+
+from gmb_metrics import StageTimer
+from gmb_parser import parse_results_page
+
+ENGINE_ENV = 'GMB_FETCH_ENGINE'
+ENGINES = ('browser', 'http')
+
+# Local results come 20 to a page; page n starts at offset (n - 1) * 20
+RESULTS_PER_PAGE = 20
+
+# After a 429 / captcha redirect the HTTP engine stands down for this long
+HTTP_BLOCK_COOLDOWN = 600
+
+# Bundled desktop browser user agents (replaces fake-useragent's downloaded dataset)
+USER_AGENTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'user_agents.json')
+
+FetchedPage = namedtuple('FetchedPage', ['names', 'has_next', 'load_seconds', 'html'])
+
+def get_fetch_engine():
+    """Primary engine name from GMB_FETCH_ENGINE (default: browser)"""
+    name = os.environ.get(ENGINE_ENV, 'browser').strip().lower()
+    return name if name in ENGINES else 'browser'
+
+@lru_cache(maxsize=1)
+def load_user_agents():
+    with open(USER_AGENTS_FILE, encoding='utf-8') as f:
+        return tuple(json.load(f))
+
+def random_user_agent():
+    return random.choice(load_user_agents())
+
+def page_url(url, page_number):
+    """Results page URL by start= offset instead of clicking 'Next'"""
+    if page_number <= 1:
+        return url
+    return f"{url}&start={(page_number - 1) * RESULTS_PER_PAGE}"
+
+class FetchEngine(ABC):
+    """One way of turning (search URL, page number) into card names
+
+    fetch() returns a FetchedPage, or None when this engine could not get
+    parseable cards and the tracker should fall back to the next engine.
+    """
+
+    name = 'base'
+
+    @abstractmethod
+    def fetch(self, url, page_number):
+        """FetchedPage for one results page, or None to fall back to the next engine"""
+
+    def close(self):
+        pass
+
+class SeleniumEngine(FetchEngine):
+    """The tracker's own Chrome session - always answers, so it is the last engine in the chain"""
+
+    name = 'browser'
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+
+    def fetch(self, url, page_number):
+        tracker = self.tracker
+        if not tracker._open_page(page_number):
+            print(f"\n   ⚠️ No 'Next' button found. Reached last page.")
+            return FetchedPage([], False, tracker._page_load_seconds, None)
+        names = tracker._read_business_names(page_number)
+        return FetchedPage(names, tracker._page_has_next, tracker._page_load_seconds, None)
+
+class HttpEngine(FetchEngine):
+    """Pooled requests.Session; pages parsed in-process with gmb_parser"""
+
+    name = 'http'
+
+    def __init__(self, user_agent=None, timer=None, timeout=15):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.timer = timer or StageTimer()
+        self.timeout = timeout
+        self.blocked_until = 0
+
+        self.session = requests.Session()
+        retries = Retry(total=2, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504), allowed_methods=('GET',))
+        self.session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=retries))
+        self.session.headers.update({
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+        })
+        if user_agent:
+            self.session.headers['User-Agent'] = user_agent
+        # Skip the EU cookie consent interstitial
+        self.session.cookies.set('CONSENT', 'YES+', domain='.google.com')
+
+    def fetch(self, url, page_number):
+        if time.time() < self.blocked_until:
+            return None
+
+        import requests
+
+        start = time.perf_counter()
+        try:
+            with self.timer.stage('http_fetch'):
+                response = self.session.get(page_url(url, page_number), timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"   ⚠️ HTTP fetch failed: {e}")
+            return None
+        load_seconds = time.perf_counter() - start
+
+        if response.status_code == 429 or '/sorry/' in response.url:
+            self.blocked_until = time.time() + HTTP_BLOCK_COOLDOWN
+            print(f"   ⚠️ HTTP engine rate-limited, using the browser for {HTTP_BLOCK_COOLDOWN // 60} min")
+            return None
+        if response.status_code != 200:
+            print(f"   ⚠️ HTTP fetch returned {response.status_code}")
+            return None
+
+        with self.timer.stage('card_discovery'):
+            page = parse_results_page(response.text)
+        if not page.card_count:
+            return None
+
+        print(f"   ✅ Found {page.card_count} results on page {page_number} (http)")
+        return FetchedPage(page.names, page.has_next, load_seconds, response.text)
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,91 @@
+# ✅ MACHINE-READABLE EVENT CHANNEL
+# 📡 Typed JSON events from the backend, on their own fd - the human log on stdout stays as it is
+# -*- coding: utf-8 -*-
+#
+#   GMB_EVENT_FD=<n>       write one JSON object per line to file descriptor n (pipe from the server)
+#   GMB_EVENT_FD=stdout    no spare fd (Windows) - prefix event lines on stdout instead
+#   unset                  events are dropped
+import os
+import sys
+import json
+import time
+import threading
+
+EVENT_FD_ENV = 'GMB_EVENT_FD'
+EVENT_PREFIX = '@@GMB_EVENT@@ '
+
+# End-of-job line a warm --serve backend prints on stdout, followed by the JSON summary
+JOB_DONE_MARKER = '@@GMB_JOB_DONE@@'
+
+RUN_STARTED = 'run_started'
+KEYWORD_STARTED = 'keyword_started'
+PAGE_SCANNED = 'page_scanned'
+BUSINESS_SEEN = 'business_seen'
+MATCH_FOUND = 'match_found'
+KEYWORD_DONE = 'keyword_done'
+RUN_DONE = 'run_done'
+JOB_DONE = 'job_done'
+
+EVENT_TYPES = (
+    RUN_STARTED, KEYWORD_STARTED, PAGE_SCANNED, BUSINESS_SEEN,
+    MATCH_FOUND, KEYWORD_DONE, RUN_DONE, JOB_DONE,
+)
+
+class EventEmitter:
+    """Thread-safe JSON-lines writer; pool threads share one emitter"""
+
+    def __init__(self, stream=None, prefix=''):
+        self.stream = stream
+        self.prefix = prefix
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.stream is not None
+
+    @classmethod
+    def from_env(cls):
+        target = os.environ.get(EVENT_FD_ENV, '').strip()
+        if not target:
+            return cls()
+        if target == 'stdout':
+            return cls(sys.stdout, EVENT_PREFIX)
+        try:
+            return cls(os.fdopen(int(target), 'w', encoding='utf-8', buffering=1))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Event channel {target} unavailable ({e}), events disabled")
+            return cls()
+
+    def emit(self, event_type, **data):
+        if self.stream is None:
+            return
+        data['type'] = event_type
+        data['time'] = time.time()
+        line = self.prefix + json.dumps(data, ensure_ascii=False, default=str) + '\n'
+        with self._lock:
+            try:
+                self.stream.write(line)
+                self.stream.flush()
+            except (OSError, ValueError):
+                self.stream = None  # reader went away - keep tracking, stop emitting
+
+_emitter = None
+_emitter_lock = threading.Lock()
+
+def get_emitter():
+    """Process-wide emitter configured from GMB_EVENT_FD"""
+    global _emitter
+    with _emitter_lock:
+        if _emitter is None:
+            _emitter = EventEmitter.from_env()
+        return _emitter
+
+def parse_event(line):
+    """Event dict from a channel line (with or without the stdout prefix), None if not an event"""
+    if line.startswith(EVENT_PREFIX):
+        line = line[len(EVENT_PREFIX):]
+    try:
+        event = json.loads(line)
+    except ValueError:
+        return None
+    return event if isinstance(event, dict) and 'type' in event else None
@@ -0,0 +1,414 @@
+# ✅ RANKING HISTORY (SQLite)
+# 🗄️ Every result ever produced, indexed by (business, location, keyword, timestamp)
+# 📈 Plus per-day aggregates, folded in as results arrive, for rank-movement queries
+# -*- coding: utf-8 -*-
+#
+#   python gmb_history.py ingest gmb_ranking_*.csv   # fold old report CSVs into the history
+#   python gmb_history.py rebuild                   # recompute daily aggregates from raw results
+import os
+import sys
+import csv
+import glob
+import sqlite3
+import argparse
+import threading
+from datetime import datetime
+
+HISTORY_DB = os.environ.get('GMB_HISTORY_DB', 'gmb_history.sqlite3')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS results (
+    id                  INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id              TEXT,
+    business            TEXT NOT NULL,
+    location            TEXT NOT NULL,
+    location_name       TEXT,
+    keyword             TEXT NOT NULL,
+    found               INTEGER NOT NULL,
+    position            INTEGER,
+    page                INTEGER,
+    found_business_name TEXT,
+    matched_alias       TEXT,
+    match_score         REAL,
+    total_checked       INTEGER,
+    error               TEXT,
+    timestamp           TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_lookup ON results (business, location, keyword, timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_keyword_time ON results (keyword, timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results (run_id);
+CREATE TABLE IF NOT EXISTS sweep_runs (
+    sweep       TEXT NOT NULL,
+    slot        TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    job_id      TEXT,
+    found       INTEGER,
+    total       INTEGER,
+    error       TEXT,
+    created_at  TEXT NOT NULL,
+    finished_at TEXT,
+    PRIMARY KEY (sweep, slot)
+);
+CREATE TABLE IF NOT EXISTS daily_ranks (
+    business        TEXT NOT NULL,
+    location        TEXT NOT NULL,
+    keyword         TEXT NOT NULL,
+    day             TEXT NOT NULL,
+    location_name   TEXT,
+    checks          INTEGER NOT NULL,
+    found_count     INTEGER NOT NULL,
+    best_position   INTEGER,
+    worst_position  INTEGER,
+    last_found      INTEGER NOT NULL,
+    last_position   INTEGER,
+    last_page       INTEGER,
+    last_timestamp  TEXT NOT NULL,
+    PRIMARY KEY (business, location, keyword, day)
+) WITHOUT ROWID;
+'''
+
+# One checked keyword folded into its (business, location, keyword, day) row.
+# Positions only exist for found results; "last" follows the newest timestamp, so
+# ingesting older files out of order never overwrites a newer observation.
+DAILY_UPSERT = '''
+INSERT INTO daily_ranks (
+    business, location, keyword, day, location_name, checks, found_count,
+    best_position, worst_position, last_found, last_position, last_page, last_timestamp
+) VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (business, location, keyword, day) DO UPDATE SET
+    location_name  = COALESCE(excluded.location_name, location_name),
+    checks         = checks + 1,
+    found_count    = found_count + excluded.found_count,
+    best_position  = CASE WHEN excluded.best_position IS NULL THEN best_position
+                          WHEN best_position IS NULL THEN excluded.best_position
+                          ELSE MIN(best_position, excluded.best_position) END,
+    worst_position = CASE WHEN excluded.worst_position IS NULL THEN worst_position
+                          WHEN worst_position IS NULL THEN excluded.worst_position
+                          ELSE MAX(worst_position, excluded.worst_position) END,
+    last_found     = CASE WHEN excluded.last_timestamp >= last_timestamp THEN excluded.last_found ELSE last_found END,
+    last_position  = CASE WHEN excluded.last_timestamp >= last_timestamp THEN excluded.last_position ELSE last_position END,
+    last_page      = CASE WHEN excluded.last_timestamp >= last_timestamp THEN excluded.last_page ELSE last_page END,
+    last_timestamp = MAX(last_timestamp, excluded.last_timestamp)
+'''
+
+DAILY_COLUMNS = [
+    'business', 'location', 'keyword', 'day', 'location_name', 'checks', 'found_count',
+    'best_position', 'worst_position', 'last_found', 'last_position', 'last_page', 'last_timestamp',
+]
+
+COLUMNS = [
+    'id', 'run_id', 'business', 'location', 'location_name', 'keyword', 'found',
+    'position', 'page', 'found_business_name', 'matched_alias', 'match_score',
+    'total_checked', 'error', 'timestamp',
+]
+
+def connect(path):
+    """SQLite connection shared by the backend and server processes"""
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+def _row(row):
+    record = dict(row)
+    record.pop('latest', None)
+    if 'found' in record:
+        record['found'] = bool(record['found'])
+    return record
+
+class RankingHistory:
+    """Persistent store for result dicts from check_gmb_ranking"""
+
+    def __init__(self, path=HISTORY_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = connect(path)
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+            # History written before daily aggregates existed
+            if (self.conn.execute('SELECT 1 FROM results LIMIT 1').fetchone()
+                    and not self.conn.execute('SELECT 1 FROM daily_ranks LIMIT 1').fetchone()):
+                self._rebuild_daily()
+
+    def _fold_daily(self, result):
+        """Add one result to its daily aggregate (errors are not rank observations)"""
+        if result.get('error'):
+            return
+        found = bool(result.get('found'))
+        position = result.get('position') if found else None
+        timestamp = result.get('timestamp') or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.conn.execute(DAILY_UPSERT, (
+            result.get('searched_business') or result.get('business') or '',
+            result.get('location') or '',
+            result.get('keyword') or '',
+            timestamp[:10],
+            result.get('location_name'),
+            int(found),
+            position,
+            position,
+            int(found),
+            position,
+            result.get('page') if found else None,
+            timestamp,
+        ))
+
+    def _rebuild_daily(self):
+        self.conn.execute('DELETE FROM daily_ranks')
+        for row in self.conn.execute(f"SELECT {', '.join(COLUMNS)} FROM results ORDER BY timestamp").fetchall():
+            self._fold_daily(dict(row))
+
+    def rebuild_daily(self):
+        """Recompute every daily aggregate from the raw results"""
+        with self._lock, self.conn:
+            self._rebuild_daily()
+
+    def record(self, result, run_id=None):
+        """Store one found / not-found / error result (and fold it into its day), returns its row id"""
+        values = (
+            run_id,
+            result.get('searched_business') or '',
+            result.get('location') or '',
+            result.get('location_name'),
+            result.get('keyword') or '',
+            int(bool(result.get('found'))),
+            result.get('position'),
+            result.get('page'),
+            result.get('found_business_name'),
+            result.get('matched_alias'),
+            result.get('match_score'),
+            result.get('total_checked'),
+            result.get('error'),
+            result.get('timestamp'),
+        )
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                'INSERT INTO results (run_id, business, location, location_name, keyword, found, position, page, '
+                'found_business_name, matched_alias, match_score, total_checked, error, timestamp) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                values
+            )
+            self._fold_daily(result)
+            return cursor.lastrowid
+
+    def ingest_csv(self, path):
+        """Record every row of a results / report CSV not already in the history - returns rows added"""
+        from gmb_results import parse_result_row
+
+        run_id = f"import:{os.path.basename(path)}"
+        added = 0
+        with open(path, newline='', encoding='utf-8', errors='replace') as f:
+            for row in csv.DictReader(f):
+                result = parse_result_row(row)
+                if not result.get('keyword') or not result.get('timestamp'):
+                    continue
+                with self._lock:
+                    seen = self.conn.execute(
+                        'SELECT 1 FROM results WHERE business = ? AND location = ? AND keyword = ? AND timestamp = ? LIMIT 1',
+                        (result.get('searched_business') or '', result.get('location') or '',
+                         result['keyword'], result['timestamp'])
+                    ).fetchone()
+                if not seen:
+                    self.record(result, run_id)
+                    added += 1
+        return added
+
+    def daily_ranks(self, keyword=None, business=None, location=None, since=None, until=None):
+        """Per-day aggregates in day order, optionally narrowed"""
+        where, params = [], []
+        for column, value in (('keyword', keyword), ('business', business), ('location', location)):
+            if value:
+                where.append(f'{column} = ?')
+                params.append(value)
+        if since:
+            where.append('day >= ?')
+            params.append(since[:10])
+        if until:
+            where.append('day <= ?')
+            params.append(until[:10])
+        clause = f"WHERE {' AND '.join(where)}" if where else ''
+        return self._query(
+            f"SELECT {', '.join(DAILY_COLUMNS)} FROM daily_ranks {clause} ORDER BY business, location, keyword, day",
+            params
+        )
+
+    def movement(self, days=7, keyword=None, business=None, location=None):
+        """Latest day per (business, location, keyword) against the last day at least `days` earlier
+
+        Two primary-key lookups per keyword, however much history there is.
+        """
+        where, params = [], []
+        for column, value in (('keyword', keyword), ('business', business), ('location', location)):
+            if value:
+                where.append(f'{column} = ?')
+                params.append(value)
+        clause = f"WHERE {' AND '.join(where)}" if where else ''
+        offset = f'-{int(days)} days'
+
+        rows = self._query(
+            f"""
+            SELECT cur.business, cur.location, cur.location_name, cur.keyword, cur.day,
+                   cur.last_found AS found, cur.last_position AS position, cur.last_page AS page,
+                   cur.best_position, cur.found_count, cur.checks,
+                   prev.day AS previous_day, prev.last_found AS previous_found,
+                   prev.last_position AS previous_position
+            FROM (SELECT business, location, keyword, MAX(day) AS day FROM daily_ranks {clause}
+                  GROUP BY business, location, keyword) latest
+            JOIN daily_ranks cur
+              ON cur.business = latest.business AND cur.location = latest.location
+             AND cur.keyword = latest.keyword AND cur.day = latest.day
+            LEFT JOIN daily_ranks prev
+              ON prev.business = cur.business AND prev.location = cur.location AND prev.keyword = cur.keyword
+             AND prev.day = (SELECT MAX(p.day) FROM daily_ranks p
+                             WHERE p.business = cur.business AND p.location = cur.location
+                               AND p.keyword = cur.keyword AND p.day <= date(cur.day, ?))
+            ORDER BY cur.business, cur.location, cur.keyword
+            """,
+            params + [offset]
+        )
+        for row in rows:
+            row['found'] = bool(row['found'])
+            describe_movement(row)
+        return rows
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return [_row(row) for row in self.conn.execute(sql, params)]
+
+    def latest_ranks(self, business=None, location=None):
+        """Most recent result per (business, location, keyword)"""
+        where, params = [], []
+        if business:
+            where.append('business = ?')
+            params.append(business)
+        if location:
+            where.append('location = ?')
+            params.append(location)
+        clause = f"WHERE {' AND '.join(where)}" if where else ''
+
+        # SQLite returns the other columns from the MAX(timestamp) row of each group
+        return self._query(
+            f"SELECT {', '.join(COLUMNS)}, MAX(timestamp) AS latest FROM results {clause} "
+            f"GROUP BY business, location, keyword ORDER BY business, location, keyword",
+            params
+        )
+
+    def rank_over_time(self, keyword, location=None, business=None, since=None, until=None):
+        """Every result for a keyword in time order, optionally narrowed"""
+        where, params = ['keyword = ?'], [keyword]
+        if business:
+            where.append('business = ?')
+            params.append(business)
+        if location:
+            where.append('location = ?')
+            params.append(location)
+        if since:
+            where.append('timestamp >= ?')
+            params.append(since)
+        if until:
+            where.append('timestamp <= ?')
+            params.append(until)
+
+        return self._query(
+            f"SELECT {', '.join(COLUMNS)} FROM results WHERE {' AND '.join(where)} ORDER BY timestamp",
+            params
+        )
+
+    def run_results(self, run_id):
+        """Every result recorded for one run"""
+        return self._query(f"SELECT {', '.join(COLUMNS)} FROM results WHERE run_id = ? ORDER BY id", (run_id,))
+
+    def claim_sweep_slot(self, sweep, slot, status):
+        """Record a sweep trigger once - False if another server worker already took this slot"""
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                'INSERT OR IGNORE INTO sweep_runs (sweep, slot, status, created_at) VALUES (?, ?, ?, ?)',
+                (sweep, slot, status, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            )
+            return cursor.rowcount == 1
+
+    def update_sweep_run(self, sweep, slot, **fields):
+        """Set job_id / status / found / total / error of a sweep run"""
+        if fields.get('status') not in (None, 'queued', 'running'):
+            fields.setdefault('finished_at', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        columns = ', '.join(f"{name} = ?" for name in fields)
+        with self._lock, self.conn:
+            self.conn.execute(
+                f"UPDATE sweep_runs SET {columns} WHERE sweep = ? AND slot = ?",
+                (*fields.values(), sweep, slot)
+            )
+
+    def sweep_runs(self, sweep=None, status=None, limit=50):
+        """Latest sweep triggers and their outcome"""
+        where, params = [], []
+        if sweep:
+            where.append('sweep = ?')
+            params.append(sweep)
+        if status:
+            statuses = [status] if isinstance(status, str) else list(status)
+            where.append(f"status IN ({','.join('?' * len(statuses))})")
+            params.extend(statuses)
+        clause = f"WHERE {' AND '.join(where)}" if where else ''
+        params.append(limit)
+        with self._lock:
+            return [
+                dict(row) for row in self.conn.execute(
+                    f"SELECT * FROM sweep_runs {clause} ORDER BY slot DESC LIMIT ?", params
+                )
+            ]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+def describe_movement(row):
+    """Adds 'change' (positions gained, + = up) and a readable 'movement' to a movement() row"""
+    row['change'] = None
+    if row['previous_day'] is None:
+        row['movement'] = 'no earlier data'
+    elif row['found'] and row['previous_found']:
+        row['change'] = row['previous_position'] - row['position']
+        if row['change'] > 0:
+            row['movement'] = f"up {row['change']} position{'s' if row['change'] != 1 else ''}"
+        elif row['change'] < 0:
+            row['movement'] = f"down {-row['change']} position{'s' if row['change'] != -1 else ''}"
+        else:
+            row['movement'] = 'no change'
+    elif row['found']:
+        row['movement'] = 'newly ranked'
+    elif row['previous_found']:
+        row['movement'] = 'dropped out'
+    else:
+        row['movement'] = 'still not found'
+    row['previous_found'] = None if row['previous_found'] is None else bool(row['previous_found'])
+    return row
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Ranking history maintenance')
+    sub = parser.add_subparsers(dest='command', required=True)
+    ingest = sub.add_parser('ingest', help='Fold report / progress CSVs into the history')
+    ingest.add_argument('files', nargs='*', help='CSV files (default: gmb_ranking_*.csv)')
+    sub.add_parser('rebuild', help='Recompute daily aggregates from raw results')
+    args = parser.parse_args(argv)
+
+    history = RankingHistory()
+    try:
+        if args.command == 'rebuild':
+            history.rebuild_daily()
+            print("✅ Daily aggregates rebuilt")
+            return 0
+
+        files = args.files or sorted(glob.glob('gmb_ranking_*.csv'))
+        total = 0
+        for path in files:
+            added = history.ingest_csv(path)
+            total += added
+            print(f"📥 {path}: {added} new result(s)")
+        print(f"✅ Ingested {total} result(s) from {len(files)} file(s)")
+        return 0
+    finally:
+        history.close()
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.exit(main())
@@ -0,0 +1,520 @@
+# ✅ JOB QUEUE + SCHEDULER
+# 🗂️ Tracking jobs in SQLite - every gunicorn worker sees the same queue, status and progress events
+# -*- coding: utf-8 -*-
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+
+from gmb_worker import TrackerWorker, stop_backend
+
+logger = logging.getLogger(__name__)
+
+JOBS_DB = os.environ.get('GMB_JOBS_DB', 'gmb_jobs.sqlite3')
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+FINISHED_STATUSES = (DONE, FAILED, CANCELLED)
+
+# A running job whose owner stopped heartbeating this long ago is requeued (as a resume)
+STALE_AFTER_SECONDS = 60
+MAX_ATTEMPTS = 3
+
+# Per-business events would crowd the log lines out of the buffer
+UNBUFFERED_EVENTS = {'business_seen'}
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS jobs (
+    id               TEXT PRIMARY KEY,
+    status           TEXT NOT NULL,
+    payload          TEXT NOT NULL,
+    label            TEXT,
+    run_id           TEXT,
+    owner            TEXT,
+    worker_pid       INTEGER,
+    attempts         INTEGER NOT NULL DEFAULT 0,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    progress         INTEGER NOT NULL DEFAULT 0,
+    total_keywords   INTEGER NOT NULL DEFAULT 0,
+    current_keyword  TEXT NOT NULL DEFAULT '',
+    last_event_id    INTEGER NOT NULL DEFAULT 0,
+    summary          TEXT,
+    error            TEXT,
+    created_at       REAL NOT NULL,
+    started_at       REAL,
+    finished_at      REAL,
+    heartbeat_at     REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS job_events (
+    job_id  TEXT NOT NULL,
+    id      INTEGER NOT NULL,
+    type    TEXT NOT NULL,
+    data    TEXT NOT NULL,
+    PRIMARY KEY (job_id, id)
+) WITHOUT ROWID;
+'''
+
+def get_max_jobs(default=1):
+    """Jobs running at once across all server workers (GMB_MAX_JOBS, default 1 - one Chrome set each)"""
+    try:
+        return max(1, int(os.environ.get('GMB_MAX_JOBS', default)))
+    except ValueError:
+        return default
+
+def get_buffer_size():
+    """Events kept per job for late joiners (GMB_PROGRESS_BUFFER, default 2000)"""
+    try:
+        return max(10, int(os.environ.get('GMB_PROGRESS_BUFFER', 2000)))
+    except ValueError:
+        return 2000
+
+def new_job_id():
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+def owner_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def owner_host(owner):
+    return (owner or '').split(':', 1)[0]
+
+def fence_lost_worker(job):
+    """Make sure the backend of a job whose owner went silent is no longer running
+
+    A dead or hung server worker leaves its backend subprocess scraping; it is
+    stopped here before the job is handed out again. Backends on another host
+    cannot be reached, so False means the job must not be requeued.
+    """
+    if not job['worker_pid']:
+        return True  # no backend was started for it
+    if owner_host(job['owner']) != socket.gethostname():
+        return False
+    return stop_backend(job['worker_pid'])
+
+def _job(row):
+    if row is None:
+        return None
+    job = dict(row)
+    job['payload'] = json.loads(job['payload'])
+    job['summary'] = json.loads(job['summary']) if job['summary'] else None
+    job['cancel_requested'] = bool(job['cancel_requested'])
+    job['active'] = job['status'] in ACTIVE_STATUSES
+    return job
+
+class JobStore:
+    """Shared job table + bounded per-job event log
+
+    Event ids are per job and only grow, so a client cursor stays valid; only
+    the newest get_buffer_size() events of a job are kept.
+    """
+
+    TRIM_EVERY = 200
+
+    def __init__(self, path=JOBS_DB, buffer_size=None):
+        self.path = path
+        self.buffer_size = buffer_size or get_buffer_size()
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        with self._lock:
+            self.conn.executescript(SCHEMA)
+            self._migrate()
+
+    def _migrate(self):
+        """Columns added after the first release"""
+        columns = {row['name'] for row in self.conn.execute('PRAGMA table_info(jobs)')}
+        if 'worker_pid' not in columns:
+            try:
+                self.conn.execute('ALTER TABLE jobs ADD COLUMN worker_pid INTEGER')
+            except sqlite3.OperationalError:
+                pass  # another server worker added it first
+
+    def _write(self, sql, params=()):
+        with self._lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                cursor = self.conn.execute(sql, params)
+                self.conn.execute('COMMIT')
+                return cursor.rowcount
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+
+    # ------------------------------------------------------------------ jobs
+
+    def submit(self, payload, label=None, job_id=None):
+        job_id = job_id or new_job_id()
+        self._write(
+            'INSERT INTO jobs (id, status, payload, label, created_at) VALUES (?, ?, ?, ?, ?)',
+            (job_id, QUEUED, json.dumps(payload, ensure_ascii=False), label, time.time())
+        )
+        return job_id
+
+    def get(self, job_id):
+        with self._lock:
+            return _job(self.conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone())
+
+    def latest(self):
+        with self._lock:
+            return _job(self.conn.execute('SELECT * FROM jobs ORDER BY created_at DESC LIMIT 1').fetchone())
+
+    def list(self, status=None, limit=50):
+        sql, params = 'SELECT * FROM jobs', []
+        if status:
+            sql += ' WHERE status = ?'
+            params.append(status)
+        sql += ' ORDER BY created_at DESC LIMIT ?'
+        params.append(limit)
+        with self._lock:
+            return [_job(row) for row in self.conn.execute(sql, params)]
+
+    def queue_position(self, job_id):
+        """1-based place in the queue, None once the job has started"""
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT COUNT(*) FROM jobs WHERE status = ? AND created_at <= '
+                '(SELECT created_at FROM jobs WHERE id = ? AND status = ?)',
+                (QUEUED, job_id, QUEUED)
+            ).fetchone()
+        return row[0] or None
+
+    def claim_next(self, owner, max_running):
+        """Atomically move the oldest queued job to running, if a global slot is free
+
+        The job's owner becomes a lease '<owner>/<token>' unique to this claim;
+        every later write for the job is conditional on still holding it.
+        """
+        with self._lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                running = self.conn.execute('SELECT COUNT(*) FROM jobs WHERE status = ?', (RUNNING,)).fetchone()[0]
+                row = None
+                if running < max_running:
+                    row = self.conn.execute(
+                        'SELECT * FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1', (QUEUED,)
+                    ).fetchone()
+                if row is not None:
+                    now = time.time()
+                    self.conn.execute(
+                        'UPDATE jobs SET status = ?, owner = ?, worker_pid = NULL, attempts = attempts + 1, '
+                        'started_at = ?, heartbeat_at = ? WHERE id = ?',
+                        (RUNNING, f"{owner}/{uuid.uuid4().hex[:8]}", now, now, row['id'])
+                    )
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+        return self.get(row['id']) if row is not None else None
+
+    def heartbeat(self, leases):
+        """leases: {job_id: owner}; returns the job ids whose lease was taken away (requeued / failed)"""
+        if not leases:
+            return set()
+        now = time.time()
+        lost = set()
+        with self._lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                for job_id, owner in leases.items():
+                    cursor = self.conn.execute(
+                        'UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND owner = ? AND status = ?',
+                        (now, job_id, owner, RUNNING)
+                    )
+                    if not cursor.rowcount:
+                        lost.add(job_id)
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+        return lost
+
+    def finish(self, job_id, status, summary=None, error=None, owner=None):
+        """Final status; with `owner`, only if that lease still holds the job - returns True if written"""
+        sql = 'UPDATE jobs SET status = ?, summary = ?, error = ?, finished_at = ?, current_keyword = ? WHERE id = ?'
+        params = [status, json.dumps(summary) if summary else None, error, time.time(), '', job_id]
+        if owner is not None:
+            sql += ' AND owner = ?'
+            params.append(owner)
+        return bool(self._write(sql, params))
+
+    def request_cancel(self, job_id):
+        """Queued jobs are cancelled at once; running ones are flagged for their owner"""
+        if self._write(
+            'UPDATE jobs SET status = ?, finished_at = ?, cancel_requested = 1 WHERE id = ? AND status = ?',
+            (CANCELLED, time.time(), job_id, QUEUED)
+        ):
+            return CANCELLED
+        if self._write('UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = ?', (job_id, RUNNING)):
+            return 'cancelling'
+        return None
+
+    def cancel_requested(self, job_ids):
+        if not job_ids:
+            return set()
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT id FROM jobs WHERE cancel_requested = 1 AND id IN ({','.join('?' * len(job_ids))})",
+                job_ids
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def requeue_stale(self, stale_after=STALE_AFTER_SECONDS):
+        """Jobs whose owner died go back to the queue as a resume of their run
+
+        The old backend is stopped first (fence_lost_worker); if that is not
+        possible the job fails instead of being scraped twice.
+        """
+        cutoff = time.time() - stale_after
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT * FROM jobs WHERE status = ? AND heartbeat_at < ?', (RUNNING, cutoff)
+            ).fetchall()
+        requeued = []
+        for row in rows:
+            job = _job(row)
+            if not fence_lost_worker(job):
+                self.finish(
+                    job['id'], FAILED, owner=job['owner'],
+                    error=f"Worker lost on {owner_host(job['owner'])}, its backend (pid {job['worker_pid']}) could not be stopped"
+                )
+                continue
+            if job['attempts'] >= MAX_ATTEMPTS or not job['run_id']:
+                self.finish(job['id'], FAILED, error='Worker lost', owner=job['owner'])
+                continue
+            payload = {'resume': job['run_id'], 'job_id': job['id']}
+            if self._write(
+                'UPDATE jobs SET status = ?, payload = ?, owner = NULL, worker_pid = NULL '
+                'WHERE id = ? AND status = ? AND owner = ?',
+                (QUEUED, json.dumps(payload), job['id'], RUNNING, job['owner'])
+            ):
+                requeued.append(job['id'])
+        return requeued
+
+    # -------------------------------------------------------------- progress
+
+    def set_progress(self, job_id, owner=None, **fields):
+        """Update job columns; with `owner`, only while that lease holds the job"""
+        columns = ', '.join(f"{name} = ?" for name in fields)
+        if owner is None:
+            self._write(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+        else:
+            self._write(f"UPDATE jobs SET {columns} WHERE id = ? AND owner = ?", (*fields.values(), job_id, owner))
+
+    def increment_progress(self, job_id, owner=None):
+        if owner is None:
+            self._write('UPDATE jobs SET progress = progress + 1 WHERE id = ?', (job_id,))
+        else:
+            self._write('UPDATE jobs SET progress = progress + 1 WHERE id = ? AND owner = ?', (job_id, owner))
+
+    def append_event(self, job_id, event_type, **data):
+        """Add one event to the job's log, returns its id"""
+        with self._lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                self.conn.execute('UPDATE jobs SET last_event_id = last_event_id + 1 WHERE id = ?', (job_id,))
+                event_id = self.conn.execute('SELECT last_event_id FROM jobs WHERE id = ?', (job_id,)).fetchone()[0]
+                data.setdefault('time', time.time())
+                self.conn.execute(
+                    'INSERT INTO job_events (job_id, id, type, data) VALUES (?, ?, ?, ?)',
+                    (job_id, event_id, event_type, json.dumps(data, ensure_ascii=False, default=str))
+                )
+                if event_id % self.TRIM_EVERY == 0:
+                    self.conn.execute(
+                        'DELETE FROM job_events WHERE job_id = ? AND id <= ?',
+                        (job_id, event_id - self.buffer_size)
+                    )
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+        return event_id
+
+    def events_since(self, job_id, cursor=0):
+        """(events after cursor, new cursor, truncated)"""
+        with self._lock:
+            last = self.conn.execute('SELECT last_event_id FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            last_id = last[0] if last else 0
+            restarted = cursor > last_id
+            cursor = 0 if restarted else max(0, cursor)
+            rows = self.conn.execute(
+                'SELECT id, type, data FROM job_events WHERE job_id = ? AND id > ? AND id > ? ORDER BY id',
+                (job_id, cursor, last_id - self.buffer_size)
+            ).fetchall()
+
+        events = []
+        for row in rows:
+            event = json.loads(row['data'])
+            event.update(id=row['id'], type=row['type'])
+            events.append(event)
+
+        first_id = events[0]['id'] if events else last_id + 1
+        truncated = restarted or first_id > cursor + 1
+        return events, last_id, truncated
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+def events_text(events):
+    """Joined output lines of a batch of events"""
+    return ''.join(event['text'] for event in events if event['type'] == 'line')
+
+# ============================================================================
+# ⚙️ SCHEDULER
+# ============================================================================
+
+class JobScheduler:
+    """Claims queued jobs for this process and runs each on its own warm backend worker
+
+    Every gunicorn worker runs one scheduler; the global limit is enforced by
+    claim_next() on the shared store.
+    """
+
+    POLL_SECONDS = 1.0
+
+    def __init__(self, store, max_jobs=None, worker_factory=TrackerWorker, on_result=None):
+        self.store = store
+        self.on_result = on_result  # called after every keyword_done (e.g. results cache invalidation)
+        self.max_jobs = max_jobs or get_max_jobs()
+        self.owner = owner_id()
+        self.worker_factory = worker_factory
+        self.idle_workers = []
+        self.running = {}  # job id -> TrackerWorker
+        self.leases = {}   # job id -> owner lease from claim_next()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, daemon=True, name='gmb-job-scheduler')
+            self._thread.start()
+        return self
+
+    def warm(self):
+        """Start one backend worker ahead of the first job"""
+        worker = self.worker_factory()
+        worker.start()
+        with self._lock:
+            self.idle_workers.append(worker)
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        with self._lock:
+            workers = self.idle_workers + list(self.running.values())
+        for worker in workers:
+            worker.stop()
+
+    def _loop(self):
+        last_maintenance = 0
+        while not self._stop.is_set():
+            try:
+                if time.time() - last_maintenance > STALE_AFTER_SECONDS / 4:
+                    last_maintenance = time.time()
+                    for job_id in self.store.requeue_stale():
+                        logger.warning(f"Job {job_id} lost its worker, requeued as resume")
+
+                with self._lock:
+                    job_ids = list(self.running)
+                    leases = {job_id: self.leases[job_id] for job_id in job_ids}
+                for job_id in self.store.heartbeat(leases):
+                    # Requeued elsewhere while this process was unresponsive - stop scraping it here
+                    logger.warning(f"Job {job_id} was taken over by another worker, stopping its backend")
+                    with self._lock:
+                        worker = self.running.get(job_id)
+                    if worker:
+                        worker.kill()
+                for job_id in self.store.cancel_requested(job_ids):
+                    with self._lock:
+                        worker = self.running.get(job_id)
+                    if worker:
+                        worker.cancel(job_id)
+
+                while len(job_ids) < self.max_jobs:
+                    job = self.store.claim_next(self.owner, self.max_jobs)
+                    if job is None:
+                        break
+                    self._launch(job)
+                    job_ids.append(job['id'])
+            except Exception as e:
+                logger.error(f"Job scheduler error: {e}")
+
+            self._wake.wait(self.POLL_SECONDS)
+            self._wake.clear()
+
+    def _launch(self, job):
+        with self._lock:
+            worker = self.idle_workers.pop() if self.idle_workers else self.worker_factory()
+            self.running[job['id']] = worker
+            self.leases[job['id']] = job['owner']
+        threading.Thread(target=self._run, args=(job, worker), daemon=True).start()
+
+    def _run(self, job, worker):
+        job_id = job['id']
+        lease = job['owner']
+        payload = dict(job['payload'], job_id=job_id)
+        if not payload.get('resume'):
+            payload.setdefault('run_id', job_id)
+        self.store.set_progress(job_id, lease, run_id=payload.get('resume') or payload['run_id'])
+        logger.info(f"Job {job_id} started")
+
+        def on_output(line):
+            self.store.append_event(job_id, 'line', text=line)
+
+        def on_event(event):
+            event_type = event.pop('type')
+            if event_type == 'run_started':
+                self.store.set_progress(job_id, lease, total_keywords=event['total'], progress=event.get('done', 0))
+            elif event_type == 'keyword_started':
+                self.store.set_progress(
+                    job_id, lease,
+                    current_keyword=f"{event['keyword']} - {event.get('location_name') or event['location']}"
+                )
+            elif event_type == 'keyword_done':
+                self.store.increment_progress(job_id, lease)
+                if self.on_result:
+                    self.on_result()
+            if event_type not in UNBUFFERED_EVENTS:
+                self.store.append_event(job_id, event_type, **event)
+
+        status, summary, error = FAILED, None, None
+        try:
+            # Recorded so a scheduler elsewhere can stop this backend if we go silent
+            self.store.set_progress(job_id, lease, worker_pid=worker.start().pid)
+            summary = worker.run_job(payload, on_output=on_output, on_event=on_event)
+            status = summary.get('status', FAILED)
+            error = summary.get('error')
+        except Exception as e:
+            error = str(e)
+            on_output(f"\n❌ Tracking Error: {error}\n")
+            logger.error(f"Job {job_id} failed: {e}")
+        finally:
+            if status == FAILED and error:
+                on_output(f"\n⚠️ Job failed: {error}\n")
+            if self.store.finish(job_id, status, summary, error, owner=lease):
+                self.store.append_event(job_id, 'tracking_done', status=status)
+                logger.info(f"Job {job_id} {status}")
+            else:
+                logger.warning(f"Job {job_id} ended here after another worker took it over, outcome dropped")
+            with self._lock:
+                self.running.pop(job_id, None)
+                self.leases.pop(job_id, None)
+                self.idle_workers.append(worker)
+            self.wake()
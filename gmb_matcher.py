@@ -0,0 +1,82 @@
+# ✅ BUSINESS NAME MATCHER
+# 🎯 Aliases normalized once per location config, every found name checked in one indexed pass
+# -*- coding: utf-8 -*-
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# Whole-token stopwords (never substrings - 'in' must not cut 'Prashansa')
+STOPWORDS = frozenset([
+    'dr', 'doctor', 'clinic', 'hospital', 'center', 'the', 'in', 'at',
+    'and', 'or', 'gynaecologist', 'gynecologist',
+])
+
+# Letters/digits only - '-', '.', '&', quotes etc. all split tokens
+TOKEN_RE = re.compile(r'[^\W_]+')
+
+# Share of alias tokens a found name must contain to count as a match
+MIN_COVERAGE = 0.3
+
+MatchResult = namedtuple('MatchResult', ['alias', 'score'])
+
+def tokenize(name):
+    """Lowercased tokens without stopwords"""
+    return [token for token in TOKEN_RE.findall(name.lower()) if token not in STOPWORDS]
+
+class BusinessMatcher:
+    """Fuzzy matcher for one business and its aliases
+
+    A found name matches an alias when it contains at least MIN_COVERAGE of
+    the alias tokens, or when all of its own tokens belong to the alias.
+    The score is the share of alias tokens found (1.0 = every alias word).
+    """
+
+    def __init__(self, aliases):
+        self.aliases = []
+        self._alias_tokens = []
+        self._index = {}
+
+        for alias in dict.fromkeys(a for a in aliases if a):
+            tokens = frozenset(tokenize(alias))
+            if not tokens:
+                continue
+            alias_id = len(self.aliases)
+            self.aliases.append(alias)
+            self._alias_tokens.append(tokens)
+            for token in tokens:
+                self._index.setdefault(token, []).append(alias_id)
+
+    def match(self, found_name):
+        """Best MatchResult for a found name, or None"""
+        found = set(tokenize(found_name or ''))
+        if not found:
+            return None
+
+        common = {}
+        for token in found:
+            for alias_id in self._index.get(token, ()):
+                common[alias_id] = common.get(alias_id, 0) + 1
+
+        best_key, best = None, None
+        for alias_id, shared in common.items():
+            alias_tokens = self._alias_tokens[alias_id]
+            coverage = shared / len(alias_tokens)
+            if coverage < MIN_COVERAGE and not found <= alias_tokens:
+                continue
+            jaccard = shared / len(alias_tokens | found)
+            key = (coverage, jaccard, -alias_id)
+            if best_key is None or key > best_key:
+                best_key, best = key, MatchResult(self.aliases[alias_id], round(coverage, 3))
+
+        return best
+
+    def __call__(self, found_name):
+        return self.match(found_name)
+
+@lru_cache(maxsize=128)
+def _cached_matcher(aliases):
+    return BusinessMatcher(aliases)
+
+def get_matcher(aliases):
+    """Shared matcher per alias list - built once per location config"""
+    return _cached_matcher(tuple(aliases))
@@ -0,0 +1,46 @@
+# ✅ STAGE TIMINGS
+# ⏱️ Cheap per-stage wall-clock accounting for the tracker and the benchmark
+# -*- coding: utf-8 -*-
+import time
+import threading
+from contextlib import contextmanager
+
+class StageTimer:
+    """Accumulates total / count / max seconds per named stage"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.totals = {}
+            self.counts = {}
+            self.maxima = {}
+
+    def add(self, stage, seconds):
+        with self._lock:
+            self.totals[stage] = self.totals.get(stage, 0.0) + seconds
+            self.counts[stage] = self.counts.get(stage, 0) + 1
+            self.maxima[stage] = max(self.maxima.get(stage, 0.0), seconds)
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def snapshot(self):
+        """{stage: {'total', 'count', 'mean', 'max'}} in seconds"""
+        with self._lock:
+            return {
+                stage: {
+                    'total': total,
+                    'count': self.counts[stage],
+                    'mean': total / self.counts[stage],
+                    'max': self.maxima[stage],
+                }
+                for stage, total in self.totals.items()
+            }
@@ -0,0 +1,130 @@
+# ✅ ASYNC SWEEP ORCHESTRATOR
+# 🚦 One flat task list, bounded concurrency, per-host token buckets instead of per-loop sleeps
+# -*- coding: utf-8 -*-
+#
+#   GMB_HOST_RATE_PER_MINUTE   searches per minute per host across all browsers (default 8, 0 = unlimited)
+#   GMB_HOST_BURST             searches a host may take back-to-back before the rate applies (default 1)
+import os
+import time
+import random
+import asyncio
+
+SEARCH_HOST = 'www.google.com'
+
+# Random extra spacing after each token so searches do not land on a fixed beat
+HOST_JITTER_SECONDS = 2.0
+
+# Waits re-check the cancel flag this often
+CANCEL_POLL_SECONDS = 0.5
+
+def get_host_rate():
+    try:
+        return max(0.0, float(os.environ.get('GMB_HOST_RATE_PER_MINUTE', 8)))
+    except ValueError:
+        return 8.0
+
+def get_host_burst():
+    try:
+        return max(1, int(os.environ.get('GMB_HOST_BURST', 1)))
+    except ValueError:
+        return 1
+
+def _cancelled(cancel):
+    return cancel is not None and cancel.is_set()
+
+async def sleep_unless_cancelled(seconds, cancel=None):
+    """asyncio.sleep in short steps; False if cancel was set meanwhile"""
+    deadline = time.monotonic() + seconds
+    while True:
+        if _cancelled(cancel):
+            return False
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return True
+        await asyncio.sleep(min(remaining, CANCEL_POLL_SECONDS))
+
+class TokenBucket:
+    """`rate_per_minute` tokens per minute, holding at most `burst` - one token per search"""
+
+    def __init__(self, rate_per_minute, burst=1, jitter=HOST_JITTER_SECONDS):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst
+        self.jitter = jitter
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, host='', cancel=None):
+        """Wait for a token (waiters are served in arrival order); False if cancelled"""
+        if self.rate <= 0:
+            return not _cancelled(cancel)
+
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                wait = (1 - self.tokens) / self.rate + random.uniform(0, self.jitter)
+                print(f"\n⏳ Rate limit: next search on {host} in {wait:.0f}s...")
+                if not await sleep_unless_cancelled(wait, cancel):
+                    return False
+                self._refill()
+            self.tokens = max(0.0, self.tokens - 1)
+            return True
+
+class SweepOrchestrator:
+    """Runs (location, keyword) tasks on a BrowserPool from one event loop
+
+    Blocking tracker calls run in worker threads; waiting for a spread slot
+    or a rate-limit token happens in the loop, overlapping with searches
+    that are already running.
+    """
+
+    def __init__(self, pool, concurrency=None, rate_per_minute=None, burst=None, max_results=100, on_serp=None):
+        self.pool = pool
+        self.on_serp = on_serp
+        self.concurrency = concurrency or pool.size
+        self.rate_per_minute = get_host_rate() if rate_per_minute is None else rate_per_minute
+        self.burst = burst or get_host_burst()
+        self.max_results = max_results
+        self._buckets = {}
+
+    def bucket(self, host):
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate_per_minute, self.burst)
+        return self._buckets[host]
+
+    async def _wait_for_slot(self, task, cancel):
+        # Every task waits from t=0, so the schedule is logged once by the caller, not here
+        delay = task.get('not_before', 0) - time.time()
+        if delay <= 0:
+            return not _cancelled(cancel)
+        return await sleep_unless_cancelled(delay, cancel)
+
+    async def _run_one(self, task, semaphore, cancel):
+        if not await self._wait_for_slot(task, cancel):
+            return None
+        async with semaphore:
+            host = task.get('host', SEARCH_HOST)
+            if not await self.bucket(host).acquire(host, cancel):
+                return None
+            return await asyncio.to_thread(self.pool.run_task, task, self.max_results, self.on_serp)
+
+    async def run(self, tasks, cancel=None):
+        """Async generator: each task's result list as soon as it completes
+
+        Once `cancel` (a threading.Event) is set no further keyword is started.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        workers = [asyncio.ensure_future(self._run_one(task, semaphore, cancel)) for task in tasks]
+        try:
+            for next_done in asyncio.as_completed(workers):
+                results = await next_done
+                if results is not None:
+                    yield results
+        finally:
+            for worker in workers:
+                worker.cancel()
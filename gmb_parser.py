@@ -0,0 +1,364 @@
+# ✅ GOOGLE LOCAL RESULTS PARSER
+# ⚡ One page_source grab per page, parsed in-process (lxml fast path, stdlib fallback)
+# -*- coding: utf-8 -*-
+import re
+from html.parser import HTMLParser
+
+try:
+    import lxml.html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# Same selector cascade the tracker used through WebDriver
+BUSINESS_SELECTORS = [
+    'div.VkpGBb',
+    'div[jscontroller][data-hveid]',
+    'div.rllt__details',
+    'div[data-cid]',
+]
+
+NAME_SELECTORS = [
+    'div[role="heading"]',
+    'span.OSrXXb',
+    'div.dbg0pd',
+    'a span',
+]
+
+NEXT_PAGE_SELECTORS = [
+    'a#pnnext',
+    'a[aria-label="Next page"]',
+    'a[aria-label="Next"]',
+]
+
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+}
+
+# Tags whose start/end break the rendered text onto a new line (like element.text)
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt',
+    'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3',
+    'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre',
+    'section', 'table', 'tr', 'ul',
+}
+
+HIDDEN_TAGS = {'script', 'style', 'template', 'noscript', 'head', 'title'}
+
+# ============================================================================
+# 🎯 NAME CLEANUP
+# ============================================================================
+
+def clean_business_name(name):
+    """Strip ' - suffix' and '(...)' parts, collapse whitespace"""
+    name = name.split(' -')[0].split('(')[0].strip()
+    return ' '.join(name.split())
+
+def extract_business_name(card):
+    """Business name from one result card - same cascade as the WebDriver version"""
+    for selector in NAME_SELECTORS:
+        element = card.select_one(selector)
+        if element is None:
+            continue
+        name = element.text.strip() or element.get('aria-label')
+        if name and len(name) > 3:
+            name = clean_business_name(name)
+            if len(name) > 3:
+                return name
+
+    text = card.text.strip()
+    if text:
+        for line in text.split('\n')[:3]:
+            line = clean_business_name(line)
+            if len(line) > 3 and len(line) < 100:
+                return line
+
+    return None
+
+# ============================================================================
+# 📄 PAGE PARSING
+# ============================================================================
+
+class ResultsPage:
+    """Parsed local results page"""
+
+    def __init__(self, names, card_count, selector, has_next):
+        self.names = names
+        self.card_count = card_count
+        self.selector = selector
+        self.has_next = has_next
+
+    def __repr__(self):
+        return f"ResultsPage(cards={self.card_count}, names={len(self.names)}, has_next={self.has_next})"
+
+def find_business_cards(document):
+    """First card selector that matches anything wins"""
+    for selector in BUSINESS_SELECTORS:
+        cards = document.select(selector)
+        if cards:
+            return selector, cards
+    return None, []
+
+def has_next_page(document):
+    return any(document.select_one(selector) is not None for selector in NEXT_PAGE_SELECTORS)
+
+def parse_results_page(html):
+    """Parse a results page into card names (None for unnamed cards) and a next-page flag"""
+    document = parse_document(html)
+    selector, cards = find_business_cards(document)
+    names = [extract_business_name(card) for card in cards]
+    return ResultsPage(names, len(cards), selector, has_next_page(document))
+
+def parse_document(html):
+    """Parse HTML with lxml when installed, otherwise with the stdlib parser"""
+    if HAS_LXML:
+        return LxmlElement.from_html(html)
+    return StdlibElement.from_html(html)
+
+# ============================================================================
+# 🔍 MINIMAL CSS SELECTORS (tag, #id, .class, [attr], [attr="v"], descendant)
+# ============================================================================
+
+_COMPOUND_RE = re.compile(
+    r'([a-zA-Z][\w-]*|\*)'
+    r'|#([\w-]+)'
+    r'|\.([\w-]+)'
+    r'|\[\s*([\w-]+)\s*(?:=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\]\s]+)))?\s*\]'
+)
+
+# Whitespace separates descendant steps, except inside [attr="..."]
+_STEP_RE = re.compile(r'(?:\[[^\]]*\]|[^\s\[])+')
+
+_selector_cache = {}
+
+def parse_selector(selector):
+    """Selector string -> list of (tag, id, classes, attrs) steps"""
+    steps = _selector_cache.get(selector)
+    if steps is not None:
+        return steps
+
+    steps = []
+    for part in _STEP_RE.findall(selector):
+        tag, element_id, classes, attrs = None, None, [], []
+        pos = 0
+        while pos < len(part):
+            match = _COMPOUND_RE.match(part, pos)
+            if not match:
+                raise ValueError(f"Unsupported selector: {selector}")
+            if match.group(1):
+                tag = None if match.group(1) == '*' else match.group(1).lower()
+            elif match.group(2):
+                element_id = match.group(2)
+            elif match.group(3):
+                classes.append(match.group(3))
+            else:
+                value = next((g for g in match.group(5, 6, 7) if g is not None), None)
+                attrs.append((match.group(4).lower(), value))
+            pos = match.end()
+        steps.append((tag, element_id, classes, attrs))
+
+    _selector_cache[selector] = steps
+    return steps
+
+def render_text(events):
+    """Approximate WebDriver's element.text from open/close/text events"""
+    parts = []
+    hidden = 0
+    for kind, value in events:
+        if kind == 'text':
+            if not hidden:
+                parts.append(value)
+        elif value in HIDDEN_TAGS:
+            hidden += 1 if kind == 'open' else -1
+        elif value == 'br' or value in BLOCK_TAGS:
+            parts.append('\n')
+
+    lines = (' '.join(line.split()) for line in ''.join(parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+# ============================================================================
+# ⚡ LXML BACKEND
+# ============================================================================
+
+def _xpath_literal(value):
+    """XPath 1.0 string literal - concat() when the value holds both quote types"""
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    parts = ', \'"\', '.join(f'"{part}"' for part in value.split('"'))
+    return f'concat({parts})'
+
+def _steps_to_xpath(steps):
+    xpath = []
+    for tag, element_id, classes, attrs in steps:
+        predicates = []
+        if element_id is not None:
+            predicates.append(f'@id={_xpath_literal(element_id)}')
+        for cls in classes:
+            predicates.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')")
+        for name, value in attrs:
+            predicates.append(f'@{name}' if value is None else f'@{name}={_xpath_literal(value)}')
+        xpath.append('descendant::' + (tag or '*') + ''.join(f'[{p}]' for p in predicates))
+    return '/'.join(xpath)
+
+class LxmlElement:
+    """lxml-backed element with a WebDriver-like read API"""
+
+    _xpath_cache = {}
+
+    def __init__(self, node):
+        self.node = node
+
+    @classmethod
+    def from_html(cls, html):
+        if not html or not html.strip():
+            return cls(lxml.html.fromstring('<html></html>'))
+        return cls(lxml.html.document_fromstring(html))
+
+    def _xpath(self, selector):
+        xpath = self._xpath_cache.get(selector)
+        if xpath is None:
+            xpath = self._xpath_cache[selector] = _steps_to_xpath(parse_selector(selector))
+        return xpath
+
+    def select(self, selector):
+        return [LxmlElement(node) for node in self.node.xpath(self._xpath(selector))]
+
+    def select_one(self, selector):
+        nodes = self.node.xpath(self._xpath(selector))
+        return LxmlElement(nodes[0]) if nodes else None
+
+    def get(self, name):
+        return self.node.get(name)
+
+    @property
+    def tag(self):
+        return self.node.tag
+
+    @property
+    def text(self):
+        return render_text(self._events(self.node, root=True))
+
+    def _events(self, node, root=False):
+        if isinstance(node.tag, str):
+            tag = node.tag.lower()
+            yield 'open', tag
+            if node.text:
+                yield 'text', node.text
+            for child in node:
+                yield from self._events(child)
+            yield 'close', tag
+        if node.tail and not root:
+            yield 'text', node.tail
+
+# ============================================================================
+# 🐍 STDLIB BACKEND
+# ============================================================================
+
+class StdlibElement:
+    """html.parser-backed element with the same API as LxmlElement"""
+
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.parent = parent
+        self.children = []
+
+    @classmethod
+    def from_html(cls, html):
+        builder = _TreeBuilder()
+        builder.feed(html or '')
+        builder.close()
+        return builder.root
+
+    def get(self, name):
+        return self.attrs.get(name)
+
+    def _matches(self, step):
+        tag, element_id, classes, attrs = step
+        if tag is not None and self.tag != tag:
+            return False
+        if element_id is not None and self.attrs.get('id') != element_id:
+            return False
+        if classes:
+            own = (self.attrs.get('class') or '').split()
+            if any(cls not in own for cls in classes):
+                return False
+        for name, value in attrs:
+            if name not in self.attrs:
+                return False
+            if value is not None and self.attrs[name] != value:
+                return False
+        return True
+
+    def iter_descendants(self):
+        stack = [c for c in reversed(self.children) if isinstance(c, StdlibElement)]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(c for c in reversed(node.children) if isinstance(c, StdlibElement))
+
+    def select(self, selector):
+        steps = parse_selector(selector)
+        if not steps:
+            return []
+        contexts = [self]
+        for step in steps:
+            seen = set()
+            found = []
+            for context in contexts:
+                for node in context.iter_descendants():
+                    if id(node) not in seen and node._matches(step):
+                        seen.add(id(node))
+                        found.append(node)
+            contexts = found
+            if not contexts:
+                break
+        if len(contexts) > 1:
+            order = {id(node): i for i, node in enumerate(self.iter_descendants())}
+            contexts.sort(key=lambda node: order[id(node)])
+        return contexts
+
+    def select_one(self, selector):
+        found = self.select(selector)
+        return found[0] if found else None
+
+    @property
+    def text(self):
+        return render_text(self._events())
+
+    def _events(self):
+        yield 'open', self.tag
+        for child in self.children:
+            if isinstance(child, StdlibElement):
+                yield from child._events()
+            else:
+                yield 'text', child
+        yield 'close', self.tag
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = StdlibElement('#document')
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = StdlibElement(tag, {k: (v if v is not None else '') for k, v in attrs}, self.stack[-1])
+        self.stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        node = StdlibElement(tag, {k: (v if v is not None else '') for k, v in attrs}, self.stack[-1])
+        self.stack[-1].children.append(node)
+
+    def handle_endtag(self, tag):
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag == tag:
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
@@ -0,0 +1,209 @@
+# ✅ SERP RECORD / REPLAY
+# 🎞️ Save every results page during a live run, replay them later without Chrome or network
+# -*- coding: utf-8 -*-
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+from urllib.parse import urlparse, parse_qs
+
+from gmb_engines import RESULTS_PER_PAGE
+from gmb_parser import parse_document
+
+# ============================================================================
+# 💾 SNAPSHOT STORE
+# ============================================================================
+
+def normalize_query(query):
+    return ' '.join(query.lower().split())
+
+def snapshot_key(query):
+    """Readable, collision-safe directory name for a search query"""
+    query = normalize_query(query)
+    slug = re.sub(r'[^a-z0-9]+', '-', query).strip('-')[:80]
+    digest = hashlib.sha1(query.encode('utf-8')).hexdigest()[:8]
+    return f"{slug}-{digest}"
+
+class SnapshotStore:
+    """Results-page HTML on disk, keyed by (search query, page number)
+
+    Layout: <root>/<query-key>/page_<n>.html plus a meta.json with the query.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def _dir(self, query):
+        return os.path.join(self.root, snapshot_key(query))
+
+    def path(self, query, page_number):
+        return os.path.join(self._dir(query), f"page_{page_number}.html")
+
+    def save(self, query, page_number, html):
+        directory = self._dir(query)
+        os.makedirs(directory, exist_ok=True)
+
+        meta_path = os.path.join(directory, 'meta.json')
+        if not os.path.exists(meta_path):
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump({'query': query}, f, ensure_ascii=False)
+
+        with open(self.path(query, page_number), 'w', encoding='utf-8') as f:
+            f.write(html)
+
+    def has(self, query, page_number):
+        return os.path.exists(self.path(query, page_number))
+
+    def load(self, query, page_number):
+        """Recorded HTML, or None if that page was never recorded"""
+        try:
+            with open(self.path(query, page_number), encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def queries(self):
+        """Every recorded search query"""
+        found = []
+        if not os.path.isdir(self.root):
+            return found
+        for name in sorted(os.listdir(self.root)):
+            meta_path = os.path.join(self.root, name, 'meta.json')
+            if os.path.exists(meta_path):
+                with open(meta_path, encoding='utf-8') as f:
+                    found.append(json.load(f)['query'])
+        return found
+
+# ============================================================================
+# 🎞️ STAND-IN DRIVER
+# ============================================================================
+
+EMPTY_PAGE = '<html><body></body></html>'
+
+class ReplayElement:
+    """WebElement stand-in backed by a parsed snapshot"""
+
+    def __init__(self, driver, element):
+        self._driver = driver
+        self._element = element
+
+    @property
+    def text(self):
+        return self._element.text
+
+    def get_attribute(self, name):
+        return self._element.get(name)
+
+    def is_displayed(self):
+        return True
+
+    def find_element(self, by, selector):
+        found = self._element.select_one(selector)
+        if found is None:
+            raise LookupError(f"No element matches {selector}")
+        return ReplayElement(self._driver, found)
+
+    def find_elements(self, by, selector):
+        return [ReplayElement(self._driver, e) for e in self._element.select(selector)]
+
+    def click(self):
+        self._driver._click(self)
+
+class ReplayDriver:
+    """Just enough of the WebDriver API for AdvancedGMBRankingTracker
+
+    get() reads the query from the ?q= URL, clicking a next-page link loads
+    the next recorded page. Pages that were never recorded come back empty,
+    which the tracker treats as the end of the results.
+    """
+
+    def __init__(self, store):
+        self.store = store if isinstance(store, SnapshotStore) else SnapshotStore(store)
+        self.query = None
+        self.page_number = 1
+        self.current_url = 'about:blank'
+        self.page_source = EMPTY_PAGE
+        self._document = None
+
+    def _load(self, query, page_number):
+        self.query = query
+        self.page_number = page_number
+        self.page_source = self.store.load(query, page_number) or EMPTY_PAGE
+        self._document = None
+        self.current_url = f"replay://{snapshot_key(query)}/{page_number}"
+
+    def _dom(self):
+        if self._document is None:
+            self._document = parse_document(self.page_source)
+        return self._document
+
+    def get(self, url):
+        params = parse_qs(urlparse(url).query)
+        query = params.get('q', [''])[0]
+        start = int(params.get('start', ['0'])[0] or 0)
+        self._load(query, start // RESULTS_PER_PAGE + 1)
+
+    def find_element(self, by, selector):
+        found = self._dom().select_one(selector)
+        if found is None:
+            raise LookupError(f"No element matches {selector}")
+        return ReplayElement(self, found)
+
+    def find_elements(self, by, selector):
+        return [ReplayElement(self, e) for e in self._dom().select(selector)]
+
+    def _click(self, element):
+        if element.get_attribute('id') == 'pnnext' or element.get_attribute('aria-label') in ('Next page', 'Next'):
+            self._load(self.query, self.page_number + 1)
+
+    def execute_script(self, script, *args):
+        if 'click()' in script and args and isinstance(args[0], ReplayElement):
+            self._click(args[0])
+        return None
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+# ============================================================================
+# 🚀 OFFLINE RUNS
+# ============================================================================
+
+def create_replay_tracker(fixtures_dir, **kwargs):
+    """Tracker wired to recorded snapshots, with all delays disabled"""
+    from gmb_tracker_backend import AdvancedGMBRankingTracker
+
+    kwargs.setdefault('delay_scale', 0)
+    kwargs.setdefault('cache', False)
+    kwargs.setdefault('engine', 'browser')
+    return AdvancedGMBRankingTracker(driver=ReplayDriver(fixtures_dir), **kwargs)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the tracker against recorded results pages')
+    parser.add_argument('fixtures', help='Directory recorded with GMB_RECORD_DIR')
+    parser.add_argument('--location', required=True, help='Location used when recording, e.g. "Malad, Mumbai"')
+    parser.add_argument('--business', required=True, help='Business name to look for')
+    parser.add_argument('--alias', action='append', default=[], help='Extra business name alias (repeatable)')
+    parser.add_argument('keywords', nargs='+')
+    args = parser.parse_args(argv)
+
+    tracker = create_replay_tracker(args.fixtures)
+    results = []
+    try:
+        for keyword in args.keywords:
+            results.append(tracker.check_gmb_ranking(
+                keyword, args.location, args.business, [args.business] + args.alias
+            ))
+    finally:
+        tracker.close()
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    return results
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
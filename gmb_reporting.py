@@ -0,0 +1,89 @@
+# ✅ RESULTS REPORTING
+# 📊 Column-wise summaries + record serialization shared by /api/results and the CLI final report
+# -*- coding: utf-8 -*-
+import pandas as pd
+
+from gmb_results import FLOAT_FIELDS, INT_FIELDS, RESULT_FIELDS
+
+def results_frame(rows, columns=None):
+    """DataFrame with typed columns: nullable ints, float scores, boolean 'found'"""
+    df = pd.DataFrame(rows, columns=columns)
+    for column in RESULT_FIELDS:
+        if column not in df.columns:
+            df[column] = None
+    for column in INT_FIELDS:
+        df[column] = pd.to_numeric(df[column], errors='coerce').astype('Int64')
+    for column in FLOAT_FIELDS:
+        df[column] = pd.to_numeric(df[column], errors='coerce')
+    df['found'] = df['found'].astype('boolean').fillna(False).astype(bool)
+    return df
+
+def filter_results(df, location=None, keyword=None, found=None, since=None, until=None):
+    """Rows matching every given filter (case-insensitive location / keyword substring, timestamp range)
+
+    since / until take 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS'; a bare date for until includes that whole day.
+    """
+    mask = pd.Series(True, index=df.index)
+    if location:
+        location = location.lower()
+        mask &= (
+            df['location_name'].fillna('').str.lower().str.contains(location, regex=False)
+            | df['location'].fillna('').str.lower().str.contains(location, regex=False)
+        )
+    if keyword:
+        mask &= df['keyword'].fillna('').str.lower().str.contains(keyword.lower(), regex=False)
+    if found is not None:
+        mask &= df['found'] == found
+    if since or until:
+        times = pd.to_datetime(df['timestamp'], errors='coerce')
+        if since:
+            mask &= times >= pd.Timestamp(since)
+        if until:
+            end = pd.Timestamp(until)
+            mask &= (times < end + pd.Timedelta(days=1)) if len(until.strip()) <= 10 else (times <= end)
+    return df[mask]
+
+def to_records(df):
+    """JSON-ready row dicts - NA / NaN become None, numpy scalars become Python values"""
+    if df.empty:
+        return []
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+def summarize(df):
+    """Found count, success rate, per-location rank and the page distribution of found results"""
+    total = len(df)
+    found_df = df[df['found']]
+    found = len(found_df)
+
+    location = df['location_name'].fillna(df['location']).fillna('')
+    by_location = (
+        df.assign(location_name=location, found_position=df['position'].where(df['found']))
+        .groupby('location_name', sort=True)
+        .agg(
+            keywords=('keyword', 'size'),
+            found=('found', 'sum'),
+            avg_position=('found_position', 'mean'),
+            best_position=('found_position', 'min'),
+        )
+        .reset_index()
+    )
+    by_location['success_rate'] = (by_location['found'] / by_location['keywords'] * 100).round(1)
+    by_location['avg_position'] = by_location['avg_position'].astype('Float64').round(1)
+
+    pages = found_df['page'].dropna().astype(int).value_counts().sort_index()
+
+    return {
+        'found': found,
+        'total': total,
+        'success_rate': float(found / total * 100) if total else 0,
+        'by_location': to_records(by_location),
+        'page_distribution': {str(page): int(count) for page, count in pages.items()},
+    }
+
+def keyword_ranks(df):
+    """Found keywords ranked best position first"""
+    columns = ['keyword', 'location_name', 'searched_business', 'found_business_name', 'position', 'page']
+    return to_records(df.loc[df['found'], columns].sort_values(['position', 'keyword'], kind='stable'))
+
+def not_found_rows(df):
+    return to_records(df.loc[~df['found'], ['keyword', 'location_name', 'searched_business', 'total_checked', 'error']])
@@ -0,0 +1,222 @@
+# ✅ APPEND-ONLY RESULTS STORE
+# 💾 One CSV row per keyword, flushed + fsynced - no DataFrame rebuild per keyword
+# -*- coding: utf-8 -*-
+import os
+import re
+import csv
+import io
+import glob
+import time
+import shutil
+import threading
+from datetime import datetime
+
+PROGRESS_CSV = 'gmb_ranking_progress.csv'
+
+# Run ids become part of file names - timestamp + hex from new_run_id(), job ids alike
+RUN_ID_RE = re.compile(r'^[A-Za-z0-9_-]+$')
+
+# Superset of the keys produced by the found / not-found / error result dicts
+RESULT_FIELDS = [
+    'keyword',
+    'location',
+    'location_name',
+    'searched_business',
+    'found_business_name',
+    'matched_alias',
+    'match_score',
+    'position',
+    'page',
+    'found',
+    'total_checked',
+    'error',
+    'timestamp',
+]
+
+INT_FIELDS = {'position', 'page', 'total_checked'}
+FLOAT_FIELDS = {'match_score'}
+
+def _flatten(value):
+    """Keep one physical line per row so the file can be tailed line by line"""
+    if isinstance(value, str):
+        return ' '.join(value.splitlines())
+    return value
+
+def parse_result_row(row):
+    """CSV strings back to result types (bool / int / float / None)"""
+    parsed = {}
+    for key, value in row.items():
+        if value == '' or value is None:
+            parsed[key] = None
+        elif key == 'found':
+            parsed[key] = value == 'True'
+        elif key in INT_FIELDS:
+            try:
+                parsed[key] = int(float(value))
+            except ValueError:
+                parsed[key] = None
+        elif key in FLOAT_FIELDS:
+            try:
+                parsed[key] = float(value)
+            except ValueError:
+                parsed[key] = None
+        else:
+            parsed[key] = value
+    return parsed
+
+class ResultsWriter:
+    """Appends results to the progress CSV as they arrive"""
+
+    def __init__(self, path=PROGRESS_CSV, fields=RESULT_FIELDS, truncate=True):
+        self.path = path
+        self.fields = fields
+        self.rows = 0
+        self._lock = threading.Lock()
+
+        if truncate or not os.path.exists(path) or os.path.getsize(path) == 0:
+            # Swap in a fresh file (new inode) so tailing readers notice the restart
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+                csv.DictWriter(f, fieldnames=fields).writeheader()
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+
+        self._file = open(path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=fields, extrasaction='ignore')
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def write(self, result):
+        with self._lock:
+            self._writer.writerow({key: _flatten(result.get(key)) for key in self.fields})
+            self._sync()
+            self.rows += 1
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def progress_path(run_id=None):
+    """Progress CSV of one run (gmb_ranking_progress_<run_id>.csv) - concurrent jobs never share a file"""
+    if not run_id:
+        return PROGRESS_CSV
+    if not RUN_ID_RE.match(run_id):
+        raise ValueError(f"Invalid run id: {run_id}")
+    root, ext = os.path.splitext(PROGRESS_CSV)
+    return f"{root}_{run_id}{ext}"
+
+def latest_progress_path():
+    """Most recently written run progress file, else PROGRESS_CSV"""
+    root, ext = os.path.splitext(PROGRESS_CSV)
+    newest, newest_mtime = PROGRESS_CSV, None
+    for path in glob.glob(f"{glob.escape(root)}_*{ext}"):
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            continue
+        if newest_mtime is None or mtime > newest_mtime:
+            newest, newest_mtime = path, mtime
+    return newest
+
+def export_report(source=PROGRESS_CSV, filename=None):
+    """Stream the progress file into a timestamped report"""
+    filename = filename or f'gmb_ranking_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    with open(source, 'rb') as src, open(filename, 'wb') as dest:
+        shutil.copyfileobj(src, dest)
+    return filename
+
+def get_results_poll_interval():
+    """Seconds refresh() trusts the in-memory rows before stat-ing the file again (GMB_RESULTS_POLL_SECONDS)"""
+    try:
+        return max(0.0, float(os.environ.get('GMB_RESULTS_POLL_SECONDS', 1.0)))
+    except ValueError:
+        return 1.0
+
+class ResultsTail:
+    """Incremental reader for the progress CSV - only new bytes are parsed per call
+
+    (inode, offset) identifies what has been read, so it doubles as a
+    version that every process reading the same file agrees on.
+    """
+
+    def __init__(self, path=PROGRESS_CSV, poll_interval=None):
+        self.path = path
+        self.poll_interval = get_results_poll_interval() if poll_interval is None else poll_interval
+        self.modified_at = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.rows = []
+        self.offset = 0
+        self.header = None
+        self.inode = None
+        self.version = 0
+
+    @property
+    def etag(self):
+        """Changes whenever rows are appended or the file is replaced"""
+        return f"{self.inode or 0:x}-{self.offset:x}"
+
+    def invalidate(self):
+        """A result was just written - the next refresh() re-checks the file"""
+        self._checked_at = None
+
+    def refresh(self):
+        """Cached rows; the file is only stat-ed once per poll_interval or after invalidate()"""
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.poll_interval:
+            return self.rows
+        self._checked_at = now
+        return self.read()
+
+    def read(self):
+        """All rows so far (parsed); picks up appended rows, restarts if the file was replaced"""
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                self._reset()
+                self.modified_at = None
+                return self.rows
+
+            if stat.st_ino != self.inode or stat.st_size < self.offset:
+                self._reset()
+                self.inode = stat.st_ino
+                self.modified_at = stat.st_mtime
+
+            if stat.st_size == self.offset:
+                return self.rows
+
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                chunk = f.read(stat.st_size - self.offset)
+
+            # Only consume complete lines - the writer may be mid-row
+            end = chunk.rfind(b'\n') + 1
+            if not end:
+                return self.rows
+            self.offset += end
+            self.modified_at = stat.st_mtime
+
+            lines = chunk[:end].decode('utf-8', errors='replace').splitlines()
+            if self.header is None and lines:
+                self.header = next(csv.reader([lines[0]]))
+                lines = lines[1:]
+
+            for values in csv.reader(io.StringIO('\n'.join(lines))):
+                if values:
+                    self.rows.append(parse_result_row(dict(zip(self.header, values))))
+            self.version += 1
+            return self.rows
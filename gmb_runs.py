@@ -0,0 +1,121 @@
+# ✅ RESUMABLE RUN MANIFESTS
+# 🔁 Every (location, keyword) pair of a run with its status - checkpointed as each keyword completes
+# -*- coding: utf-8 -*-
+import os
+import json
+import threading
+from datetime import datetime
+
+from gmb_results import RUN_ID_RE
+
+RUNS_DIR = os.environ.get('GMB_RUNS_DIR', 'runs')
+
+PENDING = 'pending'
+DONE = 'done'
+ERROR = 'error'
+
+def task_key(location, keyword):
+    return f"{location}|{keyword}"
+
+def check_run_id(run_id):
+    """Run ids become file names - reject anything but letters, digits, '_' and '-'"""
+    if not isinstance(run_id, str) or not RUN_ID_RE.match(run_id):
+        raise ValueError(f"Invalid run id: {run_id!r}")
+    return run_id
+
+class RunManifest:
+    """Run plan + append-only checkpoint log
+
+    runs/<run_id>.json   config and task list, written once
+    runs/<run_id>.jsonl  one line per finished keyword, appended and fsynced
+
+    Error results stay resumable; only 'done' keywords are skipped on resume.
+    """
+
+    def __init__(self, run_id, config, tasks, runs_dir=RUNS_DIR):
+        self.run_id = check_run_id(run_id)
+        self.config = config
+        self.tasks = tasks
+        self.runs_dir = runs_dir
+        self.status = {task_key(t['location'], t['keyword']): PENDING for t in tasks}
+        self.results = {}
+        self._lock = threading.Lock()
+
+    @property
+    def plan_path(self):
+        return os.path.join(self.runs_dir, f"{self.run_id}.json")
+
+    @property
+    def log_path(self):
+        return os.path.join(self.runs_dir, f"{self.run_id}.jsonl")
+
+    @classmethod
+    def create(cls, run_id, config, tasks, runs_dir=RUNS_DIR):
+        manifest = cls(run_id, config, tasks, runs_dir)
+        os.makedirs(runs_dir, exist_ok=True)
+
+        tmp_path = f"{manifest.plan_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'run_id': run_id,
+                'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'config': config,
+                'tasks': tasks,
+            }, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, manifest.plan_path)
+        return manifest
+
+    @classmethod
+    def load(cls, run_id, runs_dir=RUNS_DIR):
+        path = os.path.join(runs_dir, f"{check_run_id(run_id)}.json")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No run manifest for '{run_id}' in {runs_dir}")
+
+        with open(path, encoding='utf-8') as f:
+            plan = json.load(f)
+        manifest = cls(run_id, plan['config'], plan['tasks'], runs_dir)
+
+        if os.path.exists(manifest.log_path):
+            with open(manifest.log_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from a crash
+                    manifest.status[entry['key']] = entry['status']
+                    # Older logs hold a single 'result' per keyword
+                    manifest.results[entry['key']] = entry.get('results') or [entry['result']]
+        return manifest
+
+    def checkpoint(self, results):
+        """Record a finished keyword (one result per target business) - durable before the next one starts"""
+        key = task_key(results[0].get('location'), results[0].get('keyword'))
+        status = ERROR if any(result.get('error') for result in results) else DONE
+        line = json.dumps({'key': key, 'status': status, 'results': results}, ensure_ascii=False, default=str)
+
+        with self._lock:
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self.status[key] = status
+            self.results[key] = results
+
+    def pending_tasks(self):
+        """Tasks not completed yet, in their original order"""
+        return [dict(t) for t in self.tasks if self.status[task_key(t['location'], t['keyword'])] != DONE]
+
+    def completed_results(self):
+        """Results of 'done' keywords in task order"""
+        done = []
+        for task in self.tasks:
+            key = task_key(task['location'], task['keyword'])
+            if self.status[key] == DONE:
+                done.extend(self.results[key])
+        return done
+
+    def counts(self):
+        counts = {PENDING: 0, DONE: 0, ERROR: 0}
+        for status in self.status.values():
+            counts[status] += 1
+        return counts
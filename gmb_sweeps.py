@@ -0,0 +1,304 @@
+# ✅ RECURRING RANK SWEEPS
+# ⏰ Cron-scheduled preset / custom sweeps, paced across a time window - queued through the job store
+# -*- coding: utf-8 -*-
+#
+# gmb_sweeps.json (GMB_SWEEPS_FILE):
+#   [
+#     {"name": "malad-daily", "cron": "0 7 * * *", "choice": "1", "window_minutes": 120, "jitter_seconds": 90},
+#     {"name": "clinic-weekly", "cron": "30 6 * * 1", "business": "Clinic", "location": "Pune",
+#      "keywords": ["ivf centre", "gynecologist"], "window_minutes": 60}
+#   ]
+#
+# A paced sweep holds its job slot for the whole window, so while this file exists the
+# server runs 2 jobs at once unless GMB_MAX_JOBS says otherwise - manual runs are not
+# queued behind a two-hour sweep.
+import os
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from gmb_config import CUSTOM_CHOICE, load_config
+from gmb_jobs import ACTIVE_STATUSES, FINISHED_STATUSES
+
+logger = logging.getLogger(__name__)
+
+SWEEPS_FILE = os.environ.get('GMB_SWEEPS_FILE', 'gmb_sweeps.json')
+
+# Job slots when sweeps are configured and GMB_MAX_JOBS is unset: one sweep + one manual run
+SWEEP_MAX_JOBS = 2
+
+# Minutes a server that was busy or restarting may still fire a missed trigger
+CATCH_UP_MINUTES = 10
+
+SKIPPED = 'skipped'
+
+# ============================================================================
+# 🕒 CRON
+# ============================================================================
+
+CRON_FIELDS = [
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day', 1, 31),
+    ('month', 1, 12),
+    ('weekday', 0, 7),
+]
+
+def _parse_field(text, low, high):
+    values = set()
+    for part in text.split(','):
+        step = 1
+        if '/' in part:
+            part, step = part.split('/', 1)
+            step = int(step)
+            if step < 1:
+                raise ValueError(f"bad step in '{text}'")
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(v) for v in part.split('-', 1))
+        else:
+            start = end = int(part)
+            if step > 1:
+                end = high
+        if start < low or end > high or start > end:
+            raise ValueError(f"'{text}' out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+class CronSchedule:
+    """Standard 5-field cron: minute hour day month weekday (0 = Sunday, 7 also accepted)"""
+
+    def __init__(self, expression):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"cron needs 5 fields, got '{expression}'")
+        self.expression = expression
+        fields = [_parse_field(part, low, high) for part, (_, low, high) in zip(parts, CRON_FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = fields
+        self.weekdays = frozenset(day % 7 for day in weekdays)
+        self.any_day = parts[2] == '*'
+        self.any_weekday = parts[4] == '*'
+
+    def _day_matches(self, dt):
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok  # cron ORs day-of-month and weekday when both are set
+
+    def matches(self, dt):
+        return (
+            dt.minute in self.minutes and dt.hour in self.hours
+            and dt.month in self.months and self._day_matches(dt)
+        )
+
+    def next_after(self, dt):
+        """First matching minute strictly after dt (None if nothing within ~4 years)"""
+        dt = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 4)
+        while dt < limit:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+            elif dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+            elif dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+            else:
+                return dt
+        return None
+
+# ============================================================================
+# 📋 SWEEP DEFINITIONS
+# ============================================================================
+
+def sweeps_configured(path=SWEEPS_FILE):
+    return os.path.exists(path)
+
+def validate_sweep(raw):
+    """Normalized sweep dict - raises ValueError naming the broken field"""
+    name = str(raw.get('name', '')).strip()
+    if not name:
+        raise ValueError("sweep without a 'name'")
+
+    sweep = {
+        'name': name,
+        'cron': CronSchedule(str(raw.get('cron', ''))),
+        'enabled': bool(raw.get('enabled', True)),
+        'window_minutes': float(raw.get('window_minutes', 0)),
+        'jitter_seconds': float(raw.get('jitter_seconds', 0)),
+    }
+
+    if raw.get('business'):
+        keywords = raw.get('keywords') or []
+        if isinstance(keywords, str):
+            keywords = keywords.split('\n')
+        keywords = [kw.strip() for kw in keywords if kw.strip()]
+        if not raw.get('location') or not keywords:
+            raise ValueError(f"sweep '{name}': custom sweeps need 'location' and 'keywords'")
+        sweep['job'] = {
+            'choice': CUSTOM_CHOICE,
+            'business': raw['business'],
+            'location': raw['location'],
+            'keywords': '\n'.join(keywords) + '\n',
+        }
+    else:
+        choice = str(raw.get('choice', ''))
+        presets = load_config().presets
+        if choice not in presets:
+            raise ValueError(f"sweep '{name}': 'choice' must be a preset id ({', '.join(presets)}) or give a business")
+        sweep['job'] = {'choice': choice}
+
+    sweep['job']['spread_seconds'] = sweep['window_minutes'] * 60
+    sweep['job']['jitter_seconds'] = sweep['jitter_seconds']
+    return sweep
+
+class SweepConfig:
+    """Sweep file loader - re-read only when its mtime changes"""
+
+    def __init__(self, path=SWEEPS_FILE):
+        self.path = path
+        self._mtime = None
+        self._sweeps = []
+        self._lock = threading.Lock()
+
+    def sweeps(self):
+        with self._lock:
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except FileNotFoundError:
+                self._mtime, self._sweeps = None, []
+                return self._sweeps
+
+            if mtime != self._mtime:
+                with open(self.path, encoding='utf-8') as f:
+                    raw = json.load(f)
+                sweeps = [validate_sweep(item) for item in raw]
+                names = [sweep['name'] for sweep in sweeps]
+                if len(set(names)) != len(names):
+                    raise ValueError(f"duplicate sweep names in {self.path}")
+                self._mtime, self._sweeps = mtime, sweeps
+                logger.info(f"Loaded {len(sweeps)} sweep(s) from {self.path}")
+            return self._sweeps
+
+    def get(self, name):
+        return next((sweep for sweep in self.sweeps() if sweep['name'] == name), None)
+
+# ============================================================================
+# ⏰ SCHEDULER
+# ============================================================================
+
+class SweepScheduler:
+    """Fires due sweeps as jobs; each (sweep, minute) slot is claimed once across all server workers"""
+
+    TICK_SECONDS = 20
+
+    def __init__(self, job_store, history, config=None, on_submit=None):
+        self.job_store = job_store
+        self.history = history
+        self.config = config or SweepConfig()
+        self.on_submit = on_submit
+        # The first tick looks back CATCH_UP_MINUTES so triggers missed during a restart still fire;
+        # slots that already fired are claimed in sweep_runs, so claim_sweep_slot() skips them
+        self._last_checked = datetime.now().replace(second=0, microsecond=0) - timedelta(minutes=CATCH_UP_MINUTES)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, daemon=True, name='gmb-sweep-scheduler')
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Sweep scheduler error: {e}")
+            self._stop.wait(self.TICK_SECONDS)
+
+    def tick(self, now=None):
+        """Fire every sweep due since the last tick, then refresh outcomes of open runs"""
+        now = (now or datetime.now()).replace(second=0, microsecond=0)
+        minute = max(self._last_checked, now - timedelta(minutes=CATCH_UP_MINUTES)) + timedelta(minutes=1)
+
+        while minute <= now:
+            for sweep in self.config.sweeps():
+                if sweep['enabled'] and sweep['cron'].matches(minute):
+                    self.trigger(sweep, minute.strftime('%Y-%m-%d %H:%M'))
+            minute += timedelta(minutes=1)
+        self._last_checked = now
+
+        self.reconcile()
+
+    def _previous_active(self, name):
+        for run in self.history.sweep_runs(sweep=name, status=ACTIVE_STATUSES, limit=5):
+            job = self.job_store.get(run['job_id']) if run['job_id'] else None
+            if job is not None and job['active']:
+                return run
+        return None
+
+    def trigger(self, sweep, slot):
+        """Queue one sweep run (or record it as skipped); returns the job id or None"""
+        previous = self._previous_active(sweep['name'])
+        if previous is not None:
+            if self.history.claim_sweep_slot(sweep['name'], slot, SKIPPED):
+                self.history.update_sweep_run(
+                    sweep['name'], slot, status=SKIPPED, error=f"previous run {previous['slot']} still running"
+                )
+                logger.warning(f"Sweep {sweep['name']} @ {slot} skipped - {previous['slot']} still running")
+            return None
+
+        if not self.history.claim_sweep_slot(sweep['name'], slot, 'queued'):
+            return None  # another server worker fired this slot
+
+        job_id = self.job_store.submit(dict(sweep['job']), label=f"⏰ Sweep {sweep['name']} @ {slot}")
+        self.history.update_sweep_run(sweep['name'], slot, job_id=job_id)
+        logger.info(f"Sweep {sweep['name']} @ {slot} queued as job {job_id}")
+        if self.on_submit:
+            self.on_submit()
+        return job_id
+
+    def reconcile(self):
+        """Copy finished job outcomes (found / total from the ranking history) onto their sweep runs"""
+        for run in self.history.sweep_runs(status=ACTIVE_STATUSES, limit=100):
+            job = self.job_store.get(run['job_id']) if run['job_id'] else None
+            if job is None:
+                self.history.update_sweep_run(run['sweep'], run['slot'], status='failed', error='job missing')
+            elif job['status'] in FINISHED_STATUSES:
+                rows = self.history.run_results(job['run_id']) if job['run_id'] else []
+                self.history.update_sweep_run(
+                    run['sweep'], run['slot'], status=job['status'], error=job['error'],
+                    found=sum(1 for row in rows if row['found']), total=len(rows)
+                )
+            elif job['status'] != run['status']:
+                self.history.update_sweep_run(run['sweep'], run['slot'], status=job['status'])
+
+    @staticmethod
+    def _next_run(sweep, now):
+        next_run = sweep['cron'].next_after(now) if sweep['enabled'] else None
+        return next_run.strftime('%Y-%m-%d %H:%M') if next_run else None
+
+    def overview(self):
+        """Every configured sweep with its next trigger and recent outcomes"""
+        now = datetime.now()
+        return [
+            {
+                'name': sweep['name'],
+                'cron': sweep['cron'].expression,
+                'enabled': sweep['enabled'],
+                'window_minutes': sweep['window_minutes'],
+                'jitter_seconds': sweep['jitter_seconds'],
+                'job': sweep['job'],
+                'next_run': self._next_run(sweep, now),
+                'recent_runs': self.history.sweep_runs(sweep=sweep['name'], limit=10),
+            }
+            for sweep in self.config.sweeps()
+        ]
@@ -2,27 +2,43 @@
 # 🎯 With Menu System + Multi-Location + Pagination Support
 # 🚀 OPTIMIZED - CRAWL ALL PAGES + EARLY SKIP + BALANCED SPEED
 # -*- coding: utf-8 -*-
+#
+# Library only - the menu / --resume / --serve entry point is gmb_cli.py.
+# Chrome, Selenium and pandas are imported on first use, so importing this module stays cheap.
 import sys
-sys.stdout.reconfigure(encoding='utf-8')
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import time
 import random
-import pandas as pd
 from datetime import datetime
 import json
 import os
-from fake_useragent import UserAgent
-import warnings
+from gmb_parser import (
+    BUSINESS_SELECTORS, NAME_SELECTORS, NEXT_PAGE_SELECTORS,
+    clean_business_name, extract_business_name, find_business_cards,
+    has_next_page, parse_document
+)
+from gmb_matcher import get_matcher
+from gmb_cache import SerpCache
+from gmb_config import CUSTOM_CHOICE, load_config
+from gmb_engines import HttpEngine, SeleniumEngine, get_fetch_engine, page_url, random_user_agent
+from gmb_events import (
+    BUSINESS_SEEN, JOB_DONE, JOB_DONE_MARKER, KEYWORD_DONE, KEYWORD_STARTED, MATCH_FOUND,
+    PAGE_SCANNED, RUN_DONE, RUN_STARTED, get_emitter
+)
+from gmb_competitors import CompetitorStore
+from gmb_history import RankingHistory
+from gmb_metrics import StageTimer
+from gmb_orchestrator import SweepOrchestrator
+from gmb_results import ResultsWriter, export_report, progress_path
+from gmb_runs import DONE, RunManifest
+from gmb_replay import SnapshotStore
 import logging
 import atexit
 import gc
+import queue
+import threading
+import uuid
+import asyncio
 
-warnings.filterwarnings("ignore")
 logging.getLogger("undetected_chromedriver").setLevel(logging.CRITICAL)
 
 def cleanup_on_exit():
@@ -30,148 +46,38 @@ def cleanup_on_exit():
 
 atexit.register(cleanup_on_exit)
 
-# ============================================================================
-# 🎯 INTERACTIVE MENU SYSTEM
-# ============================================================================
+# Selenium's CSS_SELECTOR, without importing selenium just for the constant
+CSS_SELECTOR = 'css selector'
 
-def display_menu():
-    """Display interactive selection menu"""
-    if os.environ.get('CUSTOM_BUSINESS') or os.environ.get('CUSTOM_KEYWORDS'):
-        return
-    
-    print(f"\n\n{'='*80}")
-    print("🎯 ULTIMATE GMB RANKING TRACKER - BUSINESS SELECTOR")
-    print(f"{'='*80}\n")
-    
-    print("📍 SELECT YOUR OPTION:\n")
-    
-    print("1️⃣  Dr. Prashansa - MALAD, MUMBAI")
-    print("    Business: Dr. Prashansa Raut Dalvi")
-    print("    Location: Malad, Mumbai")
-    print("    Keywords: 18 Gynecology Keywords")
-    print()
-    
-    print("2️⃣  Dr. Prashansa - ANDHERI, MUMBAI")
-    print("    Business: Dr. Prashansa Raut-Dalvi")
-    print("    Location: Andheri, Mumbai")
-    print("    Keywords: 18 Gynecology Keywords")
-    print()
-    
-    print("3️⃣  Dr. Prashansa - PALGHAR")
-    print("    Business: Dr Prashansa Raut-Dalvi")
-    print("    Location: Palghar")
-    print("    Keywords: 18 Gynecology Keywords")
-    print()
-    
-    print("4️⃣  ALL 3 LOCATIONS (54 Keywords Total)")
-    print("    Tracks: Malad + Andheri + Palghar")
-    print("    Keywords: 18 × 3 = 54 Total")
-    print()
-    
-    print("5️⃣  CUSTOM TRACKING")
-    print("    Enter your own business name, location, and keywords")
-    print()
-    
-    print(f"{'='*80}\n")
+# Page readiness is polled this often; the old fixed sleeps are now only upper bounds
+WAIT_POLL_SECONDS = 0.1
 
-def get_user_selection():
-    """Get user input and validate"""
-    while True:
-        try:
-            choice = input("📌 Enter your choice (1-5): ").strip()
-            if choice in ['1', '2', '3', '4', '5']:
-                return choice
-            else:
-                print("❌ Invalid choice! Please enter 1, 2, 3, 4, or 5")
-        except KeyboardInterrupt:
-            print("\n\n⚠️ Tracking cancelled by user")
-            exit()
-        except Exception as e:
-            print(f"❌ Error: {e}")
+# Lean fetch: we only read a few text nodes, so the browser skips everything heavy
+LEAN_BLOCKED_URLS = [
+    # images + media (content setting below covers <img>, these catch CSS / XHR loads)
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.mp4', '*.webm',
+    '*encrypted-tbn*.gstatic.com/*', '*googleusercontent.com/*', '*streetviewpixels-pa.googleapis.com/*',
+    # fonts
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*fonts.gstatic.com/*', '*fonts.googleapis.com/*',
+    # map tiles + static maps
+    '*/maps/vt*', '*/maps/api/staticmap*', '*maps.gstatic.com/*', '*khms*.google.com/*',
+    # ads + analytics
+    '*googletagmanager.com/*', '*google-analytics.com/*', '*doubleclick.net/*',
+    '*googleadservices.com/*', '*googlesyndication.com/*',
+]
+
+def get_lean_fetch():
+    """Block images, fonts, map tiles and trackers in the browser (GMB_LEAN_FETCH, default on, 0 = full pages)"""
+    return os.environ.get('GMB_LEAN_FETCH', '1').strip().lower() not in ('0', 'false', 'no', 'off')
+
+# ============================================================================
+# 🎯 CONFIGURATION
+# ============================================================================
 
 def get_configuration(choice):
-    """Get configuration based on user selection"""
-    
-    if choice == '1':
-        return {
-            'mode': 'single',
-            'location_name': 'Malad',
-            'business_name': 'Dr. Prashansa Raut Dalvi',
-            'location': 'Malad, Mumbai',
-            'business_names': [
-                'Dr. Prashansa Raut Dalvi',
-                'Dr Prashansa Raut',
-                'Prashansa Raut Dalvi'
-            ]
-        }
-    
-    elif choice == '2':
-        return {
-            'mode': 'single',
-            'location_name': 'Andheri',
-            'business_name': 'Dr. Prashansa Raut-Dalvi',
-            'location': 'Andheri, Mumbai',
-            'business_names': [
-                'Dr. Prashansa Raut-Dalvi',
-                'Dr Prashansa Raut Andheri',
-                'Prashansa Raut-Dalvi'
-            ]
-        }
+    """Get configuration based on user selection (presets come from gmb_config.json)"""
     
-    elif choice == '3':
-        return {
-            'mode': 'single',
-            'location_name': 'Palghar',
-            'business_name': 'Dr Prashansa Raut-Dalvi',
-            'location': 'Palghar',
-            'business_names': [
-                'Dr Prashansa Raut-Dalvi',
-                'Dr Prashansa Raut',
-                'Dr. Prashansa Raut',
-                'Prashansa Raut',
-                'Dr. Prashansa Raut Palghar',
-                'Prashansa Raut Gynaecologist'
-            ]
-        }
-    
-    elif choice == '4':
-        return {
-            'mode': 'multi',
-            'locations': [
-                {
-                    'location_name': 'Malad',
-                    'business_name': 'Dr. Prashansa Raut Dalvi',
-                    'location': 'Malad, Mumbai',
-                    'business_names': [
-                        'Dr. Prashansa Raut Dalvi',
-                        'Dr Prashansa Raut',
-                        'Prashansa Raut Dalvi'
-                    ]
-                },
-                {
-                    'location_name': 'Andheri',
-                    'business_name': 'Dr. Prashansa Raut-Dalvi',
-                    'location': 'Andheri, Mumbai',
-                    'business_names': [
-                        'Dr. Prashansa Raut-Dalvi',
-                        'Dr Prashansa Raut Andheri',
-                        'Prashansa Raut-Dalvi'
-                    ]
-                },
-                {
-                    'location_name': 'Palghar',
-                    'business_name': 'Dr Prashansa Raut-Dalvi',
-                    'location': 'Palghar',
-                    'business_names': [
-                        'Dr Prashansa Raut-Dalvi',
-                        'Dr. Prashansa Raut Palghar',
-                        'Prashansa Raut Gynaecologist'
-                    ]
-                }
-            ]
-        }
-    
-    elif choice == '5':
+    if choice == CUSTOM_CHOICE:
         business_name = os.environ.get('CUSTOM_BUSINESS')
         location = os.environ.get('CUSTOM_LOCATION')
         keywords_str = os.environ.get('CUSTOM_KEYWORDS')
@@ -193,16 +99,32 @@ def get_configuration(choice):
                         continue
                 keywords.append(kw)
         else:
-            keywords = [kw.strip() for kw in keywords_str.split('\n') if kw.strip()]
+            keywords = keywords_str
         
-        return {
-            'mode': 'custom',
-            'location_name': 'Custom',
-            'business_name': business_name,
-            'location': location,
-            'business_names': [business_name],
-            'keywords': keywords
-        }
+        return build_custom_configuration(business_name, location, keywords)
+    
+    return load_config().configuration(choice)
+
+def build_custom_configuration(business_name, location, keywords):
+    """Custom configuration from a business, location and keywords (list or newline string)"""
+    if isinstance(keywords, str):
+        keywords = keywords.split('\n')
+    keywords = [kw.strip() for kw in keywords if kw.strip()]
+    
+    # "Clinic A; Clinic B" ranks several businesses from the same crawl
+    businesses = [name.strip() for name in business_name.split(';') if name.strip()]
+    
+    config = {
+        'mode': 'custom',
+        'location_name': 'Custom',
+        'business_name': businesses[0],
+        'location': location,
+        'business_names': [businesses[0]],
+        'keywords': keywords
+    }
+    if len(businesses) > 1:
+        config['targets'] = [{'business_name': name, 'business_names': [name]} for name in businesses]
+    return config
 
 # ============================================================================
 # 🔥 MAIN TRACKER CLASS
@@ -211,18 +133,58 @@ def get_configuration(choice):
 class AdvancedGMBRankingTracker:
     """🔥 ULTIMATE GMB Ranking Tracker - OPTIMIZED FOR CRAWLING ALL PAGES"""
     
-    def __init__(self, headless=False, use_google_search=True):
+    # undetected_chromedriver patches one shared chromedriver binary on startup,
+    # so concurrent pool workers must not launch Chrome at the same moment
+    _driver_setup_lock = threading.Lock()
+    
+    def __init__(self, headless=False, use_google_search=True, driver=None, record_dir=None, delay_scale=None, cache=True, events=None, lean=None, engine=None):
         self.headless = headless
         self.use_google_search = use_google_search
-        self.ua = UserAgent()
-        self.driver = None
+        self.driver = driver
         self.all_businesses = []
+        self._page_has_next = True
+        self._current_query = None
+        self.timer = StageTimer()
+        
+        if delay_scale is None:
+            delay_scale = float(os.environ.get('GMB_DELAY_SCALE', 1))
+        self.delay_scale = delay_scale
+        
+        # Record every results page for offline replay (see gmb_replay.py)
+        record_dir = record_dir or os.environ.get('GMB_RECORD_DIR')
+        self.recorder = SnapshotStore(record_dir) if record_dir else None
+        
+        # Parsed pages reused across runs within GMB_CACHE_TTL (cache=False disables)
+        self.cache = SerpCache.from_env() if cache is True else (cache or None)
+        self._search_url = None
+        self._browser_page = 0
+        self._page_from_cache = False
+        self._page_load_seconds = 0.0
+        self._settled_page = 0
+        
+        # Typed progress events for the server (no-op unless GMB_EVENT_FD is set)
+        self.events = events or get_emitter()
+        
+        # Lean fetch blocks heavy resources; measure_network logs bytes per page (benchmark --live)
+        self.lean = get_lean_fetch() if lean is None else lean
+        self.measure_network = False
+        self.network_stats = []
+        
+        # Fetch engines tried in order per query; the browser always answers, so it comes last
+        self.engine = engine or get_fetch_engine()
+        self.engines = [SeleniumEngine(self)]
+        if self.engine == 'http':
+            self.engines.insert(0, HttpEngine(user_agent=self.get_random_user_agent(), timer=self.timer))
+        self._engine_index = 0
+        self._page_engine = None
     
     def get_random_user_agent(self):
-        return self.ua.random
+        return random_user_agent()
     
     def setup_driver(self):
         """Advanced Driver Configuration with Anti-Detection"""
+        import undetected_chromedriver as uc
+        
         options = uc.ChromeOptions()
         
         if self.headless:
@@ -254,14 +216,20 @@ class AdvancedGMBRankingTracker:
             "profile.password_manager_enabled": False,
             "webrtc.ip_handling_policy": "disable_non_proxied_udp"
         }
+        if self.lean:
+            prefs["profile.managed_default_content_settings.images"] = 2
         options.add_experimental_option("prefs", prefs)
         
-        try:
-            self.driver = uc.Chrome(options=options, version_main=None)
-        except Exception as e:
-            print(f"⚠️ Driver setup retry: {e}")
-            time.sleep(2)
-            self.driver = uc.Chrome(options=options, version_main=None)
+        if self.measure_network:
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        
+        with self._driver_setup_lock:
+            try:
+                self.driver = uc.Chrome(options=options, version_main=None)
+            except Exception as e:
+                print(f"⚠️ Driver setup retry: {e}")
+                time.sleep(2)
+                self.driver = uc.Chrome(options=options, version_main=None)
         
         try:
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
@@ -269,22 +237,88 @@ class AdvancedGMBRankingTracker:
         except:
             pass
         
+        if self.lean:
+            try:
+                self.driver.execute_cdp_cmd('Network.enable', {})
+                self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
+            except Exception as e:
+                print(f"⚠️ Lean fetch URL blocking unavailable: {e}")
+        
         return self.driver
     
+    def _drain_network_log(self, page_number):
+        """Bytes / requests / blocked requests since the last drain, from Chrome's performance log"""
+        stats = {'page': page_number, 'bytes': 0, 'requests': 0, 'blocked': 0}
+        try:
+            entries = self.driver.get_log('performance')
+        except Exception:
+            return None
+        
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+            params = message.get('params', {})
+            if message.get('method') == 'Network.loadingFinished':
+                stats['bytes'] += int(params.get('encodedDataLength', 0))
+                stats['requests'] += 1
+            elif message.get('method') == 'Network.loadingFailed' and params.get('blockedReason'):
+                stats['blocked'] += 1
+        
+        self.network_stats.append(stats)
+        return stats
+    
+    def sleep(self, seconds):
+        """time.sleep scaled by delay_scale (0 in replay mode)"""
+        if self.delay_scale > 0:
+            time.sleep(seconds * self.delay_scale)
+    
     def human_like_delay(self, min_delay=1.5, max_delay=3):
         """OPTIMIZED: Balanced delays - not too fast, not too slow"""
         delay = random.uniform(min_delay, max_delay)
-        time.sleep(delay)
+        self.sleep(delay)
+    
+    def wait_until(self, condition, max_seconds, stage):
+        """Poll condition(driver) - returns as soon as it holds; max_seconds (scaled) is only the upper bound
+        
+        The time actually waited is recorded under `stage` in self.timer.
+        """
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+        
+        start = time.perf_counter()
+        try:
+            WebDriverWait(
+                self.driver, max_seconds * self.delay_scale, poll_frequency=WAIT_POLL_SECONDS
+            ).until(condition)
+            ready = True
+        except TimeoutException:
+            ready = False
+        self.timer.add(stage, time.perf_counter() - start)
+        return ready
+    
+    @staticmethod
+    def _results_ready(driver):
+        """Result cards or the next-page link are in the DOM"""
+        for selector in BUSINESS_SELECTORS + NEXT_PAGE_SELECTORS:
+            try:
+                if driver.find_elements(CSS_SELECTOR, selector):
+                    return True
+            except Exception:
+                continue
+        return False
     
     def move_mouse_randomly(self):
         """Random mouse movements - OPTIMIZED"""
         try:
+            from selenium.webdriver.common.action_chains import ActionChains
             actions = ActionChains(self.driver)
             for _ in range(random.randint(1, 3)):
                 x_offset = random.randint(-50, 50)
                 y_offset = random.randint(-50, 50)
                 actions.move_by_offset(x_offset, y_offset).perform()
-                time.sleep(random.uniform(0.05, 0.1))
+                self.sleep(random.uniform(0.05, 0.1))
         except:
             pass
     
@@ -296,79 +330,78 @@ class AdvancedGMBRankingTracker:
                 self.driver.execute_script(f'window.scrollBy(0, {scroll_amount})')
             except:
                 pass
-            time.sleep(random.uniform(0.2, 0.4))
+            self.sleep(random.uniform(0.2, 0.4))
     
     def check_gmb_ranking(self, keyword, location, business_name, business_names, max_results=100):
         """Main ranking check function"""
+        target = {'business_name': business_name, 'business_names': business_names}
+        return self.check_gmb_rankings(keyword, location, [target], max_results)[0]
+    
+    def check_gmb_rankings(self, keyword, location, targets, max_results=100):
+        """Rank several businesses from ONE crawl - one result per target, in target order
+        
+        targets: [{'business_name': ..., 'business_names': [aliases]}, ...]
+        """
         self.all_businesses = []
         
         print(f"\n{'='*80}")
         print(f"🎯 TRACKING: {keyword}")
         print(f"   📍 Location: {location}")
-        print(f"   🏢 Business: {business_name}")
+        for target in targets:
+            print(f"   🏢 Business: {target['business_name']}")
         print(f"{'='*80}")
         
         try:
-            if not self.driver:
-                self.setup_driver()
-            
             search_query = f"{keyword} in {location}"
+            self._current_query = search_query
             url = f"https://www.google.com/search?q={search_query.replace(' ', '+')}&tbm=lcl"
             
-            print(f"🌐 URL: {url}")
+            # The browser only opens the URL once a page is missing from the cache
+            self._search_url = url
+            self._browser_page = 0
+            self._engine_index = 0
             
-            self.driver.get(url)
-            self.human_like_delay(3, 5)
-            self.move_mouse_randomly()
+            print(f"🌐 URL: {url}")
             
-            return self._track_multi_page_google_search(keyword, location, business_name, business_names, max_results)
+            with self.timer.stage('keyword_total'):
+                return self._track_multi_page_google_search(keyword, location, targets, max_results)
         
         except Exception as e:
             print(f"\n❌ ERROR: {str(e)}")
-            return self._create_error_result(keyword, location, business_name, str(e))
+            return [
+                self._create_error_result(keyword, location, target['business_name'], str(e))
+                for target in targets
+            ]
     
-    def _track_multi_page_google_search(self, keyword, location, business_name, business_names, max_results):
-        """🔥 CRAWL ALL PAGES - SKIP ON FOUND"""
+    def _track_multi_page_google_search(self, keyword, location, targets, max_results):
+        """🔥 CRAWL ALL PAGES - STOP ONCE EVERY TARGET IS FOUND"""
         position = 0
         checked_names = set()
         page_number = 1
         max_pages = 999  # CRAWL ALL PAGES
         all_businesses_found = []
-        found_flag = False
+        
+        # Targets still being looked for -> their matcher
+        remaining = {i: get_matcher(target['business_names']) for i, target in enumerate(targets)}
+        found = {}
         
         while page_number <= max_pages and position < max_results:
             print(f"\n📄 === PAGE {page_number} ===")
             
-            time.sleep(1.5)  # OPTIMIZED: Faster page load
-            self.scroll_smoothly(2)
-            time.sleep(1)
-            
-            business_selectors = [
-                'div.VkpGBb',
-                'div[jscontroller][data-hveid]',
-                'div.rllt__details',
-                'div[data-cid]',
-            ]
-            
-            businesses = []
-            for selector in business_selectors:
-                try:
-                    businesses = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if businesses:
-                        print(f"   ✅ Found {len(businesses)} results on page {page_number}")
-                        break
-                except:
-                    continue
+            names = self._load_page(page_number)
+            self.events.emit(
+                PAGE_SCANNED, keyword=keyword, location=location, page=page_number,
+                businesses=len(names), cached=self._page_from_cache, has_next=self._page_has_next,
+                load_seconds=round(self._page_load_seconds, 3), engine=self._page_engine
+            )
             
-            if not businesses:
+            if not names:
                 print(f"   ⚠️ No businesses found on page {page_number}")
                 break
             
             new_results_found = False
-            for business in businesses:
+            for name in names:
                 try:
-                    name = self._extract_business_name_search(business)
-                    
                     if not name or name in checked_names:
                         continue
                     
@@ -387,6 +420,10 @@ class AdvancedGMBRankingTracker:
                         'name': name,
                         'page': page_number
                     })
+                    self.events.emit(
+                        BUSINESS_SEEN, keyword=keyword, location=location,
+                        position=position, page=page_number, name=name
+                    )
                     
                     # Display business
                     print(f"\n  {'─'*76}")
@@ -395,22 +432,46 @@ class AdvancedGMBRankingTracker:
                     print(f"  📍 {name}")
                     print(f"  {'─'*76}")
                     
-                    # Check for match
-                    for business_name_check in business_names:
-                        if self._is_business_match(business_name_check, name):
-                            print(f"\n{'🎉'*38}")
-                            print(f"✅ ✅ ✅ FOUND YOUR BUSINESS! ✅ ✅ ✅")
-                            print(f"{'🎉'*38}\n")
-                            print(f"📍 Position: #{position}")
-                            print(f"📄 Page: {page_number}")
-                            print(f"🎯 Matched: {name}")
-                            print(f"🏢 Your Business: {business_name}")
-                            print(f"\n{'🎉'*38}\n")
-                            
-                            found_flag = True
-                            break
+                    # Check for match against every target not found yet
+                    with self.timer.stage('match'):
+                        matches = [(i, matcher.match(name)) for i, matcher in remaining.items()]
                     
-                    if found_flag:
+                    for i, match in matches:
+                        if not match:
+                            continue
+                        
+                        business_name = targets[i]['business_name']
+                        print(f"\n{'🎉'*38}")
+                        print(f"✅ ✅ ✅ FOUND YOUR BUSINESS! ✅ ✅ ✅")
+                        print(f"{'🎉'*38}\n")
+                        print(f"📍 Position: #{position}")
+                        print(f"📄 Page: {page_number}")
+                        print(f"🎯 Matched: {name}")
+                        print(f"🏢 Your Business: {business_name}")
+                        print(f"🔗 Alias: {match.alias} (score {match.score:.2f})")
+                        print(f"\n{'🎉'*38}\n")
+                        
+                        del remaining[i]
+                        self.events.emit(
+                            MATCH_FOUND, keyword=keyword, location=location, business=business_name,
+                            position=position, page=page_number, name=name,
+                            alias=match.alias, score=match.score
+                        )
+                        found[i] = {
+                            'keyword': keyword,
+                            'location': location,
+                            'searched_business': business_name,
+                            'found_business_name': name,
+                            'position': position,
+                            'page': page_number,
+                            'found': True,
+                            'total_checked': position,
+                            'matched_alias': match.alias,
+                            'match_score': match.score,
+                            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                        }
+                    
+                    if not remaining:
                         break
                     
                     if position >= max_results:
@@ -419,8 +480,8 @@ class AdvancedGMBRankingTracker:
                 except:
                     continue
             
-            if found_flag:
-                # OPTIMIZED: Skip remaining pages on found
+            if not remaining:
+                # OPTIMIZED: Skip remaining pages once every target is found
                 print(f"\n✅ Business found! Skipping remaining pages...")
                 break
             
@@ -431,61 +492,166 @@ class AdvancedGMBRankingTracker:
             if position >= max_results:
                 break
             
-            # Try to click next page
-            next_button_found = self._click_next_page()
-            
-            if not next_button_found:
+            # Next page is opened lazily by _load_page (no round trips if there is no next link)
+            if not self._page_has_next:
                 print(f"\n   ⚠️ No 'Next' button found. Reached last page.")
                 break
             
             page_number += 1
-            self.human_like_delay(1, 2)  # OPTIMIZED: Faster page transition
-        
-        if found_flag:
-            return {
-                'keyword': keyword,
-                'location': location,
-                'searched_business': business_name,
-                'found_business_name': name,
-                'position': position,
-                'page': page_number,
-                'found': True,
-                'total_checked': position,
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
-        
-        # ENHANCED: Show summary
-        print(f"\n\n{'='*80}")
-        print(f"📊 ALL {position} BUSINESSES CHECKED")
-        print(f"{'='*80}\n")
-        
-        for biz in all_businesses_found:
-            print(f"  #{biz['position']:2d} (Page {biz['page']}): {biz['name']}")
-        
-        print(f"\n{'='*80}\n")
-        print(f"❌ NOT FOUND in {position} results across {page_number} pages")
-        print(f"   🔍 Searched for: {business_name}")
-        print(f"\n{'='*80}\n")
-        
-        return self._create_not_found_result(keyword, location, business_name, position)
+        
+        if remaining:
+            # ENHANCED: Show summary
+            print(f"\n\n{'='*80}")
+            print(f"📊 ALL {position} BUSINESSES CHECKED")
+            print(f"{'='*80}\n")
+            
+            for biz in all_businesses_found:
+                print(f"  #{biz['position']:2d} (Page {biz['page']}): {biz['name']}")
+            
+            print(f"\n{'='*80}\n")
+            for i in remaining:
+                print(f"❌ NOT FOUND in {position} results across {page_number} pages")
+                print(f"   🔍 Searched for: {targets[i]['business_name']}")
+            print(f"\n{'='*80}\n")
+        
+        return [
+            found[i] if i in found else
+            self._create_not_found_result(keyword, location, target['business_name'], position)
+            for i, target in enumerate(targets)
+        ]
+    
+    def _load_page(self, page_number):
+        """Card names for a results page - from the cache, else from the fetch engines"""
+        query = self._current_query
+        self._page_from_cache = False
+        self._page_load_seconds = 0.0
+        self._page_engine = None
+        
+        if self.cache:
+            cached = self.cache.get(query, page_number)
+            if cached:
+                age = int(time.time() - cached.fetched_at)
+                print(f"   ⚡ Page {page_number} from cache ({len(cached.names)} results, {age}s old)")
+                self._page_has_next = cached.has_next
+                self._page_from_cache = True
+                return cached.names
+        
+        # An engine that came back empty is skipped for the rest of this query
+        page = None
+        while page is None:
+            engine = self.engines[self._engine_index]
+            page = engine.fetch(self._search_url, page_number)
+            if page is None:
+                self._engine_index += 1
+                print(f"   ↩️ No parseable results via {engine.name}, falling back to {self.engines[self._engine_index].name}")
+        
+        names = page.names
+        self._page_has_next = page.has_next
+        self._page_load_seconds = page.load_seconds
+        self._page_engine = engine.name
+        if page.html is not None and self.recorder:
+            self.recorder.save(query, page_number, page.html)
+        
+        if self.cache and names:
+            self.cache.put(query, page_number, names, self._page_has_next)
+        
+        return names
+    
+    def _open_page(self, page_number):
+        """Drive the browser to a results page (search URL, then 'Next' clicks)"""
+        if not self.driver:
+            self.setup_driver()
+        
+        start = time.perf_counter()
+        with self.timer.stage('page_load_wait'):
+            if self._browser_page == 0:
+                # Fallback mid-query (HTTP engine gave up) jumps straight to the page by offset
+                self.driver.get(page_url(self._search_url, page_number))
+                self.wait_until(self._results_ready, 5, 'wait_results')
+                self.move_mouse_randomly()
+                self._browser_page = page_number
+                self._settled_page = 0
+            
+            while self._browser_page < page_number:
+                if self._settled_page != self._browser_page:
+                    self._settle_page()
+                previous_url = self.driver.current_url
+                if not self._click_next_page():
+                    return False
+                self._browser_page += 1
+                # Next is a real navigation (start=20, 40, ...) - wait for the new URL and its cards
+                self.wait_until(
+                    lambda driver: driver.current_url != previous_url and self._results_ready(driver),
+                    4.5, 'wait_next_page'
+                )
+            
+            if self._settled_page != self._browser_page:
+                self._settle_page()
+        
+        self._page_load_seconds = time.perf_counter() - start
+        if self.measure_network:
+            self._drain_network_log(page_number)
+        return True
+    
+    def _settle_page(self):
+        """Let the current page finish loading before reading or clicking"""
+        self.wait_until(self._results_ready, 2.5, 'wait_settle')
+        self.scroll_smoothly(2)
+        self._settled_page = self._browser_page
+    
+    def _read_business_names(self, page_number):
+        """Card names for the current page from ONE page_source grab"""
+        self._page_has_next = True
+        try:
+            with self.timer.stage('card_discovery'):
+                html = self.driver.page_source
+                if self.recorder:
+                    self.recorder.save(self._current_query, page_number, html)
+                document = parse_document(html)
+                selector, cards = find_business_cards(document)
+            
+            if cards:
+                print(f"   ✅ Found {len(cards)} results on page {page_number}")
+                self._page_has_next = has_next_page(document)
+                with self.timer.stage('name_extraction'):
+                    return [extract_business_name(card) for card in cards]
+        except Exception as e:
+            print(f"   ⚠️ HTML parse failed ({e}), falling back to WebDriver lookups")
+        
+        with self.timer.stage('card_discovery_webdriver'):
+            return self._read_business_names_webdriver(page_number)
+    
+    def _read_business_names_webdriver(self, page_number):
+        """Slow path: per-element WebDriver lookups"""
+        businesses = []
+        for selector in BUSINESS_SELECTORS:
+            try:
+                businesses = self.driver.find_elements(CSS_SELECTOR, selector)
+                if businesses:
+                    print(f"   ✅ Found {len(businesses)} results on page {page_number}")
+                    break
+            except:
+                continue
+        
+        names = []
+        for business in businesses:
+            try:
+                names.append(self._extract_business_name_search(business))
+            except:
+                names.append(None)
+        return names
     
     def _click_next_page(self):
         """Click the 'Next' button to navigate to next page"""
-        next_button_selectors = [
-            'a#pnnext',
-            'a[aria-label="Next page"]',
-            'a[aria-label="Next"]',
-        ]
-        
-        for selector in next_button_selectors:
+        for selector in NEXT_PAGE_SELECTORS:
             try:
-                next_button = self.driver.find_element(By.CSS_SELECTOR, selector)
+                next_button = self.driver.find_element(CSS_SELECTOR, selector)
                 
                 if next_button and next_button.is_displayed():
                     print(f"   🔄 Clicking 'Next' button...")
                     
                     self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_button)
-                    time.sleep(0.5)
+                    self.sleep(0.5)
                     
                     try:
                         next_button.click()
@@ -500,20 +666,12 @@ class AdvancedGMBRankingTracker:
     
     def _extract_business_name_search(self, business_element):
         """Extract business name from Google Search"""
-        name_selectors = [
-            'div[role="heading"]',
-            'span.OSrXXb',
-            'div.dbg0pd',
-            'a span',
-        ]
-        
-        for selector in name_selectors:
+        for selector in NAME_SELECTORS:
             try:
-                element = business_element.find_element(By.CSS_SELECTOR, selector)
+                element = business_element.find_element(CSS_SELECTOR, selector)
                 name = element.text.strip() or element.get_attribute('aria-label')
                 if name and len(name) > 3:
-                    name = name.split(' -')[0].split('(')[0].strip()
-                    name = ' '.join(name.split())
+                    name = clean_business_name(name)
                     if len(name) > 3:
                         return name
             except:
@@ -524,8 +682,7 @@ class AdvancedGMBRankingTracker:
             if text:
                 lines = text.split('\n')
                 for line in lines[:3]:
-                    line = line.split(' -')[0].split('(')[0].strip()
-                    line = ' '.join(line.split())
+                    line = clean_business_name(line)
                     if len(line) > 3 and len(line) < 100:
                         return line
         except:
@@ -534,37 +691,8 @@ class AdvancedGMBRankingTracker:
         return None
     
     def _is_business_match(self, target_name, found_name):
-        """Fuzzy matching - ULTRA AGGRESSIVE"""
-        target = ' '.join(target_name.lower().split())
-        found = ' '.join(found_name.lower().split())
-        
-        # Remove common words
-        for word in ['dr', 'doctor', 'clinic', 'hospital', 'center', 'the', 'in', 'at', 'and', 'or', 'gynaecologist', 'gynecologist', '-', '.']:
-            target = target.replace(word, ' ').replace('  ', ' ')
-            found = found.replace(word, ' ').replace('  ', ' ')
-        
-        target = target.strip()
-        found = found.strip()
-        
-        # Exact match
-        if target == found:
-            return True
-        
-        if target in found or found in target:
-            return True
-        
-        # Word overlap
-        target_words = set(target.split())
-        found_words = set(found.split())
-        
-        if target_words and (target_words == found_words or target_words.issubset(found_words)):
-            return True
-        
-        common = target_words & found_words
-        if len(target_words) > 0 and len(common) / len(target_words) >= 0.3:
-            return True
-        
-        return False
+        """Fuzzy matching - see gmb_matcher.BusinessMatcher"""
+        return get_matcher([target_name]).match(found_name) is not None
     
     def _clean_business_name(self, name):
         """Clean business name for matching"""
@@ -601,8 +729,21 @@ class AdvancedGMBRankingTracker:
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
     
+    def is_alive(self):
+        """True if the browser session still responds"""
+        if not self.driver:
+            return False
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+    
     def close(self):
         """✅ Complete resource cleanup"""
+        for engine in self.engines:
+            engine.close()
+        
         if self.driver:
             try:
                 self.driver.quit()
@@ -622,158 +763,316 @@ class AdvancedGMBRankingTracker:
                 gc.collect()
 
 # ============================================================================
-# 🚀 MAIN EXECUTION
+# 🧵 BROWSER POOL
 # ============================================================================
 
-if __name__ == "__main__":
-    
-    display_menu()
-    choice = get_user_selection()
-    config = get_configuration(choice)
-    
-    DEFAULT_KEYWORDS = [
-        "PCOD Treatment",
-        "Female Gynaecologist",
-        "IVF Treatment",
-        "Best Gynaecologist",
-        "Infertility Treatment",
-        "High-Risk Pregnancy",
-        "Endometriosis specialist",
-        "Hormone Replacement Therapy",
-        "Endometriosis Treatment",
-        "Obstetrician-gynecologist",
-        "Ovarian Cyst Treatment",
-        "PCOS Treatment",
-        "Menopause Treatment",
-        "Menstrual Disorders Treatment",
-        "Gynecological Infection Treatment",
-        "Menorrhagia Treatment",
-        "Women's Health Clinic",
-        "Uterine Prolapse Treatment"
+def get_pool_size():
+    """Pool size from GMB_POOL_SIZE (default: 1 browser)"""
+    try:
+        return max(1, int(os.environ.get('GMB_POOL_SIZE', 1)))
+    except ValueError:
+        return 1
+
+def location_targets(location_config):
+    """Businesses ranked for one location entry - 'targets' list or the single business"""
+    targets = location_config.get('targets') or [{
+        'business_name': location_config['business_name'],
+        'business_names': location_config['business_names'],
+    }]
+    return [
+        {
+            'business_name': target['business_name'],
+            'business_names': target.get('business_names') or [target['business_name']],
+            'location_name': target.get('location_name', location_config['location_name']),
+        }
+        for target in targets
     ]
+
+def build_tasks(config, default_keywords=None):
+    """Flatten a menu configuration into one task per (location, keyword)
     
-    tracker = AdvancedGMBRankingTracker(headless=False, use_google_search=True)
-    all_results = []
+    Every business tracked for the same search shares one task, so the SERP is crawled once.
+    """
+    locations = config['locations'] if config['mode'] == 'multi' else [config]
+    keywords = config.get('keywords') or default_keywords or load_config().default_keywords
     
-    try:
-        if config['mode'] == 'single':
-            keywords = DEFAULT_KEYWORDS
-            location_name = config['location_name']
-            business_name = config['business_name']
-            location = config['location']
-            business_names = config['business_names']
+    grouped = {}
+    for location_config in locations:
+        for idx, keyword in enumerate(keywords, 1):
+            key = (' '.join(location_config['location'].lower().split()), keyword.lower().strip())
+            task = grouped.get(key)
+            if task is None:
+                task = grouped[key] = {
+                    'keyword': keyword,
+                    'location': location_config['location'],
+                    'location_name': location_config['location_name'],
+                    'keyword_index': idx,
+                    'targets': [],
+                }
             
-            print(f"\n\n{'#'*80}")
-            print(f"📍 TRACKING: {location_name.upper()}")
-            print(f"{'#'*80}\n")
+            names = {t['business_name'] for t in task['targets']}
+            task['targets'].extend(t for t in location_targets(location_config) if t['business_name'] not in names)
+    
+    total = len(grouped)
+    tasks = []
+    
+    for current, task in enumerate(grouped.values(), 1):
+        idx = task.pop('keyword_index')
+        if config['mode'] == 'multi':
+            label = f"📌 [{current}/{total}] {task['location_name']} - {idx}/{len(keywords)}"
+        else:
+            label = f"📌 KEYWORD {idx}/{len(keywords)}"
+        
+        task.update({
+            'index': current,
+            'total': total,
+            'business_name': task['targets'][0]['business_name'],
+            'business_names': task['targets'][0]['business_names'],
+            'label': label,
+        })
+        tasks.append(task)
+    
+    return tasks
+
+def spread_tasks(tasks, window_seconds, jitter_seconds=0, start=None):
+    """Give each task a start time so the keywords are spread evenly over the window (±jitter)"""
+    start = time.time() if start is None else start
+    step = window_seconds / max(len(tasks), 1)
+    for i, task in enumerate(tasks):
+        offset = i * step + random.uniform(-jitter_seconds, jitter_seconds)
+        task['not_before'] = start + min(max(0, offset), window_seconds)
+    return tasks
+
+def print_spread_schedule(tasks):
+    """One line for the whole paced sweep instead of a 'next keyword' line per task"""
+    times = sorted(task['not_before'] for task in tasks)
+    first, last = (datetime.fromtimestamp(t).strftime('%H:%M:%S') for t in (times[0], times[-1]))
+    step = (times[-1] - times[0]) / (len(times) - 1) if len(times) > 1 else 0
+    print(f"🕒 Spread sweep: {len(times)} keywords from {first} to {last} (about one every {step:.0f}s)")
+
+class BrowserPool:
+    """🧵 Bounded pool of trackers - each worker owns its own Chrome session"""
+    
+    def __init__(self, size=None, headless=False, use_google_search=True):
+        self.size = size or get_pool_size()
+        self.trackers = [
+            AdvancedGMBRankingTracker(headless=headless, use_google_search=use_google_search)
+            for _ in range(self.size)
+        ]
+        self._idle = queue.Queue()
+        for tracker in self.trackers:
+            self._idle.put(tracker)
+    
+    def run_task(self, task, max_results=100, on_serp=None):
+        """Check one keyword on the next idle browser - one result per target business
+        
+        on_serp(task, entries) receives the full crawled ordering ([{'position', 'name', 'page'}, ...]).
+        Pacing between searches is the orchestrator's job (gmb_orchestrator.py).
+        """
+        tracker = self._idle.get()
+        try:
+            # A Chrome that crashed on the previous keyword is relaunched here, not only between jobs
+            if self._close_if_dead(tracker):
+                print("♻️ Browser session crashed - relaunching for this keyword")
             
-            for idx, keyword in enumerate(keywords, 1):
-                print(f"\n\n{'#'*60}")
-                print(f"📌 KEYWORD {idx}/{len(keywords)}")
-                print(f"{'#'*60}")
-                
-                result = tracker.check_gmb_ranking(keyword, location, business_name, business_names, max_results=100)
-                all_results.append(result)
-                
-                pd.DataFrame(all_results).to_csv('gmb_ranking_progress.csv', index=False)
-                
-                if idx < len(keywords):
-                    wait_time = random.randint(6, 10)  # OPTIMIZED: Faster wait
-                    print(f"\n⏳ Waiting {wait_time}s before next keyword...")
-                    time.sleep(wait_time)
-        
-        elif config['mode'] == 'multi':
-            total_keywords = len(DEFAULT_KEYWORDS) * len(config['locations'])
-            current = 0
+            print(f"\n{'#'*60}")
+            print(task['label'])
+            print(f"{'#'*60}")
             
-            for location_config in config['locations']:
-                print(f"\n\n{'#'*80}")
-                print(f"📍 TRACKING LOCATION: {location_config['location_name'].upper()}")
-                print(f"{'#'*80}\n")
-                
-                for idx, keyword in enumerate(DEFAULT_KEYWORDS, 1):
-                    current += 1
-                    print(f"\n{'#'*60}")
-                    print(f"📌 [{current}/{total_keywords}] {location_config['location_name']} - {idx}/{len(DEFAULT_KEYWORDS)}")
-                    print(f"{'#'*60}")
-                    
-                    result = tracker.check_gmb_ranking(
-                        keyword,
-                        location_config['location'],
-                        location_config['business_name'],
-                        location_config['business_names'],
-                        max_results=100
-                    )
-                    
-                    result['location_name'] = location_config['location_name']
-                    all_results.append(result)
-                    
-                    pd.DataFrame(all_results).to_csv('gmb_ranking_progress.csv', index=False)
-                    
-                    if current < total_keywords:
-                        wait_time = random.randint(4, 8)  # OPTIMIZED: Faster wait
-                        print(f"\n⏳ Waiting {wait_time}s...")
-                        time.sleep(wait_time)
-        
-        elif config['mode'] == 'custom':
-            keywords = config.get('keywords', DEFAULT_KEYWORDS)
-            location_name = 'Custom'
-            business_name = config['business_name']
-            location = config['location']
-            business_names = config['business_names']
+            events = get_emitter()
+            events.emit(
+                KEYWORD_STARTED, keyword=task['keyword'], location=task['location'],
+                location_name=task['location_name'], index=task.get('index'), total=task.get('total')
+            )
             
-            print(f"\n\n{'#'*80}")
-            print(f"📍 CUSTOM TRACKING")
-            print(f"{'#'*80}\n")
+            targets = task.get('targets') or location_targets(task)
+            results = tracker.check_gmb_rankings(
+                task['keyword'],
+                task['location'],
+                targets,
+                max_results=max_results
+            )
+            for target, result in zip(targets, results):
+                result['location_name'] = target['location_name']
             
-            for idx, keyword in enumerate(keywords, 1):
-                print(f"\n{'#'*60}")
-                print(f"📌 KEYWORD {idx}/{len(keywords)}")
-                print(f"{'#'*60}")
-                
-                result = tracker.check_gmb_ranking(keyword, location, business_name, business_names, max_results=100)
+            if on_serp and tracker.all_businesses:
+                try:
+                    on_serp(task, list(tracker.all_businesses))
+                except Exception as e:
+                    print(f"⚠️ Could not store competitor list: {e}")
+            
+            events.emit(
+                KEYWORD_DONE, keyword=task['keyword'], location=task['location'],
+                location_name=task['location_name'], index=task.get('index'), total=task.get('total'),
+                results=[
+                    {key: result.get(key) for key in ('searched_business', 'found', 'position', 'page', 'error')}
+                    for result in results
+                ]
+            )
+            
+            return results
+        finally:
+            self._idle.put(tracker)
+    
+    def warm(self):
+        """Start every browser up front so the first keyword pays no startup cost"""
+        for tracker in self.trackers:
+            if not tracker.driver and tracker.engine == 'browser':
+                try:
+                    tracker.setup_driver()
+                except Exception as e:
+                    print(f"⚠️ Browser warm-up failed: {e}")
+    
+    @staticmethod
+    def _close_if_dead(tracker):
+        """Close a crashed session so the tracker relaunches Chrome on its next page load"""
+        if tracker.driver and not tracker.is_alive():
+            tracker.close()
+            return True
+        return False
+    
+    def close_dead(self):
+        """Close crashed sessions so they are relaunched on their next keyword"""
+        return sum(self._close_if_dead(tracker) for tracker in self.trackers)
+    
+    def close(self):
+        """Close every browser in the pool"""
+        for tracker in self.trackers:
+            tracker.close()
+
+# ============================================================================
+# 📊 TRACKING SESSION + REPORT
+# ============================================================================
+
+def new_run_id():
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+def run_tracking_session(config, pool, keywords=None, run_id=None, manifest=None, cancel=None, spread=None):
+    """Run every keyword of a configuration through the pool (only pending ones when resuming)
+    
+    spread=(window_seconds, jitter_seconds) paces the keywords evenly across the window.
+    """
+    if manifest is None:
+        run_id = run_id or new_run_id()
+        manifest = RunManifest.create(run_id, config, build_tasks(config, keywords))
+    else:
+        config = manifest.config
+    
+    run_id = manifest.run_id
+    all_results = manifest.completed_results()
+    tasks = manifest.pending_tasks()
+    if spread and spread[0] > 0:
+        spread_tasks(tasks, *spread)
+    
+    if config['mode'] == 'multi':
+        print(f"\n\n{'#'*80}")
+        print(f"📍 TRACKING LOCATIONS: {', '.join(loc['location_name'].upper() for loc in config['locations'])}")
+        print(f"{'#'*80}\n")
+    elif config['mode'] == 'custom':
+        print(f"\n\n{'#'*80}")
+        print(f"📍 CUSTOM TRACKING")
+        print(f"{'#'*80}\n")
+    else:
+        print(f"\n\n{'#'*80}")
+        print(f"📍 TRACKING: {config['location_name'].upper()}")
+        print(f"{'#'*80}\n")
+    
+    if pool.size > 1:
+        print(f"🧵 Browser pool: {pool.size} parallel Chrome sessions\n")
+    
+    print(f"🆔 Run: {run_id}  (resume with: --resume {run_id})")
+    if all_results:
+        print(f"🔁 Resuming: {manifest.counts()[DONE]} keywords already done, {len(tasks)} pending")
+    if spread and spread[0] > 0 and tasks:
+        print_spread_schedule(tasks)
+    print()
+    
+    events = get_emitter()
+    events.emit(
+        RUN_STARTED, run_id=run_id, mode=config['mode'],
+        total=len(manifest.tasks), pending=len(tasks), done=manifest.counts()[DONE]
+    )
+    
+    history = RankingHistory()
+    competitors = CompetitorStore()
+    
+    def store_serp(task, entries):
+        competitors.record(task['location'], task['keyword'], entries, run_id=run_id)
+    
+    orchestrator = SweepOrchestrator(pool, max_results=100, on_serp=store_serp)
+    
+    async def collect(writer):
+        async for results in orchestrator.run(tasks, cancel=cancel):
+            manifest.checkpoint(results)
+            for result in results:
                 all_results.append(result)
-                
-                pd.DataFrame(all_results).to_csv('gmb_ranking_progress.csv', index=False)
-                
-                if idx < len(keywords):
-                    wait_time = random.randint(4, 8)  # OPTIMIZED: Faster wait
-                    print(f"\n⏳ Waiting {wait_time}s before next keyword...")
-                    time.sleep(wait_time)
+                writer.write(result)
+                history.record(result, run_id)
     
+    try:
+        with ResultsWriter(progress_path(run_id)) as writer:
+            for result in all_results:
+                writer.write(result)
+            asyncio.run(collect(writer))
     finally:
-        tracker.close()
+        history.close()
+        competitors.close()
+    
+    if cancel is not None and cancel.is_set():
+        print(f"\n🛑 Run cancelled - resume with: --resume {run_id}")
+    
+    events.emit(
+        RUN_DONE, run_id=run_id, results=len(all_results), cancelled=bool(cancel and cancel.is_set()),
+        found=sum(1 for result in all_results if result.get('found'))
+    )
+    return all_results
+
+def print_final_report(all_results, run_id=None):
+    """Save the report of a run (gmb_ranking_<run_id>.csv) and print the summary"""
+    if not all_results:
+        print("\n⚠️ No results to report")
+        return None
+    
+    from gmb_reporting import keyword_ranks, not_found_rows, results_frame, summarize
     
-    df = pd.DataFrame(all_results)
-    filename = f'gmb_ranking_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-    df.to_csv(filename, index=False)
+    filename = export_report(progress_path(run_id), f'gmb_ranking_{run_id}.csv' if run_id else None)
+    df = results_frame(all_results)
+    summary = summarize(df)
     
     print(f"\n\n{'='*80}")
     print("📊 FINAL RANKING REPORT")
     print(f"{'='*80}\n")
     
-    found_df = df[df['found'] == True]
-    if len(found_df) > 0:
+    found_rows = keyword_ranks(df)
+    if found_rows:
         print("✅✅✅ FOUND RANKINGS ✅✅✅\n")
-        for _, row in found_df.iterrows():
+        for row in found_rows:
             print(f"  🎯 KEYWORD: {row['keyword']}")
-            print(f"     Position: #{int(row['position'])}")
-            print(f"     Page: {int(row['page'])}")
+            print(f"     Position: #{row['position']}")
+            print(f"     Page: {row['page']}")
             print(f"     Business: {row['found_business_name']}")
             print()
     
-    not_found = df[df['found'] == False]
-    if len(not_found) > 0:
+    not_found = not_found_rows(df)
+    if not_found:
         print(f"\n❌ NOT FOUND ({len(not_found)} keywords)\n")
-        for _, row in not_found.iterrows():
-            checked = row.get('total_checked', 0)
+        for row in not_found:
             print(f"  ❌ {row['keyword']}")
-            print(f"     Checked: {checked} businesses")
+            print(f"     Checked: {row['total_checked'] or 0} businesses")
             print()
     
-    total_keywords = len(df)
-    total_found = len(found_df)
-    success_rate = (total_found / total_keywords * 100) if total_keywords > 0 else 0
+    if len(summary['by_location']) > 1:
+        print(f"\n📍 BY LOCATION\n")
+        for row in summary['by_location']:
+            average = f"avg #{row['avg_position']}" if row['avg_position'] is not None else 'no rankings'
+            print(f"  {row['location_name']}: {row['found']}/{row['keywords']} found ({row['success_rate']}%), {average}")
+    
+    if summary['page_distribution']:
+        print(f"\n📄 Found on page: " + ', '.join(f"{page}: {count}" for page, count in summary['page_distribution'].items()))
+    
+    total_keywords = summary['total']
+    total_found = summary['found']
+    success_rate = summary['success_rate']
     
     print(f"\n{'='*80}")
     print("📈 STATISTICS")
@@ -784,3 +1083,127 @@ if __name__ == "__main__":
     print(f"📊 Success Rate: {success_rate:.1f}%")
     print(f"\n💾 Full Report saved: {filename}")
     print(f"{'='*80}\n")
+    
+    return filename
+
+# ============================================================================
+# 🔥 WARM WORKER MODE
+# ============================================================================
+
+def get_recycle_after():
+    """Jobs served before the browsers are recycled (GMB_RECYCLE_AFTER, default 10)"""
+    try:
+        return max(1, int(os.environ.get('GMB_RECYCLE_AFTER', 10)))
+    except ValueError:
+        return 10
+
+def job_configuration(job):
+    """Menu configuration for a job sent by the server"""
+    choice = str(job.get('choice', '1'))
+    if choice == CUSTOM_CHOICE:
+        return build_custom_configuration(job.get('business', ''), job.get('location', ''), job.get('keywords', ''))
+    return get_configuration(choice)
+
+def read_job_messages(jobs, cancels):
+    """stdin reader: jobs are queued, {"cancel": job_id | "*"} messages are collected right away"""
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            message = json.loads(line)
+        except ValueError as e:
+            print(f"⚠️ Ignoring malformed job line: {e}", flush=True)
+            continue
+        
+        if 'cancel' in message:
+            cancels.put(message['cancel'])
+        else:
+            jobs.put(message)
+    jobs.put(None)
+
+def serve_jobs(headless=False):
+    """Long-lived worker: read JSON jobs from stdin, keep browsers warm between them"""
+    recycle_after = get_recycle_after()
+    pool = BrowserPool(size=get_pool_size(), headless=headless, use_google_search=True)
+    pool.warm()
+    jobs_served = 0
+    
+    jobs = queue.Queue()
+    cancels = queue.Queue()
+    current = {'job_id': None, 'cancel': threading.Event()}
+    cancelled_ids = set()  # cancels that may arrive before their job is picked up
+    
+    def watch_cancels():
+        while True:
+            job_id = cancels.get()
+            cancelled_ids.add(job_id)
+            if job_id in ('*', current['job_id']):
+                print("🛑 Cancel requested - stopping after the current keyword", flush=True)
+                current['cancel'].set()
+    
+    threading.Thread(target=read_job_messages, args=(jobs, cancels), daemon=True).start()
+    threading.Thread(target=watch_cancels, daemon=True).start()
+    
+    print(f"🔥 Tracker worker ready ({pool.size} browser(s), recycle after {recycle_after} jobs)", flush=True)
+    
+    try:
+        while True:
+            job = jobs.get()
+            if job is None:
+                break
+            
+            summary = {'status': 'done', 'results': 0}
+            cancel = threading.Event()
+            current['job_id'] = job.get('job_id')
+            current['cancel'] = cancel
+            if current['job_id'] in cancelled_ids:
+                cancel.set()
+            try:
+                summary['job_id'] = job.get('job_id')
+                
+                if pool.close_dead():
+                    print("♻️ Relaunching crashed browser session(s)")
+                
+                spread = (float(job.get('spread_seconds') or 0), float(job.get('jitter_seconds') or 0))
+                run_id = job.get('resume') or job.get('run_id') or new_run_id()
+                if job.get('resume'):
+                    all_results = run_tracking_session(
+                        None, pool, manifest=RunManifest.load(run_id), cancel=cancel, spread=spread
+                    )
+                else:
+                    all_results = run_tracking_session(
+                        job_configuration(job), pool, run_id=run_id, cancel=cancel, spread=spread
+                    )
+                summary['results'] = len(all_results)
+                summary['report'] = print_final_report(all_results, run_id)
+                if cancel.is_set():
+                    summary['status'] = 'cancelled'
+                jobs_served += 1
+            except Exception as e:
+                print(f"\n❌ Job failed: {e}")
+                summary['status'] = 'failed'
+                summary['error'] = str(e)
+                jobs_served = recycle_after
+            finally:
+                current['job_id'] = None
+            
+            if jobs_served >= recycle_after:
+                print("♻️ Recycling browser session(s)")
+                pool.close()
+                pool = BrowserPool(size=get_pool_size(), headless=headless, use_google_search=True)
+                pool.warm()
+                jobs_served = 0
+            
+            get_emitter().emit(JOB_DONE, **summary)
+            print(f"{JOB_DONE_MARKER} {json.dumps(summary)}", flush=True)
+    finally:
+        pool.close()
+
+# ============================================================================
+# 🚀 MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    from gmb_cli import main
+    sys.exit(main())
@@ -0,0 +1,205 @@
+# ✅ WARM TRACKER WORKER
+# 🔥 One long-lived backend process per server worker - Chrome stays open between jobs
+# -*- coding: utf-8 -*-
+import sys
+import os
+import json
+import time
+import signal
+import subprocess
+import threading
+import logging
+
+from gmb_events import EVENT_FD_ENV, EVENT_PREFIX, JOB_DONE, JOB_DONE_MARKER, parse_event
+
+logger = logging.getLogger(__name__)
+
+BACKEND_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gmb_cli.py')
+
+# SIGTERM -> SIGKILL grace when a backend has to be stopped mid-job
+STOP_GRACE_SECONDS = 10
+
+def is_backend_process(pid):
+    """pid is alive and is a `gmb_cli.py --serve` worker - not a recycled pid or a zombie"""
+    if os.path.isdir('/proc'):
+        try:
+            with open(f"/proc/{pid}/cmdline", 'rb') as f:
+                args = f.read().split(b'\0')
+        except OSError:
+            return False
+        script = os.path.basename(BACKEND_SCRIPT).encode()
+        return b'--serve' in args and any(arg.endswith(script) for arg in args)
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+def stop_backend(pid, grace=STOP_GRACE_SECONDS):
+    """Stop a backend worker and its browsers; True once it is gone
+
+    Backends lead their own session, so the whole process group (Chrome
+    included) is signalled. Only possible on POSIX - False elsewhere.
+    """
+    if os.name != 'posix':
+        return False
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        if not is_backend_process(pid):
+            return True
+        try:
+            os.killpg(pid, sig)
+        except OSError:
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                return True
+        deadline = time.monotonic() + (grace if sig == signal.SIGTERM else 2)
+        while time.monotonic() < deadline and is_backend_process(pid):
+            time.sleep(0.2)
+    return not is_backend_process(pid)
+
+
+class TrackerWorker:
+    """Client side of `gmb_cli.py --serve`
+
+    The backend process (and its browsers) is started once and reused for
+    every job. If it dies it is relaunched on the next job.
+
+    Typed events arrive on a dedicated pipe (GMB_EVENT_FD); where fds cannot
+    be inherited (Windows) they come as prefixed lines on stdout instead.
+    """
+
+    def __init__(self, script=BACKEND_SCRIPT):
+        self.script = script
+        self.process = None
+        self._lock = threading.Lock()
+        self._stdin_lock = threading.Lock()
+        self._on_event = None
+        self._job_done = threading.Event()
+        self._event_reader = None
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self, env=None):
+        """Launch the backend worker if it is not already running"""
+        if self.is_running():
+            return self.process
+
+        if self.process is not None:
+            logger.warning(f"Tracker worker exited with code {self.process.returncode}, relaunching")
+
+        worker_env = (env or os.environ).copy()
+        worker_env['PYTHONIOENCODING'] = 'utf-8'
+
+        read_fd = write_fd = None
+        if os.name == 'posix':
+            read_fd, write_fd = os.pipe()
+            worker_env[EVENT_FD_ENV] = str(write_fd)
+        else:
+            worker_env[EVENT_FD_ENV] = 'stdout'
+
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, '-u', self.script, '--serve'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.PIPE,
+                text=True,
+                encoding='utf-8',
+                errors='replace',
+                bufsize=1,
+                env=worker_env,
+                cwd=os.path.dirname(self.script),
+                pass_fds=(write_fd,) if write_fd is not None else (),
+                # Own process group: a lost job's backend can be stopped with its browsers
+                start_new_session=os.name == 'posix'
+            )
+        finally:
+            if write_fd is not None:
+                os.close(write_fd)  # the child holds the only write end now
+
+        if read_fd is not None:
+            self._event_reader = threading.Thread(target=self._read_events, args=(read_fd,), daemon=True)
+            self._event_reader.start()
+
+        logger.info(f"Tracker worker started (pid {self.process.pid})")
+        return self.process
+
+    def _read_events(self, read_fd):
+        """Event pipe reader - hands each event to the running job's callback"""
+        with open(read_fd, encoding='utf-8', errors='replace') as channel:
+            for line in channel:
+                self._dispatch(parse_event(line))
+
+    def _dispatch(self, event):
+        if event is None:
+            return
+        if event['type'] == JOB_DONE:
+            self._job_done.set()
+            return
+        if self._on_event:
+            try:
+                self._on_event(event)
+            except Exception as e:
+                logger.error(f"Error handling event {event['type']}: {e}")
+
+    def run_job(self, job, on_output=None, on_event=None):
+        """Send one job, stream its log lines and typed events; returns the job summary"""
+        with self._lock:
+            process = self.start()
+            self._on_event = on_event
+            self._job_done.clear()
+
+            try:
+                self._send(process, job)
+
+                for line in process.stdout:
+                    if line.startswith(EVENT_PREFIX):
+                        self._dispatch(parse_event(line))
+                    elif line.startswith(JOB_DONE_MARKER):
+                        # Let the event pipe drain up to this job's job_done
+                        if self._event_reader is not None:
+                            self._job_done.wait(timeout=5)
+                        return json.loads(line[len(JOB_DONE_MARKER):])
+                    elif on_output:
+                        on_output(line)
+
+                process.wait()
+                raise RuntimeError(f"Tracker worker exited with code {process.returncode}")
+            finally:
+                self._on_event = None
+
+    def _send(self, process, message):
+        with self._stdin_lock:
+            process.stdin.write(json.dumps(message) + '\n')
+            process.stdin.flush()
+
+    def cancel(self, job_id=None):
+        """Ask the backend to stop the running job after its current keyword"""
+        process = self.process
+        if process is None or process.poll() is not None:
+            return False
+        try:
+            self._send(process, {'cancel': job_id or '*'})
+            return True
+        except OSError:
+            return False
+
+    def kill(self):
+        """Stop the backend mid-job, browsers included"""
+        process = self.process
+        if process is not None and process.poll() is None:
+            stop_backend(process.pid)
+
+    def stop(self):
+        """Shut the backend worker down"""
+        if not self.is_running():
+            return
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=10)
+        except Exception:
+            self.process.kill()
+        finally:
+            self.process = None
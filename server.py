@@ -9,17 +9,26 @@ if sys.platform.startswith('win'):
     os.environ['PYTHONIOENCODING'] = 'utf-8'
     sys.stdout.reconfigure(encoding='utf-8')
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file
 from flask_cors import CORS
-import subprocess
+import atexit
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 import threading
 import time
 import logging
+import json
 import io
 
+from gmb_config import CUSTOM_CHOICE, load_config
+from gmb_competitors import CompetitorStore
+from gmb_history import RankingHistory
+from gmb_jobs import CANCELLED, QUEUED, RUNNING, JobScheduler, JobStore, events_text, get_max_jobs
+from gmb_reporting import filter_results, results_frame, summarize, to_records
+from gmb_results import RESULT_FIELDS, RUN_ID_RE, ResultsTail, latest_progress_path, progress_path
+from gmb_sweeps import SWEEP_MAX_JOBS, SweepScheduler, sweeps_configured
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -30,14 +39,156 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
-# Store tracking status
-tracking_status = {
-    'active': False,
-    'output': '',
-    'progress': 0,
-    'current_keyword': '',
-    'total_keywords': 0
-}
+# Tracker config (presets, locations, aliases, keyword groups) - validated at startup, cached by mtime
+tracker_config = load_config()
+logger.info(f"Loaded {len(tracker_config.presets)} preset(s) from {tracker_config.path}")
+
+# Incremental readers for the append-only progress CSVs, one per run file (most recently used kept)
+RESULTS_TAILS_KEPT = 8
+results_tails = {}
+results_tails_lock = threading.Lock()
+
+def results_tail_for(path):
+    with results_tails_lock:
+        tail = results_tails.pop(path, None) or ResultsTail(path)
+        results_tails[path] = tail
+        while len(results_tails) > RESULTS_TAILS_KEPT:
+            results_tails.pop(next(iter(results_tails)))
+        return tail
+
+def invalidate_results():
+    """A result was just written - every tail re-checks its file on the next request"""
+    with results_tails_lock:
+        tails = list(results_tails.values())
+    for tail in tails:
+        tail.invalidate()
+
+# Indexed ranking history written by the backend
+ranking_history = RankingHistory()
+
+# Full SERP orderings captured on every crawl (same database)
+competitor_store = CompetitorStore()
+
+# Job queue shared by every gunicorn worker; each worker's scheduler runs what it claims.
+# Paced sweeps hold a slot for their whole window, so a second one is kept free for manual runs
+job_store = JobStore()
+max_jobs = get_max_jobs(default=SWEEP_MAX_JOBS if sweeps_configured() else 1)
+job_scheduler = JobScheduler(job_store, max_jobs=max_jobs, on_result=invalidate_results)
+logger.info(f"Running up to {max_jobs} job(s) at once")
+atexit.register(job_scheduler.stop)
+
+if os.environ.get('GMB_WARM_WORKER') == '1':
+    job_scheduler.warm()
+
+job_scheduler.start()
+
+# Recurring sweeps from gmb_sweeps.json, fired into the same job queue
+sweep_scheduler = SweepScheduler(job_store, ranking_history, on_submit=job_scheduler.wake)
+atexit.register(sweep_scheduler.stop)
+sweep_scheduler.start()
+
+# SSE connections end after this long and the browser reconnects with Last-Event-ID,
+# so a stream never pins a gunicorn thread for a whole run (and stays under the 30 s sync-worker timeout)
+SSE_MAX_SECONDS = int(os.environ.get('GMB_SSE_MAX_SECONDS', 25))
+SSE_HEARTBEAT_SECONDS = 15
+SSE_POLL_SECONDS = 0.5
+
+# ============================================================================
+# 🗂️ JOBS
+# ============================================================================
+
+JOB_FIELDS = [
+    'id', 'status', 'active', 'label', 'run_id', 'progress', 'total_keywords', 'current_keyword',
+    'cancel_requested', 'attempts', 'error', 'summary', 'created_at', 'started_at', 'finished_at',
+]
+
+def job_view(job):
+    """Public fields of a job row"""
+    view = {field: job[field] for field in JOB_FIELDS}
+    view['queue_position'] = job_store.queue_position(job['id']) if job['status'] == QUEUED else None
+    return view
+
+def build_job(data):
+    """(job payload, label) from a start request - raises ValueError with a user-facing message"""
+    if data.get('resume'):
+        # Finish the pending keywords of an interrupted run
+        run_id = str(data['resume']).strip()
+        if not RUN_ID_RE.match(run_id):
+            raise ValueError(f"❌ ERROR: Invalid run id '{run_id}'")
+        return {'resume': run_id}, f"Resume {run_id}"
+    
+    choice = str(data.get('choice', '1'))
+    if choice != CUSTOM_CHOICE:
+        presets = load_config().presets
+        if choice not in presets:
+            raise ValueError(f"❌ ERROR: Unknown preset '{choice}'")
+        return {'choice': choice}, presets[choice]['title']
+    
+    # Get custom data from request
+    business = data.get('business', '').strip()
+    location = data.get('location', '').strip()
+    keywords = data.get('keywords', '').strip()
+    
+    # Validate - check for placeholder text
+    if not business or business == 'Custom Business':
+        raise ValueError("❌ ERROR: Please enter a valid business name")
+    
+    if not location or location == 'Custom Location':
+        raise ValueError("❌ ERROR: Please enter a valid location (e.g., Mumbai, Delhi, Bangalore)")
+    
+    if not keywords or keywords.count('\n') == 0:
+        raise ValueError("❌ ERROR: Please enter at least one keyword")
+    
+    return {'choice': choice, 'business': business, 'location': location, 'keywords': keywords}, f"{business} - {location}"
+
+def submit_job(data):
+    job, label = build_job(data)
+    job_id = job_store.submit(job, label=label)
+    
+    if job.get('business'):
+        keyword_count = len([k for k in job['keywords'].split('\n') if k.strip()])
+        job_store.set_progress(job_id, total_keywords=keyword_count)
+        job_store.append_event(
+            job_id, 'line',
+            text=(
+                f"📝 Custom Setup:\n"
+                f"  • Business: {job['business']}\n"
+                f"  • Location: {job['location']}\n"
+                f"  • Keywords: {keyword_count} keywords\n"
+                f"\n{'='*80}\n\n"
+            )
+        )
+    
+    job_scheduler.wake()
+    logger.info(f"Job {job_id} queued: {label}")
+    return job_store.get(job_id)
+
+def requested_job():
+    """Job named by ?job= (default: the most recent one)"""
+    job_id = request.args.get('job')
+    return job_store.get(job_id) if job_id else job_store.latest()
+
+def event_stream(job_id, cursor):
+    """SSE body for one job's events, polled from the shared store"""
+    deadline = time.monotonic() + SSE_MAX_SECONDS
+    last_sent = time.monotonic()
+    yield "retry: 1000\n\n"
+    
+    while time.monotonic() < deadline:
+        events, cursor, truncated = job_store.events_since(job_id, cursor)
+        if truncated:
+            yield "event: truncated\ndata: {}\n\n"
+        
+        for event in events:
+            yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+        
+        if events:
+            last_sent = time.monotonic()
+        elif time.monotonic() - last_sent > SSE_HEARTBEAT_SECONDS:
+            yield ": keepalive\n\n"
+            last_sent = time.monotonic()
+        
+        time.sleep(SSE_POLL_SECONDS)
 
 # ============================================================================
 # 🎯 ROUTES
@@ -47,216 +198,344 @@ tracking_status = {
 def index():
     """Main page"""
     try:
-        return render_template('index.html')
+        return render_template('index.html', presets=load_config().summary(), custom_choice=CUSTOM_CHOICE)
     except Exception as e:
         logger.error(f"Error rendering index: {e}")
         return jsonify({'error': 'Could not load template'}), 500
 
 @app.route('/api/start-tracking', methods=['POST'])
 def start_tracking():
-    """Start tracking in background"""
+    """Queue a tracking job (kept for the web page - same as POST /api/jobs)"""
     try:
-        data = request.json
-        choice = data.get('choice', '1')
-        
-        if tracking_status['active']:
-            return jsonify({'error': 'Tracking already in progress'}), 400
+        job = submit_job(request.json or {})
+        return jsonify({
+            'status': 'started' if job['status'] == RUNNING else 'queued',
+            'message': 'Tracking job queued',
+            'job_id': job['id'],
+            'queue_position': job_store.queue_position(job['id']),
+            'cursor': 0
+        })
+    
+    except ValueError as e:
+        logger.warning(f"Invalid tracking request: {e}")
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in start_tracking: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/tracking-status')
+def tracking_status_api():
+    """Status of ?job= (default: latest) plus only the output produced after ?since=<cursor>"""
+    try:
+        job = requested_job()
+        if job is None:
+            return jsonify({'active': False, 'progress': 0, 'current_keyword': '', 'total_keywords': 0,
+                            'output': '', 'events': [], 'cursor': 0, 'truncated': False})
         
-        # Reset status
-        tracking_status['active'] = True
-        tracking_status['output'] = ''
-        tracking_status['progress'] = 0
-        tracking_status['current_keyword'] = ''
-        tracking_status['total_keywords'] = 0
+        events, cursor, truncated = job_store.events_since(job['id'], request.args.get('since', default=0, type=int))
         
-        # Run in background thread
-        def run_tracking():
-            try:
-                # Set environment variables for custom tracking
-                env = os.environ.copy()
-                
-                if choice == '5':
-                    # Get custom data from request
-                    business = data.get('business', '').strip()
-                    location = data.get('location', '').strip()
-                    keywords = data.get('keywords', '').strip()
-                    
-                    # Validate - check for placeholder text
-                    if not business or business == 'Custom Business':
-                        tracking_status['output'] = "❌ ERROR: Please enter a valid business name"
-                        tracking_status['active'] = False
-                        logger.warning("Invalid business name provided")
-                        return
-                    
-                    if not location or location == 'Custom Location':
-                        tracking_status['output'] = "❌ ERROR: Please enter a valid location (e.g., Mumbai, Delhi, Bangalore)"
-                        tracking_status['active'] = False
-                        logger.warning("Invalid location provided")
-                        return
-                    
-                    if not keywords or keywords.count('\n') == 0:
-                        tracking_status['output'] = "❌ ERROR: Please enter at least one keyword"
-                        tracking_status['active'] = False
-                        logger.warning("No keywords provided")
-                        return
-                    
-                    # Set environment variables with validated data
-                    env['CUSTOM_BUSINESS'] = business
-                    env['CUSTOM_LOCATION'] = location
-                    env['CUSTOM_KEYWORDS'] = keywords
-                    
-                    keyword_count = len([k for k in keywords.split('\n') if k.strip()])
-                    tracking_status['total_keywords'] = keyword_count
-                    
-                    tracking_status['output'] += f"📝 Custom Setup:\n"
-                    tracking_status['output'] += f"  • Business: {business}\n"
-                    tracking_status['output'] += f"  • Location: {location}\n"
-                    tracking_status['output'] += f"  • Keywords: {keyword_count} keywords\n"
-                    tracking_status['output'] += f"\n{'='*80}\n\n"
-                    
-                    logger.info(f"Starting tracking for {business} in {location} with {keyword_count} keywords")
-                else:
-                    logger.info(f"Starting tracking with preset choice: {choice}")
-                
-                # Run the scraper backend
-                cmd = [sys.executable, 'gmb_tracker_backend.py']
-                
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    encoding='utf-8',
-                    errors='replace',
-                    bufsize=1,
-                    universal_newlines=True,
-                    env=env,
-                    stdin=subprocess.PIPE
-                )
-                
-                # Send choice to stdin
-                if choice != '5':
-                    try:
-                        process.stdin.write(f"{choice}\n")
-                        process.stdin.flush()
-                    except:
-                        pass
-                
-                # Read output line by line
-                line_count = 0
-                for line in process.stdout:
-                    try:
-                        if line:
-                            tracking_status['output'] += line
-                            line_count += 1
-                            
-                            # Update progress markers
-                            if 'KEYWORD' in line and '/' in line:
-                                try:
-                                    parts = line.split('/')
-                                    if len(parts) >= 2:
-                                        current = parts[0].strip().split()[-1]
-                                        total = parts[1].strip().split()[0]
-                                        tracking_status['progress'] = int(current)
-                                        tracking_status['current_keyword'] = line.strip()
-                                except:
-                                    pass
-                            
-                            if 'TRACKING:' in line:
-                                tracking_status['current_keyword'] = line.strip()
-                    
-                    except Exception as e:
-                        logger.error(f"Error processing output line: {e}")
-                        continue
-                    
-                    time.sleep(0.01)
-                
-                process.wait()
-                
-                if process.returncode != 0:
-                    tracking_status['output'] += f"\n⚠️ Process exited with code: {process.returncode}\n"
-                    logger.warning(f"Backend process exited with code: {process.returncode}")
-                else:
-                    logger.info("Backend process completed successfully")
-                
-                tracking_status['active'] = False
+        return jsonify({
+            **job_view(job),
+            'job_id': job['id'],
+            'output': events_text(events),
+            'events': [event for event in events if event['type'] != 'line'],
+            'cursor': cursor,
+            'truncated': truncated
+        })
+    except Exception as e:
+        logger.error(f"Error in tracking_status_api: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/tracking-stream')
+def tracking_stream():
+    """Server-Sent Events for ?job= (default: latest), resuming from Last-Event-ID / ?since="""
+    try:
+        job = requested_job()
+        if job is None:
+            return jsonify({'error': 'No tracking job yet'}), 404
         
-        except Exception as e:
-            tracking_status['output'] += f"\n❌ Tracking Error: {str(e)}\n"
-            tracking_status['active'] = False
-            logger.error(f"Error in run_tracking: {e}")
+        try:
+            cursor = int(request.headers.get('Last-Event-ID') or request.args.get('since') or 0)
+        except ValueError:
+            cursor = 0
         
-        # Start tracking in background thread
-        thread = threading.Thread(target=run_tracking, daemon=True)
-        thread.start()
+        return Response(
+            event_stream(job['id'], cursor),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+    except Exception as e:
+        logger.error(f"Error in tracking_stream: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs', methods=['GET', 'POST'])
+def jobs_api():
+    """POST: queue a job (same body as /api/start-tracking) / GET: recent jobs (?status=&limit=)"""
+    try:
+        if request.method == 'POST':
+            job = submit_job(request.json or {})
+            return jsonify(job_view(job)), 202
         
-        return jsonify({'status': 'started', 'message': 'Tracking started in background'})
+        jobs = job_store.list(status=request.args.get('status'), limit=request.args.get('limit', default=50, type=int))
+        return jsonify({'count': len(jobs), 'data': [job_view(job) for job in jobs]})
     
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
-        logger.error(f"Error in start_tracking: {e}")
+        logger.error(f"Error in jobs_api: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/tracking-status')
-def tracking_status_api():
-    """Get tracking status and output"""
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    """One job's status and progress"""
     try:
-        return jsonify(tracking_status)
+        job = job_store.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        return jsonify(job_view(job))
     except Exception as e:
-        logger.error(f"Error in tracking_status_api: {e}")
+        logger.error(f"Error in job_status: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>/events')
+def job_events(job_id):
+    """Events after ?since=<cursor> for one job"""
+    try:
+        if job_store.get(job_id) is None:
+            return jsonify({'error': 'Job not found'}), 404
+        events, cursor, truncated = job_store.events_since(job_id, request.args.get('since', default=0, type=int))
+        return jsonify({'job_id': job_id, 'events': events, 'cursor': cursor, 'truncated': truncated})
+    except Exception as e:
+        logger.error(f"Error in job_events: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>/results')
+def job_results(job_id):
+    """Results recorded for one job's run"""
+    try:
+        job = job_store.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        rows = ranking_history.run_results(job['run_id']) if job['run_id'] else []
+        found = sum(1 for row in rows if row['found'])
+        return jsonify({
+            'job_id': job_id,
+            'status': job['status'],
+            'found': found,
+            'total': len(rows),
+            'success_rate': float(found / len(rows) * 100) if rows else 0,
+            'data': rows
+        })
+    except Exception as e:
+        logger.error(f"Error in job_results: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a queued job, or stop a running one after its current keyword"""
+    try:
+        outcome = job_store.request_cancel(job_id)
+        if outcome is None:
+            job = job_store.get(job_id)
+            if job is None:
+                return jsonify({'error': 'Job not found'}), 404
+            return jsonify({'error': f"Job already {job['status']}"}), 409
+        
+        if outcome == CANCELLED:
+            job_store.append_event(job_id, 'tracking_done', status=CANCELLED)
+        
+        job_scheduler.wake()
+        logger.info(f"Job {job_id} cancel requested ({outcome})")
+        return jsonify({'job_id': job_id, 'status': outcome})
+    except Exception as e:
+        logger.error(f"Error in cancel_job: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/config')
+def config_api():
+    """Presets the web form and API can start (locations, businesses, keyword counts)"""
+    try:
+        config = load_config()
+        return jsonify({
+            'presets': config.summary(),
+            'custom_choice': CUSTOM_CHOICE,
+            'keyword_groups': {name: len(keywords) for name, keywords in config.keyword_groups.items()}
+        })
+    except Exception as e:
+        logger.error(f"Error in config_api: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/sweeps')
+def sweeps_api():
+    """Configured sweeps with their next trigger and recent outcomes"""
+    try:
+        sweeps = sweep_scheduler.overview()
+        return jsonify({'count': len(sweeps), 'data': sweeps})
+    except ValueError as e:
+        return jsonify({'error': f"Invalid sweep file: {e}"}), 500
+    except Exception as e:
+        logger.error(f"Error in sweeps_api: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/sweeps/<name>/run', methods=['POST'])
+def run_sweep(name):
+    """Fire a sweep now (still skipped if its previous run is active)"""
+    try:
+        sweep = sweep_scheduler.config.get(name)
+        if sweep is None:
+            return jsonify({'error': 'Sweep not found'}), 404
+        
+        slot = f"manual {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        job_id = sweep_scheduler.trigger(sweep, slot)
+        if job_id is None:
+            return jsonify({'error': 'Previous run of this sweep is still active', 'slot': slot}), 409
+        return jsonify({'sweep': name, 'slot': slot, 'job_id': job_id}), 202
+    except Exception as e:
+        logger.error(f"Error in run_sweep: {e}")
+        return jsonify({'error': str(e)}), 500
+
+# Parsed results per progress file, rebuilt only when the file has new rows (keyed by ResultsTail.etag)
+results_cache = {}
+results_cache_lock = threading.Lock()
+
+RESULTS_MAX_LIMIT = 5000
+
+class ResultsNotFound(LookupError):
+    pass
+
+def requested_progress_path():
+    """Progress CSV of ?run= or ?job= (default: the latest job's run, else the newest progress file)
+    
+    Raises ValueError on a malformed run id, ResultsNotFound for an unknown job.
+    """
+    run_id = request.args.get('run', '').strip()
+    if run_id:
+        return progress_path(run_id)
+    
+    job_id = request.args.get('job', '').strip()
+    job = job_store.get(job_id) if job_id else job_store.latest()
+    if job_id and job is None:
+        raise ResultsNotFound('Job not found')
+    if job is not None and job['run_id']:
+        return progress_path(job['run_id'])
+    if job_id:
+        raise ResultsNotFound('Job has not started yet')
+    return latest_progress_path()
+
+def results_snapshot(tail):
+    """(etag, DataFrame) of one progress CSV - the file is only re-checked per ResultsTail.refresh()"""
+    with results_cache_lock:
+        rows = tail.refresh()
+        etag = tail.etag
+        cached = results_cache.get(tail.path)
+        if cached is None or cached[0] != etag:
+            cached = results_cache[tail.path] = (etag, results_frame(rows, columns=tail.header))
+        with results_tails_lock:
+            live = set(results_tails)
+        for path in set(results_cache) - live:
+            del results_cache[path]
+        return cached
+
+def results_query(args):
+    """Filters + paging from the query string - raises ValueError on bad values"""
+    found = args.get('found')
+    if found is not None:
+        found = found.strip().lower()
+        if found not in ('true', 'false', '1', '0'):
+            raise ValueError("found must be true or false")
+        found = found in ('true', '1')
+    
+    filters = {
+        'location': args.get('location', '').strip() or None,
+        'keyword': args.get('keyword', '').strip() or None,
+        'found': found,
+        'since': args.get('since', '').strip() or None,
+        'until': args.get('until', '').strip() or None,
+    }
+    for key in ('since', 'until'):
+        if filters[key]:
+            try:
+                datetime.fromisoformat(filters[key])
+            except ValueError:
+                raise ValueError(f"{key} must be YYYY-MM-DD or YYYY-MM-DD HH:MM:SS")
+    
+    # Parsed by hand: args.get(type=int) would turn limit=abc into "no limit"
+    try:
+        limit = int(args['limit']) if args.get('limit', '').strip() else None
+        offset = int(args['offset']) if args.get('offset', '').strip() else 0
+    except ValueError:
+        raise ValueError("limit and offset must be integers")
+    if (limit is not None and not 0 < limit <= RESULTS_MAX_LIMIT) or offset < 0:
+        raise ValueError(f"limit must be 1-{RESULTS_MAX_LIMIT} and offset >= 0")
+    return filters, limit, offset
+
+def with_cache_headers(response, etag, modified_at):
+    response.set_etag(etag)
+    if modified_at:
+        response.last_modified = datetime.fromtimestamp(int(modified_at), tz=timezone.utc)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def not_modified(etag, modified_at):
+    """True if the client's copy is current
+    
+    With an ETag only If-None-Match counts - Last-Modified has one-second resolution,
+    so If-Modified-Since would miss rows appended within the same second.
+    """
+    if etag:
+        return bool(request.if_none_match) and request.if_none_match.contains(etag)
+    since = request.if_modified_since
+    return bool(since and modified_at and int(modified_at) <= since.timestamp())
+
 @app.route('/api/results')
 def get_results():
-    """Get latest tracking results"""
+    """Results of one run - filterable, paginated, 304 while its progress file is unchanged
+    
+    ?run= | ?job= (default: latest job) &location= &keyword= &found=true|false &since= &until= &limit= &offset=
+    """
     try:
-        progress_csv = Path('gmb_ranking_progress.csv')
+        try:
+            filters, limit, offset = results_query(request.args)
+            tail = results_tail_for(requested_progress_path())
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except ResultsNotFound as e:
+            return jsonify({'error': str(e)}), 404
         
-        if progress_csv.exists():
-            try:
-                # Try UTF-8 first
-                try:
-                    df = pd.read_csv(progress_csv, encoding='utf-8')
-                except:
-                    # Fallback to latin1 if UTF-8 fails
-                    df = pd.read_csv(progress_csv, encoding='latin1')
-                
-                found = len(df[df['found'] == True])
-                total = len(df)
-                success_rate = float((found/total*100)) if total > 0 else 0
+        try:
+            etag, df = results_snapshot(tail)
+            
+            if tail.inode is not None:
+                modified_at = tail.modified_at
+                if not_modified(etag, modified_at):
+                    return with_cache_headers(Response(status=304), etag, modified_at)
                 
-                # Convert dataframe to dict safely
-                data_records = []
-                for _, row in df.iterrows():
-                    record = {}
-                    for col in df.columns:
-                        val = row[col]
-                        # Handle different data types
-                        if pd.isna(val):
-                            record[col] = None
-                        elif isinstance(val, (int, float)):
-                            record[col] = val
-                        else:
-                            record[col] = str(val)
-                    data_records.append(record)
+                matched = filter_results(df, **filters)
+                summary = summarize(matched)
+                page = matched.iloc[offset:offset + limit] if limit else matched.iloc[offset:]
+                end = offset + len(page)
                 
-                logger.info(f"Results: {found}/{total} found ({success_rate:.1f}%)")
+                logger.info(f"Results: {summary['found']}/{summary['total']} found ({summary['success_rate']:.1f}%)")
                 
-                return jsonify({
-                    'found': int(found),
-                    'total': int(total),
-                    'success_rate': success_rate,
-                    'data': data_records
-                })
+                response = jsonify(dict(
+                    summary,
+                    data=to_records(page[tail.header or RESULT_FIELDS]),
+                    offset=offset,
+                    limit=limit,
+                    next_offset=end if end < len(matched) else None,
+                ))
+                return with_cache_headers(response, etag, modified_at)
             
-            except Exception as e:
-                logger.error(f"Error reading CSV: {e}")
-                return jsonify({
-                    'error': f'Error reading CSV: {str(e)}',
-                    'found': 0,
-                    'total': 0,
-                    'success_rate': 0,
-                    'data': []
-                }), 200
+        except Exception as e:
+            logger.error(f"Error reading CSV: {e}")
+            return jsonify({
+                'error': f'Error reading CSV: {str(e)}',
+                'found': 0,
+                'total': 0,
+                'success_rate': 0,
+                'data': []
+            }), 200
         
         return jsonify({
             'error': 'No results file found',
@@ -272,9 +551,14 @@ def get_results():
 
 @app.route('/api/download-csv')
 def download_csv():
-    """Download results as CSV"""
+    """Download the results of ?run= or ?job= (default: latest job) as CSV"""
     try:
-        progress_csv = Path('gmb_ranking_progress.csv')
+        try:
+            progress_csv = Path(requested_progress_path())
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        except ResultsNotFound as e:
+            return jsonify({'success': False, 'error': str(e)}), 404
         
         if progress_csv.exists():
             try:
@@ -315,6 +599,117 @@ def download_csv():
         logger.error(f"Error in download_csv: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/history/latest')
+def history_latest():
+    """Latest rank per keyword (optionally ?business=&location=)"""
+    try:
+        rows = ranking_history.latest_ranks(
+            business=request.args.get('business'),
+            location=request.args.get('location')
+        )
+        return jsonify({'count': len(rows), 'data': rows})
+    except Exception as e:
+        logger.error(f"Error in history_latest: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/history/rank')
+def history_rank():
+    """Rank over time for one keyword (?keyword=&location=&business=&since=&until=)"""
+    try:
+        keyword = request.args.get('keyword', '').strip()
+        if not keyword:
+            return jsonify({'error': 'keyword is required'}), 400
+        
+        rows = ranking_history.rank_over_time(
+            keyword,
+            location=request.args.get('location'),
+            business=request.args.get('business'),
+            since=request.args.get('since'),
+            until=request.args.get('until')
+        )
+        return jsonify({'keyword': keyword, 'count': len(rows), 'data': rows})
+    except Exception as e:
+        logger.error(f"Error in history_rank: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/history/movement')
+def history_movement():
+    """Rank movement per keyword vs N days earlier (?days=7&keyword=&location=&business=)"""
+    try:
+        days = request.args.get('days', default=7, type=int)
+        if days < 1:
+            return jsonify({'error': 'days must be >= 1'}), 400
+        
+        rows = ranking_history.movement(
+            days=days,
+            keyword=request.args.get('keyword'),
+            location=request.args.get('location'),
+            business=request.args.get('business')
+        )
+        return jsonify({'days': days, 'count': len(rows), 'data': rows})
+    except Exception as e:
+        logger.error(f"Error in history_movement: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/history/daily')
+def history_daily():
+    """Daily best / worst / last position and found rate (?keyword=&location=&business=&since=&until=)"""
+    try:
+        rows = ranking_history.daily_ranks(
+            keyword=request.args.get('keyword'),
+            location=request.args.get('location'),
+            business=request.args.get('business'),
+            since=request.args.get('since'),
+            until=request.args.get('until')
+        )
+        for row in rows:
+            row['found_rate'] = round(row['found_count'] / row['checks'] * 100, 1) if row['checks'] else 0
+        return jsonify({'count': len(rows), 'data': rows})
+    except Exception as e:
+        logger.error(f"Error in history_daily: {e}")
+        return jsonify({'error': str(e)}), 500
+
+# ============================================================================
+# 🏁 COMPETITORS
+# ============================================================================
+
+@app.route('/api/competitors/outranking')
+def competitors_outranking():
+    """Who ranks above a business in the latest SERP (?keyword=&business=&location=)"""
+    try:
+        keyword = request.args.get('keyword', '').strip()
+        business = request.args.get('business', '').strip()
+        if not keyword or not business:
+            return jsonify({'error': 'keyword and business are required'}), 400
+        
+        data = competitor_store.outranking(keyword, business, location=request.args.get('location'))
+        if data is None:
+            return jsonify({'error': 'No SERP captured for this keyword yet'}), 404
+        return jsonify(data)
+    except Exception as e:
+        logger.error(f"Error in competitors_outranking: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/competitors/top')
+def competitors_top():
+    """Top-N competitors across a location's keywords (?location=&limit=10&days=30&exclude=name)"""
+    try:
+        location = request.args.get('location', '').strip()
+        if not location:
+            return jsonify({'error': 'location is required'}), 400
+        
+        limit = request.args.get('limit', default=10, type=int)
+        days = request.args.get('days', default=30, type=int)
+        if limit < 1 or days < 1:
+            return jsonify({'error': 'limit and days must be >= 1'}), 400
+        
+        return jsonify(competitor_store.top_competitors(
+            location, limit=limit, days=days, exclude=request.args.getlist('exclude') or None
+        ))
+    except Exception as e:
+        logger.error(f"Error in competitors_top: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/health')
 def health():
     """Health check endpoint"""
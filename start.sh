@@ -1,3 +1,3 @@
 #!/bin/bash
-gunicorn -w 2 -b 0.0.0.0:$PORT server:app
+gunicorn -w 2 -k gthread --threads 8 --timeout 120 -b 0.0.0.0:$PORT server:app
 
@@ -0,0 +1,114 @@
+# ✅ SERP CACHE TESTS
+# ⚡ TTL expiry, LRU pruning and cached pages skipping the fetch engines
+# -*- coding: utf-8 -*-
+import os
+import json
+
+import pytest
+
+import gmb_cache
+from gmb_cache import SerpCache
+from gmb_replay import ReplayDriver, create_replay_tracker
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+SERPS = os.path.join(FIXTURES, 'serps')
+
+with open(os.path.join(FIXTURES, 'expected_ranks.json'), encoding='utf-8') as f:
+    EXPECTED = json.load(f)
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(gmb_cache.time, 'time', clock)
+    return clock
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / 'serp_cache.sqlite3')
+
+def row_count(cache):
+    return cache.conn.execute('SELECT COUNT(*) FROM serp_pages').fetchone()[0]
+
+def test_ttl_from_env(monkeypatch, cache_path, clock):
+    monkeypatch.setenv('GMB_CACHE_TTL', '60')
+    cache = SerpCache(cache_path)
+    cache.put('Gynecologist  in Malad', 1, ['A', 'B'], True)
+
+    clock.now += 59
+    page = cache.get('gynecologist in malad', 1)
+    assert (page.names, page.has_next) == (['A', 'B'], True)
+
+    clock.now += 2
+    assert cache.get('gynecologist in malad', 1) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+@pytest.mark.parametrize('value, expected', [('0', 0), ('-5', 0), ('abc', 3600), ('120', 120)])
+def test_get_cache_ttl(monkeypatch, value, expected):
+    monkeypatch.setenv('GMB_CACHE_TTL', value)
+    assert gmb_cache.get_cache_ttl() == expected
+
+def test_from_env_disabled(monkeypatch):
+    monkeypatch.setenv('GMB_CACHE_TTL', '0')
+    assert SerpCache.from_env() is None
+
+def test_prune_every_50_puts_keeps_recently_used(cache_path, clock):
+    cache = SerpCache(cache_path, ttl=3600, max_entries=10)
+    for i in range(SerpCache.PRUNE_EVERY - 1):
+        clock.now += 1
+        cache.put(f'query {i}', 1, [f'Business {i}'], False)
+
+    # Nothing evicted until the 50th put, and reading query 0 makes it most recently used
+    assert row_count(cache) == SerpCache.PRUNE_EVERY - 1
+    clock.now += 1
+    assert cache.get('query 0', 1) is not None
+
+    clock.now += 1
+    cache.put('query 49', 1, ['Business 49'], False)
+
+    kept = {row[0] for row in cache.conn.execute('SELECT query FROM serp_pages')}
+    assert kept == {'query 0'} | {f'query {i}' for i in range(41, 50)}
+    cache.close()
+
+def test_prune_drops_expired(cache_path, clock):
+    cache = SerpCache(cache_path, ttl=60, max_entries=100)
+    cache.put('old', 1, ['A'], False)
+    clock.now += 120
+    cache.put('new', 1, ['B'], False)
+    cache.prune()
+    assert [row[0] for row in cache.conn.execute('SELECT query FROM serp_pages')] == ['new']
+    cache.close()
+
+class OfflineDriver(ReplayDriver):
+    def get(self, url):
+        raise AssertionError(f'cache hit should not load {url}')
+
+def test_cache_hit_skips_engines(monkeypatch, cache_path):
+    monkeypatch.delenv('GMB_RECORD_DIR', raising=False)
+    cache = SerpCache(cache_path, ttl=3600)
+    keyword = EXPECTED['ranks'][0]
+    args = (keyword['keyword'], EXPECTED['location'], EXPECTED['business'], EXPECTED['aliases'])
+
+    tracker = create_replay_tracker(SERPS, cache=cache)
+    first = tracker.check_gmb_ranking(*args)
+    tracker.close()
+    assert cache.misses > 0 and cache.hits == 0
+
+    tracker = create_replay_tracker(SERPS, cache=cache)
+    tracker.driver = OfflineDriver(SERPS)
+    for engine in tracker.engines:
+        monkeypatch.setattr(engine, 'fetch', lambda *a: pytest.fail(f'{engine.name} fetched a cached page'))
+    second = tracker.check_gmb_ranking(*args)
+    tracker.close()
+
+    assert cache.hits > 0
+    for key in ('found', 'position', 'page', 'found_business_name', 'total_checked'):
+        assert second.get(key) == first.get(key) == keyword.get(key)
+    cache.close()
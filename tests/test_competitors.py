@@ -0,0 +1,112 @@
+# ✅ COMPETITOR STORE TESTS
+# 🏁 Packed SERP round-trip, who outranks us, and the best-ranking competitors per location
+# -*- coding: utf-8 -*-
+from datetime import datetime, timedelta
+
+import pytest
+
+from gmb_competitors import CompetitorStore, pack, page_sizes, unpack
+from gmb_history import RankingHistory
+
+US = 'Dr. Prashansa Raut Dalvi'
+LOCATION = 'Malad, Mumbai'
+
+def serp(*names, per_page=3):
+    return [{'position': i, 'name': name, 'page': (i - 1) // per_page + 1} for i, name in enumerate(names, 1)]
+
+@pytest.fixture
+def store(tmp_path):
+    store = CompetitorStore(str(tmp_path / 'history.sqlite3'))
+    yield store
+    store.close()
+
+def minutes_ago(minutes):
+    return (datetime.now() - timedelta(minutes=minutes)).strftime('%Y-%m-%d %H:%M:%S')
+
+# --------------------------------------------------------------- round trip
+
+@pytest.mark.parametrize('typecode, values', [('I', [1, 70000, 2 ** 32 - 1]), ('H', [5, 0, 65535]), ('I', [])])
+def test_pack_round_trip(typecode, values):
+    data = pack(typecode, values)
+    assert len(data) == len(values) * (4 if typecode == 'I' else 2)
+    assert list(unpack(typecode, data)) == values
+
+def test_page_sizes():
+    assert page_sizes(serp('A', 'B', 'C', 'D')) == [3, 1]
+    assert page_sizes([{'position': 1, 'name': 'A', 'page': 3}]) == [0, 0, 1]
+
+def test_record_and_latest(store):
+    entries = serp('Motherhood Hospital', 'Dr. Meera Shah', US, 'Cloudnine Hospital Malad', 'Dr. Meera Shah')
+    entries.append({'position': 9, 'name': None, 'page': 3})  # unnamed cards are not stored
+    store.record(LOCATION, 'gynecologist', entries[::-1], run_id='run_1', captured_at=minutes_ago(10))
+
+    latest = store.latest('gynecologist', LOCATION)
+    assert latest['run_id'] == 'run_1'
+    assert latest['entries'] == serp(
+        'Motherhood Hospital', 'Dr. Meera Shah', US, 'Cloudnine Hospital Malad', 'Dr. Meera Shah'
+    )
+
+    # A fresh store resolves the interned names from the database
+    other = CompetitorStore(store.path)
+    assert other.latest('gynecologist')['entries'] == latest['entries']
+    other.close()
+
+def test_latest_is_newest(store):
+    store.record(LOCATION, 'gynecologist', serp('Old'), captured_at=minutes_ago(60))
+    store.record(LOCATION, 'gynecologist', serp('New'), captured_at=minutes_ago(1))
+    store.record('Palghar', 'gynecologist', serp('Elsewhere'), captured_at=minutes_ago(30))
+
+    assert store.latest('gynecologist', LOCATION)['entries'][0]['name'] == 'New'
+    assert store.latest('gynecologist', 'Palghar')['entries'][0]['name'] == 'Elsewhere'
+    assert store.latest('ivf centre') is None
+    assert store.record(LOCATION, 'empty', []) is None
+
+# --------------------------------------------------------------- outranking
+
+def test_outranking_by_name_match(store):
+    store.record(LOCATION, 'gynecologist', serp('Motherhood Hospital', 'Dr Meera Shah', 'Dr. Prashansa Raut Dalvi'))
+
+    report = store.outranking('gynecologist', US)
+    assert (report['position'], report['crawled']) == (3, 3)
+    assert [entry['name'] for entry in report['outranked_by']] == ['Motherhood Hospital', 'Dr Meera Shah']
+
+def test_outranking_uses_the_runs_result(store):
+    store.record(LOCATION, 'gynecologist', serp('Motherhood Hospital', 'Dr Meera Shah', 'Dr. Prashansa Raut'), run_id='run_1')
+    history = RankingHistory(store.path)
+    history.record({
+        'searched_business': US, 'location': LOCATION, 'keyword': 'gynecologist',
+        'found': True, 'position': 2, 'page': 1, 'timestamp': minutes_ago(0),
+    }, run_id='run_1')
+    history.close()
+
+    report = store.outranking('gynecologist', US)
+    assert report['position'] == 2
+    assert [entry['name'] for entry in report['outranked_by']] == ['Motherhood Hospital']
+
+def test_outranking_when_absent(store):
+    store.record(LOCATION, 'gynecologist', serp('Motherhood Hospital', 'Dr Meera Shah'), run_id='run_2')
+
+    report = store.outranking('gynecologist', US)
+    assert report['position'] is None
+    assert len(report['outranked_by']) == 2
+    assert store.outranking('ivf centre', US) is None
+
+# ----------------------------------------------------------- top competitors
+
+def test_top_competitors(store):
+    store.record(LOCATION, 'gynecologist', serp('Old Clinic', US), captured_at=minutes_ago(90))
+    store.record(LOCATION, 'gynecologist', serp('Motherhood Hospital', 'Dr Meera Shah', US), captured_at=minutes_ago(5))
+    store.record(LOCATION, 'ivf centre', serp('Dr Meera Shah', US, 'Motherhood Hospital', 'Nova IVF'), captured_at=minutes_ago(5))
+    store.record(LOCATION, 'pcod', serp('Ancient Clinic'), captured_at=(datetime.now() - timedelta(days=40)).strftime('%Y-%m-%d %H:%M:%S'))
+    store.record('Palghar', 'gynecologist', serp('Palghar Clinic'), captured_at=minutes_ago(5))
+
+    report = store.top_competitors(LOCATION, exclude=[US, 'Prashansa Raut Dalvi'])
+    assert report['serps'] == 2
+    assert report['competitors'] == [
+        {'name': 'Dr Meera Shah', 'keywords': 2, 'best_position': 1, 'avg_position': 1.5, 'top3': 2},
+        {'name': 'Motherhood Hospital', 'keywords': 2, 'best_position': 1, 'avg_position': 2.0, 'top3': 2},
+        {'name': 'Nova IVF', 'keywords': 1, 'best_position': 4, 'avg_position': 4.0, 'top3': 0},
+    ]
+
+    unfiltered = store.top_competitors(LOCATION, limit=1)
+    assert [c['name'] for c in unfiltered['competitors']] == ['Dr Meera Shah']
@@ -0,0 +1,192 @@
+# ✅ TRACKER CONFIG TESTS
+# 📋 JSON / TOML / YAML loading, validation errors, the mtime cache and the reserved custom id
+# -*- coding: utf-8 -*-
+import os
+import json
+import copy
+
+import pytest
+
+import gmb_config
+from gmb_config import CUSTOM_CHOICE, ConfigError, TrackerConfig, load_config
+
+RAW = {
+    'default_keywords': 'gynecology',
+    'keyword_groups': {
+        'gynecology': ['PCOD Treatment', 'IVF Treatment'],
+        'fertility': ['IVF Treatment', 'IUI Treatment'],
+    },
+    'locations': {
+        'malad': {
+            'name': 'Malad', 'location': 'Malad, Mumbai', 'business': 'Dr. Prashansa Raut Dalvi',
+            'aliases': ['Dr. Prashansa Raut Dalvi', 'Dr Prashansa Raut'],
+        },
+        'palghar': {
+            'location': 'Palghar', 'business': 'Dr Prashansa Raut-Dalvi',
+            'targets': [{'business': 'Other Clinic'}],
+        },
+    },
+    'presets': [
+        {'id': '1', 'title': 'Malad', 'locations': ['malad']},
+        {'id': 'both', 'title': 'Both', 'locations': ['malad', 'palghar'], 'keywords': ['gynecology', 'fertility']},
+    ],
+}
+
+TOML = '''
+default_keywords = "gynecology"
+
+[keyword_groups]
+gynecology = ["PCOD Treatment", "IVF Treatment"]
+fertility = ["IVF Treatment", "IUI Treatment"]
+
+[locations.malad]
+name = "Malad"
+location = "Malad, Mumbai"
+business = "Dr. Prashansa Raut Dalvi"
+aliases = ["Dr. Prashansa Raut Dalvi", "Dr Prashansa Raut"]
+
+[locations.palghar]
+location = "Palghar"
+business = "Dr Prashansa Raut-Dalvi"
+targets = [{business = "Other Clinic"}]
+
+[[presets]]
+id = "1"
+title = "Malad"
+locations = ["malad"]
+
+[[presets]]
+id = "both"
+title = "Both"
+locations = ["malad", "palghar"]
+keywords = ["gynecology", "fertility"]
+'''
+
+YAML = '''
+default_keywords: gynecology
+keyword_groups:
+  gynecology: [PCOD Treatment, IVF Treatment]
+  fertility: [IVF Treatment, IUI Treatment]
+locations:
+  malad:
+    name: Malad
+    location: Malad, Mumbai
+    business: Dr. Prashansa Raut Dalvi
+    aliases: [Dr. Prashansa Raut Dalvi, Dr Prashansa Raut]
+  palghar:
+    location: Palghar
+    business: Dr Prashansa Raut-Dalvi
+    targets:
+      - business: Other Clinic
+presets:
+  - {id: "1", title: Malad, locations: [malad]}
+  - {id: both, title: Both, locations: [malad, palghar], keywords: [gynecology, fertility]}
+'''
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+def check_config(config):
+    assert list(config.presets) == ['1', 'both']
+    assert config.configuration('1') == {
+        'mode': 'single',
+        'location_name': 'Malad',
+        'business_name': 'Dr. Prashansa Raut Dalvi',
+        'location': 'Malad, Mumbai',
+        'business_names': ['Dr. Prashansa Raut Dalvi', 'Dr Prashansa Raut'],
+        'keywords': ['PCOD Treatment', 'IVF Treatment'],
+    }
+
+    both = config.configuration('both')
+    assert both['mode'] == 'multi'
+    assert both['keywords'] == ['PCOD Treatment', 'IVF Treatment', 'IUI Treatment']
+    palghar = both['locations'][1]
+    assert palghar['location_name'] == 'palghar'
+    assert palghar['business_names'] == ['Dr Prashansa Raut-Dalvi']
+    assert [t['business_name'] for t in palghar['targets']] == ['Dr Prashansa Raut-Dalvi', 'Other Clinic']
+
+def test_json(tmp_path):
+    check_config(load_config(write(tmp_path, 'gmb_config.json', json.dumps(RAW))))
+
+def test_toml(tmp_path):
+    pytest.importorskip('tomllib')
+    check_config(load_config(write(tmp_path, 'gmb_config.toml', TOML)))
+
+def test_yaml(tmp_path):
+    pytest.importorskip('yaml')
+    check_config(load_config(write(tmp_path, 'gmb_config.yml', YAML)))
+
+def test_shipped_config_loads():
+    config = load_config(os.path.join(os.path.dirname(gmb_config.__file__), 'gmb_config.json'))
+    assert config.presets and CUSTOM_CHOICE not in config.presets
+
+def test_config_file_env(tmp_path, monkeypatch):
+    path = write(tmp_path, 'custom.json', json.dumps(RAW))
+    monkeypatch.setenv(gmb_config.CONFIG_ENV, path)
+    assert gmb_config.find_config_file() == path
+
+def test_missing_file(tmp_path):
+    with pytest.raises(ConfigError, match='not found'):
+        load_config(str(tmp_path / 'nope.json'))
+
+# ---------------------------------------------------------------- validation
+
+def broken(change):
+    raw = copy.deepcopy(RAW)
+    change(raw)
+    return raw
+
+@pytest.mark.parametrize('raw, message', [
+    ([], 'top level must be a mapping'),
+    (broken(lambda r: r.update(default_keywords='nope')), 'default_keywords'),
+    (broken(lambda r: r['keyword_groups'].update(empty=[])), 'keyword_groups.empty is empty'),
+    (broken(lambda r: r['keyword_groups'].update(bad=['ok', ''])), 'keyword_groups.bad'),
+    (broken(lambda r: r['locations']['malad'].pop('business')), "locations.malad: 'business' is required"),
+    (broken(lambda r: r['locations']['palghar'].update(targets=[{'aliases': ['x']}])), 'every target needs'),
+    (broken(lambda r: r['presets'][0].update(locations=['atlantis'])), "unknown location 'atlantis'"),
+    (broken(lambda r: r['presets'][0].update(keywords=['dentistry'])), "unknown keyword group 'dentistry'"),
+    (broken(lambda r: r['presets'][1].update(id='1')), "duplicate preset id '1'"),
+    (broken(lambda r: r['presets'][0].pop('id')), "'id' is required"),
+    (broken(lambda r: r.update(presets=[])), 'no presets defined'),
+])
+def test_validation_errors(raw, message):
+    with pytest.raises(ConfigError, match=message):
+        TrackerConfig(raw, 'test.json')
+
+@pytest.mark.parametrize('preset_id', [CUSTOM_CHOICE, 5])
+def test_custom_choice_is_reserved(preset_id):
+    raw = broken(lambda r: r['presets'][0].update(id=preset_id))
+    with pytest.raises(ConfigError, match=f"'{CUSTOM_CHOICE}' is reserved"):
+        TrackerConfig(raw, 'test.json')
+
+def test_unknown_preset():
+    with pytest.raises(ConfigError, match="Unknown preset '9'"):
+        TrackerConfig(RAW).configuration('9')
+
+# -------------------------------------------------------------------- cache
+
+def test_cached_until_mtime_changes(tmp_path):
+    path = write(tmp_path, 'gmb_config.json', json.dumps(RAW))
+    first = load_config(path)
+    assert load_config(path) is first
+
+    raw = broken(lambda r: r['presets'][0].update(title='Malad v2'))
+    write(tmp_path, 'gmb_config.json', json.dumps(raw))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    second = load_config(path)
+    assert second is not first
+    assert second.presets['1']['title'] == 'Malad v2'
+
+def test_invalid_edit_is_reported(tmp_path):
+    path = write(tmp_path, 'gmb_config.json', json.dumps(RAW))
+    load_config(path)
+    write(tmp_path, 'gmb_config.json', json.dumps(broken(lambda r: r.update(presets=[]))))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    with pytest.raises(ConfigError, match='no presets'):
+        load_config(path)
@@ -0,0 +1,176 @@
+# ✅ JOB STORE TESTS
+# 🗂️ Claiming, leases and heartbeats, stale-job requeue with fencing, owner-checked writes
+# -*- coding: utf-8 -*-
+import socket
+
+import pytest
+
+import gmb_jobs
+from gmb_jobs import CANCELLED, DONE, FAILED, MAX_ATTEMPTS, QUEUED, RUNNING, JobStore
+
+OWNER = f"{socket.gethostname()}:1111"
+OTHER_OWNER = f"{socket.gethostname()}:2222"
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.sqlite3'))
+    yield store
+    store.close()
+
+class StopCalls(list):
+    """Backend pids fence_lost_worker asked to stop; set .result = False to simulate a failure"""
+    result = True
+
+@pytest.fixture
+def stopped(monkeypatch):
+    calls = StopCalls()
+
+    def stop_backend(pid):
+        calls.append(pid)
+        return calls.result
+    monkeypatch.setattr(gmb_jobs, 'stop_backend', stop_backend)
+    return calls
+
+def make_stale(store, job_id, seconds=gmb_jobs.STALE_AFTER_SECONDS + 5):
+    store.set_progress(job_id, heartbeat_at=gmb_jobs.time.time() - seconds)
+
+def running_job(store, run_id='run_1', worker_pid=None, owner=OWNER):
+    job_id = store.submit({'choice': '1'}, label='Preset 1')
+    job = store.claim_next(owner, max_running=10)
+    store.set_progress(job_id, owner=job['owner'], run_id=run_id, worker_pid=worker_pid)
+    return store.get(job_id)
+
+# ---------------------------------------------------------------- claim_next
+
+def test_claim_next_is_fifo_with_a_unique_lease(store):
+    first = store.submit({'choice': '1'})
+    second = store.submit({'choice': '2'})
+
+    job = store.claim_next(OWNER, max_running=2)
+    assert job['id'] == first
+    assert job['status'] == RUNNING and job['attempts'] == 1
+    assert job['owner'].startswith(OWNER + '/')
+    assert job['heartbeat_at'] is not None
+
+    other = store.claim_next(OWNER, max_running=2)
+    assert other['id'] == second
+    assert other['owner'] != job['owner']
+
+def test_claim_next_respects_global_limit(store):
+    store.submit({'choice': '1'})
+    queued = store.submit({'choice': '2'})
+
+    assert store.claim_next(OWNER, max_running=1) is not None
+    assert store.claim_next(OTHER_OWNER, max_running=1) is None
+    assert store.get(queued)['status'] == QUEUED
+    assert store.queue_position(queued) == 1
+
+def test_claim_next_empty_queue(store):
+    assert store.claim_next(OWNER, max_running=1) is None
+
+# ---------------------------------------------------------- lease + heartbeat
+
+def test_heartbeat_refreshes_held_leases(store):
+    job = running_job(store)
+    make_stale(store, job['id'])
+
+    assert store.heartbeat({job['id']: job['owner']}) == set()
+    assert store.get(job['id'])['heartbeat_at'] > gmb_jobs.time.time() - 5
+    assert store.requeue_stale() == []
+
+def test_heartbeat_reports_lost_leases(store, stopped):
+    job = running_job(store)
+    finished = running_job(store)
+    store.finish(finished['id'], DONE, owner=finished['owner'])
+    make_stale(store, job['id'])
+    assert store.requeue_stale() == [job['id']]
+
+    lost = store.heartbeat({job['id']: job['owner'], finished['id']: finished['owner']})
+    assert lost == {job['id'], finished['id']}
+
+# ------------------------------------------------------ requeue_stale fencing
+
+def test_requeue_stale_resumes_run(store, stopped):
+    job = running_job(store, run_id='run_7')
+    make_stale(store, job['id'])
+
+    assert store.requeue_stale() == [job['id']]
+    requeued = store.get(job['id'])
+    assert requeued['status'] == QUEUED
+    assert requeued['payload'] == {'resume': 'run_7', 'job_id': job['id']}
+    assert requeued['owner'] is None and requeued['worker_pid'] is None
+    assert stopped == []  # no backend had been started
+
+def test_requeue_stale_stops_local_backend_first(store, stopped):
+    job = running_job(store, worker_pid=4242)
+    make_stale(store, job['id'])
+
+    assert store.requeue_stale() == [job['id']]
+    assert stopped == [4242]
+
+def test_requeue_stale_fails_when_backend_cannot_be_stopped(store, stopped):
+    stopped.result = False
+    job = running_job(store, worker_pid=4242)
+    make_stale(store, job['id'])
+
+    assert store.requeue_stale() == []
+    failed = store.get(job['id'])
+    assert failed['status'] == FAILED
+    assert 'pid 4242' in failed['error']
+
+def test_requeue_stale_never_requeues_remote_backend(store, stopped):
+    job = running_job(store, worker_pid=4242, owner='other-host:1111')
+    make_stale(store, job['id'])
+
+    assert store.requeue_stale() == []
+    assert store.get(job['id'])['status'] == FAILED
+    assert 'other-host' in store.get(job['id'])['error']
+    assert stopped == []
+
+@pytest.mark.parametrize('run_id, attempts', [(None, 1), ('run_1', MAX_ATTEMPTS)])
+def test_requeue_stale_gives_up(store, stopped, run_id, attempts):
+    job = running_job(store, run_id=run_id)
+    store.set_progress(job['id'], attempts=attempts)
+    make_stale(store, job['id'])
+
+    assert store.requeue_stale() == []
+    failed = store.get(job['id'])
+    assert (failed['status'], failed['error']) == (FAILED, 'Worker lost')
+
+def test_requeue_stale_ignores_fresh_jobs(store, stopped):
+    job = running_job(store)
+    assert store.requeue_stale() == []
+    assert store.get(job['id'])['status'] == RUNNING
+
+# -------------------------------------------------------- owner-checked writes
+
+def test_writes_from_a_lost_lease_are_dropped(store, stopped):
+    old = running_job(store)
+    make_stale(store, old['id'])
+    store.requeue_stale()
+    new = store.claim_next(OTHER_OWNER, max_running=1)
+    assert new['id'] == old['id'] and new['attempts'] == 2
+
+    store.set_progress(old['id'], owner=old['owner'], current_keyword='stale keyword')
+    store.increment_progress(old['id'], owner=old['owner'])
+    assert not store.finish(old['id'], DONE, summary={'found': 1}, owner=old['owner'])
+
+    job = store.get(old['id'])
+    assert (job['status'], job['current_keyword'], job['progress'], job['summary']) == (RUNNING, '', 0, None)
+
+    store.set_progress(old['id'], owner=new['owner'], current_keyword='gynecologist')
+    store.increment_progress(old['id'], owner=new['owner'])
+    assert store.finish(old['id'], DONE, summary={'found': 1}, owner=new['owner'])
+
+    job = store.get(old['id'])
+    assert (job['status'], job['progress'], job['summary']) == (DONE, 1, {'found': 1})
+
+def test_cancel(store):
+    queued = store.submit({'choice': '1'})
+    running = store.submit({'choice': '2'})
+    store.set_progress(running, status=RUNNING)
+
+    assert store.request_cancel(queued) == CANCELLED
+    assert store.request_cancel(running) == 'cancelling'
+    assert store.cancel_requested([queued, running]) == {queued, running}
+    assert store.request_cancel(queued) is None
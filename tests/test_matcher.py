@@ -0,0 +1,51 @@
+# ✅ BUSINESS MATCHER TESTS
+# 🎯 Whole-token stopwords, alias scoring and near misses
+# -*- coding: utf-8 -*-
+import pytest
+
+from gmb_matcher import MatchResult, BusinessMatcher, get_matcher, tokenize
+
+ALIASES = ['Dr. Prashansa Raut Dalvi', 'Dr Prashansa Raut', 'Prashansa Raut Dalvi']
+
+def test_stopwords_are_never_cut_out_of_words():
+    # 'in', 'or', 'at', 'dr' used to be stripped as substrings, mangling real names
+    assert tokenize('Dr. Prashansa Raut Dalvi') == ['prashansa', 'raut', 'dalvi']
+    assert tokenize('Shrinivas Orthocare at Andheri') == ['shrinivas', 'orthocare', 'andheri']
+    assert tokenize('Drishti Doctors Hospital') == ['drishti', 'doctors']
+
+def test_prashansa_regression():
+    matcher = BusinessMatcher(ALIASES)
+    result = matcher.match('Dr. Prashansa Raut Dalvi - Gynaecologist in Malad')
+    assert result == MatchResult('Dr. Prashansa Raut Dalvi', 1.0)
+
+def test_only_whole_token_stopwords_dropped():
+    assert tokenize('The Clinic-Hospital & Doctor') == []
+    assert tokenize('Indira IVF Centre (Malad)') == ['indira', 'ivf', 'centre', 'malad']
+
+def test_stopword_only_names():
+    matcher = BusinessMatcher(['The Clinic', 'Dr. Meera Shah'])
+    assert matcher.aliases == ['Dr. Meera Shah']
+    assert matcher.match('Clinic and Hospital') is None
+    assert matcher.match('') is None
+    assert matcher.match(None) is None
+    assert BusinessMatcher(['Dr. Clinic']).match('Dr. Clinic') is None
+
+def test_best_alias_and_score():
+    matcher = BusinessMatcher(['Meera Shah Maternity Home', 'Dr. Meera Shah'])
+    # Every token of the second alias is present -> coverage 1.0 beats 0.5
+    assert matcher.match('Dr. Meera Shah') == MatchResult('Dr. Meera Shah', 1.0)
+    # Found name entirely inside the longer alias still matches it
+    assert matcher.match('Shah Maternity Home') == MatchResult('Meera Shah Maternity Home', 0.75)
+
+def test_partial_coverage_threshold():
+    matcher = BusinessMatcher(['Lifeline Nursing Maternity Home Malad West'])
+    assert matcher.match('Lifeline Nursing Home') == MatchResult('Lifeline Nursing Maternity Home Malad West', 0.5)
+    assert matcher.match('Sunrise Nursing Centre') is None  # 1 of 6 alias words
+
+@pytest.mark.parametrize('name', ['Dr. Prashant Rao Clinic', 'Prashanti Rawat Dalvy', 'Motherhood Hospital'])
+def test_near_miss_does_not_match(name):
+    assert BusinessMatcher(ALIASES).match(name) is None
+
+def test_get_matcher_is_shared():
+    assert get_matcher(ALIASES) is get_matcher(list(ALIASES))
+    assert get_matcher(ALIASES)('Prashansa Raut') == MatchResult('Dr Prashansa Raut', 1.0)
@@ -0,0 +1,66 @@
+# ✅ PARSER REGRESSION TESTS
+# 🧪 Saved results pages through both parser backends (lxml and html.parser)
+# -*- coding: utf-8 -*-
+import os
+import json
+
+import pytest
+
+import gmb_parser
+from gmb_replay import SnapshotStore
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+SERPS = os.path.join(FIXTURES, 'serps')
+
+with open(os.path.join(FIXTURES, 'expected_pages.json'), encoding='utf-8') as f:
+    EXPECTED_PAGES = json.load(f)
+
+PAGES = [
+    (query, int(page_number), expected)
+    for query, pages in EXPECTED_PAGES.items()
+    for page_number, expected in pages.items()
+]
+
+BACKENDS = ['lxml', 'stdlib']
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    if request.param == 'lxml' and not gmb_parser.HAS_LXML:
+        pytest.skip('lxml not installed')
+    monkeypatch.setattr(gmb_parser, 'HAS_LXML', request.param == 'lxml')
+    return request.param
+
+@pytest.mark.parametrize('query, page_number, expected', PAGES, ids=[f"{q}-p{n}" for q, n, _ in PAGES])
+def test_parse_results_page(backend, query, page_number, expected):
+    html = SnapshotStore(SERPS).load(query, page_number)
+    page = gmb_parser.parse_results_page(html)
+
+    assert page.names == expected['names']
+    assert page.has_next is expected['has_next']
+    assert page.card_count == expected['card_count']
+    assert page.selector == expected['selector']
+
+def test_empty_page(backend):
+    page = gmb_parser.parse_results_page('')
+    assert (page.names, page.card_count, page.has_next) == ([], 0, False)
+
+@pytest.mark.parametrize('html, expected', [
+    ('<div data-cid="1"><div role="heading">Dr. Asha Rao (Malad) - Clinic</div></div>', ['Dr. Asha Rao']),
+    ('<div data-cid="1"><p>Sunrise   Hospital</p><p>4.1 (20)</p></div>', ['Sunrise Hospital']),
+    ('<div data-cid="1"><div role="heading">Abc</div></div>', [None]),
+])
+def test_name_cascade(backend, html, expected):
+    assert gmb_parser.parse_results_page(html).names == expected
+
+@pytest.mark.parametrize('value', ['say "hi"', "it's"])
+def test_attribute_values_with_quotes(backend, value):
+    quote = "'" if '"' in value else '"'
+    escaped = value.replace('"', '&quot;')
+    document = gmb_parser.parse_document(f'<a aria-label="{escaped}">x</a><a aria-label="other">y</a>')
+    assert document.select_one(f'a[aria-label={quote}{value}{quote}]').text == 'x'
+
+@pytest.mark.skipif(not gmb_parser.HAS_LXML, reason='lxml not installed')
+@pytest.mark.parametrize('value', ['plain', 'say "hi"', "it's", 'he said "it\'s" fine', '"\''])
+def test_xpath_literal(value):
+    document = gmb_parser.LxmlElement.from_html('<p>x</p>')
+    assert document.node.xpath(f'string({gmb_parser._xpath_literal(value)})') == value
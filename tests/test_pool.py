@@ -0,0 +1,49 @@
+# ✅ BROWSER POOL TESTS
+# 🧵 Crashed sessions are relaunched before the next keyword, not only between jobs
+# -*- coding: utf-8 -*-
+import os
+import queue
+
+import gmb_tracker_backend as backend
+from gmb_replay import ReplayDriver, create_replay_tracker
+
+SERPS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'serps')
+
+class CrashedDriver(ReplayDriver):
+    @property
+    def current_url(self):
+        raise ConnectionError('chrome not reachable')
+
+    @current_url.setter
+    def current_url(self, value):
+        pass
+
+def replay_pool(tracker):
+    pool = backend.BrowserPool.__new__(backend.BrowserPool)
+    pool.size = 1
+    pool.trackers = [tracker]
+    pool._idle = queue.Queue()
+    pool._idle.put(tracker)
+    return pool
+
+def test_run_task_relaunches_crashed_browser(monkeypatch):
+    monkeypatch.delenv('GMB_RECORD_DIR', raising=False)
+    tracker = create_replay_tracker(SERPS)
+    tracker.driver = CrashedDriver(SERPS)
+    launches = []
+
+    def relaunch():
+        launches.append(1)
+        tracker.driver = ReplayDriver(SERPS)
+    monkeypatch.setattr(tracker, 'setup_driver', relaunch)
+
+    task = {
+        'keyword': 'gynecologist', 'location': 'Malad, Mumbai', 'location_name': 'Malad',
+        'business_name': 'Dr. Prashansa Raut Dalvi', 'business_names': ['Dr. Prashansa Raut Dalvi'],
+        'label': 'gynecologist - Malad',
+    }
+    results = replay_pool(tracker).run_task(task)
+
+    assert launches == [1]
+    assert results[0]['found'] and results[0]['position'] == 7
+    assert not results[0].get('error')
@@ -0,0 +1,52 @@
+# ✅ REPLAY REGRESSION TESTS
+# 🎞️ Full tracker runs over the saved results pages, compared with the stored expected ranks
+# -*- coding: utf-8 -*-
+import os
+import json
+
+import pytest
+
+import gmb_parser
+from gmb_replay import create_replay_tracker
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+SERPS = os.path.join(FIXTURES, 'serps')
+
+with open(os.path.join(FIXTURES, 'expected_ranks.json'), encoding='utf-8') as f:
+    EXPECTED = json.load(f)
+
+@pytest.fixture(params=['lxml', 'stdlib'])
+def tracker(request, monkeypatch):
+    if request.param == 'lxml' and not gmb_parser.HAS_LXML:
+        pytest.skip('lxml not installed')
+    monkeypatch.setattr(gmb_parser, 'HAS_LXML', request.param == 'lxml')
+    monkeypatch.delenv('GMB_RECORD_DIR', raising=False)
+    tracker = create_replay_tracker(SERPS)
+    yield tracker
+    tracker.close()
+
+@pytest.mark.parametrize('expected', EXPECTED['ranks'], ids=[rank['keyword'] for rank in EXPECTED['ranks']])
+def test_replay_ranks(tracker, expected):
+    result = tracker.check_gmb_ranking(
+        expected['keyword'], EXPECTED['location'], EXPECTED['business'], EXPECTED['aliases']
+    )
+
+    assert result['found'] is expected['found']
+    assert result.get('position') == expected['position']
+    assert result.get('page') == expected['page']
+    assert result.get('found_business_name') == expected['found_business_name']
+    assert result['total_checked'] == expected['total_checked']
+
+def test_replay_records_every_business(tracker):
+    tracker.check_gmb_ranking('gynecologist', EXPECTED['location'], 'Nobody Here', ['Nobody Here'])
+    names = [(entry['position'], entry['page'], entry['name']) for entry in tracker.all_businesses]
+    assert names == [
+        (1, 1, 'Dr. Meera Shah'),
+        (2, 1, 'Motherhood Hospital'),
+        (3, 1, 'Lifeline Nursing & Maternity Home'),
+        (4, 1, 'Kaya Maternity Home'),
+        (5, 1, 'Sai Women’s Clinic'),
+        (6, 2, 'Apex Multispeciality Clinic'),
+        (7, 2, 'Dr. Prashansa Raut Dalvi'),
+        (8, 2, 'Cloudnine Hospital Malad'),
+    ]
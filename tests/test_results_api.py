@@ -0,0 +1,128 @@
+# ✅ /api/results TESTS
+# 🌐 Conditional GETs (ETag / 304), filters, paging and bad query values
+# -*- coding: utf-8 -*-
+import os
+import importlib
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from gmb_results import ResultsWriter, progress_path
+
+ROWS = [
+    {'keyword': 'IVF Treatment', 'location': 'Malad, Mumbai', 'location_name': 'Malad', 'found': True,
+     'position': 3, 'page': 1, 'timestamp': '2024-03-01 09:00:00'},
+    {'keyword': 'PCOD Treatment', 'location': 'Malad, Mumbai', 'location_name': 'Malad', 'found': False,
+     'total_checked': 100, 'timestamp': '2024-03-01 09:05:00'},
+    {'keyword': 'IVF Treatment', 'location': 'Palghar', 'location_name': 'Palghar', 'found': True,
+     'position': 12, 'page': 1, 'timestamp': '2024-03-02 10:00:00'},
+]
+
+@pytest.fixture(scope='module')
+def server(tmp_path_factory):
+    """server.py imported inside a scratch directory - its databases and progress files land there"""
+    directory = tmp_path_factory.mktemp('server')
+    previous = os.getcwd()
+    os.chdir(directory)
+    patch = pytest.MonkeyPatch()
+    for name, value in [
+        ('GMB_JOBS_DB', 'gmb_jobs.sqlite3'), ('GMB_HISTORY_DB', 'gmb_history.sqlite3'),
+        ('GMB_SWEEPS_FILE', 'gmb_sweeps.json'), ('GMB_WARM_WORKER', '0'),
+    ]:
+        patch.setenv(name, value)
+    try:
+        module = importlib.import_module('server')
+        module.job_scheduler.stop()
+        module.sweep_scheduler.stop()
+        module.directory = str(directory)
+        yield module
+    finally:
+        patch.undo()
+        os.chdir(previous)
+
+@pytest.fixture
+def client(server, monkeypatch):
+    monkeypatch.chdir(server.directory)
+    return server.app.test_client()
+
+def write_run(server, run_id, rows=ROWS):
+    with ResultsWriter(progress_path(run_id)) as writer:
+        for row in rows:
+            writer.write(row)
+    server.invalidate_results()
+
+# ----------------------------------------------------------------------- 304
+
+def test_etag_round_trip(server, client):
+    write_run(server, 'etag_run')
+    first = client.get('/api/results?run=etag_run')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+    again = client.get('/api/results?run=etag_run', headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert again.headers['ETag'] == etag
+
+    with ResultsWriter(progress_path('etag_run'), truncate=False) as writer:
+        writer.write(dict(ROWS[0], keyword='Menopause Treatment'))
+    server.invalidate_results()
+
+    changed = client.get('/api/results?run=etag_run', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert changed.get_json()['total'] == 4
+
+def test_if_modified_since_ignored_when_etag_present(server, client):
+    write_run(server, 'ims_run')
+    future = format_datetime(datetime.now(timezone.utc) + timedelta(days=1), usegmt=True)
+
+    response = client.get('/api/results?run=ims_run', headers={'If-Modified-Since': future})
+    assert response.status_code == 200
+
+    stale = client.get('/api/results?run=ims_run', headers={'If-None-Match': '"stale"', 'If-Modified-Since': future})
+    assert stale.status_code == 200
+
+# ------------------------------------------------------------------- filters
+
+@pytest.mark.parametrize('query, keywords', [
+    ('', ['IVF Treatment', 'PCOD Treatment', 'IVF Treatment']),
+    ('&location=palghar', ['IVF Treatment']),
+    ('&location=mumbai&keyword=ivf', ['IVF Treatment']),
+    ('&found=false', ['PCOD Treatment']),
+    ('&found=1&since=2024-03-02', ['IVF Treatment']),
+    ('&until=2024-03-01', ['IVF Treatment', 'PCOD Treatment']),
+    ('&until=2024-03-01 09:00:00', ['IVF Treatment']),
+])
+def test_filters(server, client, query, keywords):
+    write_run(server, 'filter_run')
+    data = client.get(f'/api/results?run=filter_run{query}').get_json()
+    assert [row['keyword'] for row in data['data']] == keywords
+    assert data['total'] == len(keywords)
+
+def test_paging(server, client):
+    write_run(server, 'page_run')
+    first = client.get('/api/results?run=page_run&limit=2').get_json()
+    assert [row['timestamp'] for row in first['data']] == ['2024-03-01 09:00:00', '2024-03-01 09:05:00']
+    assert (first['offset'], first['limit'], first['next_offset']) == (0, 2, 2)
+
+    rest = client.get('/api/results?run=page_run&limit=2&offset=2').get_json()
+    assert [row['location_name'] for row in rest['data']] == ['Palghar']
+    assert rest['next_offset'] is None
+    assert rest['total'] == 3
+
+# ------------------------------------------------------------------ bad input
+
+@pytest.mark.parametrize('query', [
+    'run=bad_run&limit=abc', 'run=bad_run&offset=1.5', 'run=bad_run&limit=-1', 'run=bad_run&offset=-2',
+    'run=bad_run&found=maybe', 'run=bad_run&since=yesterday', 'run=../etc',
+])
+def test_bad_query_is_400(server, client, query):
+    write_run(server, 'bad_run')
+    response = client.get(f'/api/results?{query}')
+    assert response.status_code == 400
+    assert response.get_json()['error']
+
+def test_unknown_job_is_404(client):
+    assert client.get('/api/results?job=nope').status_code == 404
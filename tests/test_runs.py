@@ -0,0 +1,90 @@
+# ✅ RUN MANIFEST TESTS
+# 🔁 Checkpoint log write / load and resuming only the unfinished keywords
+# -*- coding: utf-8 -*-
+import functools
+
+import pytest
+
+import gmb_tracker_backend as backend
+from gmb_competitors import CompetitorStore
+from gmb_history import RankingHistory
+from gmb_runs import DONE, ERROR, PENDING, RunManifest
+
+CONFIG = {
+    'mode': 'custom',
+    'location': 'Malad, Mumbai',
+    'location_name': 'Malad',
+    'business_name': 'Dr. Prashansa Raut Dalvi',
+    'business_names': ['Dr. Prashansa Raut Dalvi'],
+    'keywords': ['gynecologist', 'ivf centre', 'pcos doctor'],
+}
+
+def result(task, found=True, error=None):
+    return {
+        'keyword': task['keyword'], 'location': task['location'], 'location_name': task['location_name'],
+        'searched_business': task['business_name'], 'found': found, 'position': 1 if found else None,
+        'page': 1 if found else None, 'total_checked': 1, 'error': error,
+        'timestamp': '2026-10-18 12:00:00',
+    }
+
+@pytest.fixture
+def manifest(tmp_path):
+    return RunManifest.create('20261018_120000_abc123', CONFIG, backend.build_tasks(CONFIG), runs_dir=str(tmp_path))
+
+def test_create_and_load(manifest, tmp_path):
+    loaded = RunManifest.load(manifest.run_id, runs_dir=str(tmp_path))
+    assert loaded.config == CONFIG
+    assert [task['keyword'] for task in loaded.tasks] == CONFIG['keywords']
+    assert loaded.counts() == {PENDING: 3, DONE: 0, ERROR: 0}
+
+def test_checkpoint_survives_reload(manifest, tmp_path):
+    first, second, third = manifest.tasks
+    manifest.checkpoint([result(first)])
+    manifest.checkpoint([result(second, found=False, error='timeout')])
+    with open(manifest.log_path, 'a', encoding='utf-8') as f:
+        f.write('{"key": "torn')  # crash mid-write
+
+    loaded = RunManifest.load(manifest.run_id, runs_dir=str(tmp_path))
+    assert loaded.counts() == {PENDING: 1, DONE: 1, ERROR: 1}
+    # Error keywords stay resumable, done ones are skipped
+    assert [task['keyword'] for task in loaded.pending_tasks()] == ['ivf centre', 'pcos doctor']
+    assert loaded.completed_results() == [result(first)]
+
+@pytest.mark.parametrize('run_id', ['../x', 'a b', 'run/1', '', None])
+def test_invalid_run_ids_rejected(run_id, tmp_path):
+    with pytest.raises(ValueError):
+        RunManifest.load(run_id, runs_dir=str(tmp_path))
+    with pytest.raises(ValueError):
+        RunManifest.create(run_id, CONFIG, [], runs_dir=str(tmp_path))
+
+def test_missing_manifest(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        RunManifest.load('20261018_120000_ffffff', runs_dir=str(tmp_path))
+
+class RecordingPool:
+    size = 1
+
+    def __init__(self):
+        self.ran = []
+
+    def run_task(self, task, max_results=100, on_serp=None):
+        self.ran.append(task['keyword'])
+        return [result(task)]
+
+def test_resume_runs_only_pending_keywords(manifest, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('GMB_HOST_RATE_PER_MINUTE', '0')
+    monkeypatch.setattr(backend, 'RankingHistory', functools.partial(RankingHistory, str(tmp_path / 'h.db')))
+    monkeypatch.setattr(backend, 'CompetitorStore', functools.partial(CompetitorStore, str(tmp_path / 'h.db')))
+    manifest.checkpoint([result(manifest.tasks[0])])
+
+    pool = RecordingPool()
+    resumed = RunManifest.load(manifest.run_id, runs_dir=str(tmp_path))
+    all_results = backend.run_tracking_session(None, pool, manifest=resumed)
+
+    assert sorted(pool.ran) == ['ivf centre', 'pcos doctor']
+    assert sorted(r['keyword'] for r in all_results) == sorted(CONFIG['keywords'])
+    assert RunManifest.load(manifest.run_id, runs_dir=str(tmp_path)).counts()[DONE] == 3
+    # The run's own progress file holds the earlier result too
+    with open(tmp_path / f"gmb_ranking_progress_{manifest.run_id}.csv", encoding='utf-8') as f:
+        assert sum(1 for _ in f) == 4
@@ -0,0 +1,152 @@
+# ✅ SWEEP SCHEDULER TESTS
+# ⏰ Cron parsing, next-trigger search, catch-up after a restart and once-only slot claiming
+# -*- coding: utf-8 -*-
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from gmb_history import RankingHistory
+from gmb_jobs import DONE, JobStore, get_max_jobs
+from gmb_sweeps import (
+    CATCH_UP_MINUTES, SKIPPED, SWEEP_MAX_JOBS, CronSchedule, SweepConfig, SweepScheduler,
+    _parse_field, sweeps_configured,
+)
+
+# ---------------------------------------------------------------------- cron
+
+@pytest.mark.parametrize('text, low, high, expected', [
+    ('*', 0, 5, {0, 1, 2, 3, 4, 5}),
+    ('*/15', 0, 59, {0, 15, 30, 45}),
+    ('10-20/5', 0, 59, {10, 15, 20}),
+    ('5/20', 0, 59, {5, 25, 45}),
+    ('1,3,5-6', 0, 7, {1, 3, 5, 6}),
+    ('7', 0, 7, {7}),
+])
+def test_parse_field(text, low, high, expected):
+    assert _parse_field(text, low, high) == expected
+
+@pytest.mark.parametrize('text', ['60', '5-1', '*/0', 'x', '-1'])
+def test_parse_field_rejects(text):
+    with pytest.raises(ValueError):
+        _parse_field(text, 0, 59)
+
+def test_cron_needs_five_fields():
+    with pytest.raises(ValueError):
+        CronSchedule('0 7 * *')
+
+def test_weekday_seven_is_sunday():
+    cron = CronSchedule('0 7 * * 7')
+    assert cron.matches(datetime(2024, 3, 3, 7, 0))       # Sunday
+    assert not cron.matches(datetime(2024, 3, 4, 7, 0))   # Monday
+
+def test_day_and_weekday_are_ored_when_both_set():
+    cron = CronSchedule('0 9 13 * 5')  # the 13th, or any Friday
+    assert cron.matches(datetime(2024, 3, 13, 9, 0))   # Wednesday the 13th
+    assert cron.matches(datetime(2024, 3, 8, 9, 0))    # Friday the 8th
+    assert not cron.matches(datetime(2024, 3, 12, 9, 0))
+
+def test_day_and_weekday_are_anded_with_a_wildcard():
+    assert not CronSchedule('0 9 13 * *').matches(datetime(2024, 3, 8, 9, 0))
+    assert not CronSchedule('0 9 * * 5').matches(datetime(2024, 3, 13, 9, 0))
+
+@pytest.mark.parametrize('expression, after, expected', [
+    ('30 6 * * *', datetime(2024, 1, 31, 6, 30), datetime(2024, 2, 1, 6, 30)),
+    ('0 0 31 * *', datetime(2024, 1, 31, 0, 0), datetime(2024, 3, 31, 0, 0)),
+    ('0 12 29 2 *', datetime(2024, 3, 1, 0, 0), datetime(2028, 2, 29, 12, 0)),
+    ('15 8 1 * *', datetime(2024, 12, 15, 10, 0), datetime(2025, 1, 1, 8, 15)),
+    ('*/20 * * * *', datetime(2024, 5, 5, 23, 59, 30), datetime(2024, 5, 6, 0, 0)),
+])
+def test_next_after(expression, after, expected):
+    assert CronSchedule(expression).next_after(after) == expected
+
+def test_next_after_impossible_date():
+    assert CronSchedule('0 0 31 2 *').next_after(datetime(2024, 1, 1)) is None
+
+# ----------------------------------------------------------------- scheduler
+
+@pytest.fixture
+def stores(tmp_path):
+    jobs = JobStore(str(tmp_path / 'jobs.sqlite3'))
+    history = RankingHistory(str(tmp_path / 'history.sqlite3'))
+    yield jobs, history
+    jobs.close()
+    history.close()
+
+def sweep_file(tmp_path, cron):
+    path = tmp_path / 'gmb_sweeps.json'
+    path.write_text(json.dumps([{
+        'name': 'clinic', 'cron': cron, 'business': 'Clinic', 'location': 'Pune',
+        'keywords': ['ivf centre', 'gynecologist'], 'window_minutes': 30,
+    }]), encoding='utf-8')
+    return str(path)
+
+def daily_at(minute):
+    return f"{minute.minute} {minute.hour} * * *"
+
+def this_minute():
+    return datetime.now().replace(second=0, microsecond=0)
+
+def test_first_tick_catches_up_missed_trigger(tmp_path, stores):
+    jobs, history = stores
+    missed = this_minute() - timedelta(minutes=CATCH_UP_MINUTES - 5)
+    scheduler = SweepScheduler(jobs, history, SweepConfig(sweep_file(tmp_path, daily_at(missed))))
+
+    scheduler.tick()
+
+    runs = history.sweep_runs(sweep='clinic')
+    assert [run['slot'] for run in runs] == [missed.strftime('%Y-%m-%d %H:%M')]
+    job = jobs.get(runs[0]['job_id'])
+    assert job['payload']['spread_seconds'] == 30 * 60
+    assert job['payload']['keywords'] == 'ivf centre\ngynecologist\n'
+
+def test_triggers_older_than_catch_up_window_are_dropped(tmp_path, stores):
+    jobs, history = stores
+    too_old = this_minute() - timedelta(minutes=CATCH_UP_MINUTES + 5)
+    scheduler = SweepScheduler(jobs, history, SweepConfig(sweep_file(tmp_path, daily_at(too_old))))
+
+    scheduler.tick()
+    assert history.sweep_runs(sweep='clinic') == []
+
+def test_slot_fires_once_across_server_workers(tmp_path, stores):
+    jobs, history = stores
+    due = this_minute() - timedelta(minutes=2)
+    path = sweep_file(tmp_path, daily_at(due))
+    first = SweepScheduler(jobs, history, SweepConfig(path))
+    second = SweepScheduler(jobs, history, SweepConfig(path))
+
+    first.tick()
+    second.tick()
+    first.tick()
+
+    assert len(history.sweep_runs(sweep='clinic')) == 1
+    assert len(jobs.list()) == 1
+
+def test_overlapping_slots_are_skipped_then_reconciled(tmp_path, stores):
+    jobs, history = stores
+    scheduler = SweepScheduler(jobs, history, SweepConfig(sweep_file(tmp_path, '* * * * *')))
+    scheduler.tick()
+
+    runs = history.sweep_runs(sweep='clinic', limit=100)
+    queued = [run for run in runs if run['job_id']]
+    assert len(queued) == 1
+    assert len(runs) == CATCH_UP_MINUTES
+    assert all(run['status'] == SKIPPED for run in runs if not run['job_id'])
+
+    jobs.finish(queued[0]['job_id'], DONE)
+    scheduler.reconcile()
+    run = history.sweep_runs(sweep='clinic', status=DONE)[0]
+    assert (run['slot'], run['found'], run['total']) == (queued[0]['slot'], 0, 0)
+
+# ------------------------------------------------------------------ job slots
+
+def test_sweeps_reserve_a_second_job_slot(tmp_path, monkeypatch):
+    monkeypatch.delenv('GMB_MAX_JOBS', raising=False)
+    path = str(tmp_path / 'gmb_sweeps.json')
+    assert not sweeps_configured(path)
+    sweep_file(tmp_path, '0 7 * * *')
+    assert sweeps_configured(path)
+
+    assert get_max_jobs(default=SWEEP_MAX_JOBS) == 2
+    monkeypatch.setenv('GMB_MAX_JOBS', '1')
+    assert get_max_jobs(default=SWEEP_MAX_JOBS) == 1